@@ -1,2 +1,18 @@
 from django.contrib import admin
 
+from backend_django.models import ChunkedJob
+
+
+@admin.register(ChunkedJob)
+class ChunkedJobAdmin(admin.ModelAdmin):
+    list_display = [
+        "name",
+        "status",
+        "chunks_done",
+        "chunks_total",
+        "retries",
+        "created_at",
+        "finished_at",
+    ]
+    list_filter = ["status", "name"]
+    readonly_fields = [field.name for field in ChunkedJob._meta.fields]
@@ -0,0 +1,114 @@
+"""
+Conditional GET for DRF views: ETag and Last-Modified from version counters in the
+"api" cache, so a client revalidating an unchanged resource gets a 304 without the
+view querying or serializing anything.
+
+A version is the time (ns) of the last change of a model, or of one of its rows,
+bumped from post_save/post_delete signals (see backend_django.users.signals). Bulk
+updates (QuerySet.update) bypass the signals, call bump_version() after them.
+
+Browsers revalidate responses with "Cache-Control: private, no-cache" and an ETag on
+their own, so API clients (axios) need no changes to receive 304s.
+"""
+
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+CACHE_ALIAS = "api"
+
+
+def version_key(model, pk=None) -> str:
+    key = f"version:{model._meta.label_lower}"
+    return key if pk is None else f"{key}:{pk}"
+
+
+def bump_version(model, pk=None):
+    """Mark the model (and the row pk) as changed."""
+    now = time.time_ns()
+    keys = [version_key(model)] + ([version_key(model, pk)] if pk is not None else [])
+    caches[CACHE_ALIAS].set_many({key: now for key in keys}, timeout=None)
+
+
+def get_versions(keys) -> list:
+    cache = caches[CACHE_ALIAS]
+    versions = cache.get_many(keys)
+    missing = {key: time.time_ns() for key in keys if key not in versions}
+    if missing:
+        # unknown (or evicted): treat as changed now, clients revalidate once
+        for key, value in missing.items():
+            cache.add(key, value, timeout=None)
+        versions.update(cache.get_many(list(missing)))
+    return [versions.get(key, missing.get(key)) for key in keys]
+
+
+class NotModified(Exception):
+    def __init__(self, response):
+        self.response = response
+
+
+class ConditionalResponseMixin:
+    """
+    ETag/Last-Modified for the safe requests of a GenericAPIView/GenericViewSet,
+    answered with 304 before the handler runs when the client's copy is current.
+
+    conditional_actions limits it to some viewset actions (None: all). The
+    validators vary with get_version_keys(), which defaults to the version of the
+    queryset's model, the user, the URL, the accepted media type and APP_VERSION.
+    """
+
+    conditional_actions = None
+    conditional_cache_control = "private, no-cache"
+
+    def get_version_keys(self):
+        return [version_key(self.get_queryset().model)]
+
+    def get_validators(self, request):
+        versions = get_versions(self.get_version_keys())
+        parts = [
+            settings.APP_VERSION,
+            str(request.user.pk),
+            request.get_full_path(),
+            request.accepted_media_type,
+            *map(str, versions),
+        ]
+        etag = quote_etag(hashlib.md5("|".join(parts).encode()).hexdigest())
+        return etag, max(versions) // 1_000_000_000
+
+    def is_conditional(self, request) -> bool:
+        action = getattr(self, "action", None)
+        return request.method in ("GET", "HEAD") and (
+            self.conditional_actions is None or action in self.conditional_actions
+        )
+
+    def initial(self, request, *args, **kwargs):
+        # authentication, permissions, throttling and content negotiation first
+        super().initial(request, *args, **kwargs)
+        self._validators = None
+        if self.is_conditional(request):
+            self._validators = etag, last_modified = self.get_validators(request)
+            response = get_conditional_response(
+                request, etag=etag, last_modified=last_modified
+            )
+            if response is not None:
+                raise NotModified(response)
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return exc.response
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        validators = getattr(self, "_validators", None)
+        if validators and response.status_code in (200, 304):
+            etag, last_modified = validators
+            response.headers["ETag"] = etag
+            response.headers["Last-Modified"] = http_date(last_modified)
+            response.headers["Cache-Control"] = self.conditional_cache_control
+            patch_vary_headers(response, ["Authorization", "Cookie"])
+        return response
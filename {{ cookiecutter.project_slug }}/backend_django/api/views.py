@@ -9,3 +9,20 @@ from rest_framework import status
 from rest_framework.renderers import JSONRenderer
 
 from rest_framework.decorators import api_view
+
+from django.conf import settings
+from django.db import transaction
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+
+
+# Plain Django views may be declared `async def`: under ASGI they are awaited on the
+# event loop without occupying a thread. Keep them free of sync ORM calls (use the
+# a-prefixed queryset methods, e.g. `await User.objects.acount()`) and opt them out of
+# ATOMIC_REQUESTS, which Django refuses to apply to async views.
+# DRF views are synchronous; Django runs them in a thread per request under ASGI.
+@transaction.non_atomic_requests
+@require_GET
+async def ping(request):
+    """Liveness endpoint for load balancers and the server benchmarks."""
+    return JsonResponse({"status": "ok", "version": settings.APP_VERSION})
@@ -6,4 +6,4 @@ class backend_djangoConfig(AppConfig):
 
     def ready(self):
         # run once if the registry is fully populated to initialize certain things
-        pass
\ No newline at end of file
+        import backend_django.signals  # noqa F401
@@ -0,0 +1,76 @@
+"""
+Benchmarks for performance sensitive code paths.
+
+Run them from the project root (the directory containing backend_django), e.g.
+
+    python -m backend_django.benchmarks.bench_token_auth
+
+By default they use the test settings (DATABASE_URL and CELERY_BROKER_URL have to
+be set) and a throw-away test database. Set DJANGO_SETTINGS_MODULE to benchmark
+against other settings, e.g. with the Redis cache of production.
+"""
+
+import os
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+
+def setup_django(settings_module="backend_django.config.settings.test"):
+    # make 'backend_django' importable, like manage.py does
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+
+    import django
+
+    django.setup()
+
+
+@contextmanager
+def test_database(keepdb=False):
+    """Create the test database(s) for the duration of the block."""
+    from django.test.utils import (
+        setup_databases,
+        setup_test_environment,
+        teardown_databases,
+        teardown_test_environment,
+    )
+
+    setup_test_environment()
+    old_config = setup_databases(verbosity=0, interactive=False, keepdb=keepdb)
+    try:
+        yield
+    finally:
+        teardown_databases(old_config, verbosity=0, keepdb=keepdb)
+        teardown_test_environment()
+
+
+def measure(func, iterations: int) -> list:
+    """Call func iterations times and return the duration of each call in ms."""
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def percentile(samples: list, pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def print_table(headers, rows):
+    rows = [
+        [f"{cell:.3f}" if isinstance(cell, float) else str(cell) for cell in row]
+        for row in rows
+    ]
+    widths = [
+        max(len(str(h)), *(len(r[i]) for r in rows)) for i, h in enumerate(headers)
+    ]
+    print("  ".join(str(h).ljust(w) for h, w in zip(headers, widths)))
+    print("  ".join("-" * w for w in widths))
+    for row in rows:
+        print("  ".join(cell.ljust(w) for cell, w in zip(row, widths)))
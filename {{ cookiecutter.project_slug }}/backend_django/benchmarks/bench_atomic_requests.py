@@ -0,0 +1,148 @@
+"""
+Compare how long requests keep their database connection in a transaction with
+ATOMIC_REQUESTS (every view wrapped) and with opt-in transactions for mutating
+requests only (backend_django/utils/transactions.py):
+
+    python -m backend_django.benchmarks.bench_atomic_requests --requests 2000
+
+A connection in a transaction cannot be handed to another request by the psycopg
+pool or PgBouncer, so "held ms" is what bounds how many requests a pool serves.
+In autocommit mode a connection is only busy for the duration of each query.
+"""
+
+import argparse
+import itertools
+import json
+import time
+
+from backend_django.benchmarks import (
+    percentile,
+    print_table,
+    setup_django,
+    test_database,
+)
+
+MIDDLEWARE_PATH = "backend_django.utils.transactions.AtomicRequestsMiddleware"
+
+
+class TransactionTimer:
+    """Time spent in outermost atomic blocks, i.e. in a database transaction."""
+
+    def __init__(self):
+        self.held = []
+        self._started = None
+
+    def install(self):
+        from django.db import transaction
+
+        enter, exit_ = transaction.Atomic.__enter__, transaction.Atomic.__exit__
+        timer = self
+
+        def __enter__(atomic):
+            if not transaction.get_connection(atomic.using).in_atomic_block:
+                timer._started = time.perf_counter()
+            return enter(atomic)
+
+        def __exit__(atomic, *exc_info):
+            result = exit_(atomic, *exc_info)
+            if not transaction.get_connection(atomic.using).in_atomic_block:
+                timer.held.append((time.perf_counter() - timer._started) * 1000)
+            return result
+
+        transaction.Atomic.__enter__ = __enter__
+        transaction.Atomic.__exit__ = __exit__
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--requests", type=int, default=1000)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.conf import settings
+    from django.db import connection
+    from django.test import Client
+    from django.test.utils import CaptureQueriesContext, override_settings
+    from rest_framework.authtoken.models import Token
+
+    from backend_django.users.tests.factories import UserFactory
+
+    opt_in_middleware = list(settings.MIDDLEWARE)
+    modes = [
+        (
+            "ATOMIC_REQUESTS",
+            True,
+            [m for m in opt_in_middleware if m != MIDDLEWARE_PATH],
+        ),
+        ("opt-in", False, opt_in_middleware),
+    ]
+    timer = TransactionTimer()
+    timer.install()
+
+    with test_database():
+        user = UserFactory()
+        token = Token.objects.create(user=user)
+        # allauth rejects a username that is taken, even by the user itself
+        usernames = (f"bench{n}" for n in itertools.count())
+        endpoints = [
+            ("GET /api/v1/user/", lambda client: client.get("/api/v1/user/")),
+            ("GET /users/~redirect/", lambda client: client.get("/users/~redirect/")),
+            (
+                "PATCH /api/v1/user/",
+                lambda client: client.patch(
+                    "/api/v1/user/",
+                    json.dumps({"username": next(usernames)}),
+                    content_type="application/json",
+                ),
+            ),
+        ]
+
+        rows = []
+        original = connection.settings_dict["ATOMIC_REQUESTS"]
+        for mode, atomic_requests, middleware in modes:
+            connection.settings_dict["ATOMIC_REQUESTS"] = atomic_requests
+            with override_settings(MIDDLEWARE=middleware):
+                client = Client(HTTP_AUTHORIZATION=f"Token {token.key}")
+                client.force_login(user)
+                for name, call in endpoints:
+                    call(client)  # warm up
+                    timer.held.clear()
+                    latencies = []
+                    with CaptureQueriesContext(connection) as queries:
+                        for _ in range(args.requests):
+                            start = time.perf_counter()
+                            response = call(client)
+                            latencies.append((time.perf_counter() - start) * 1000)
+                    assert response.status_code < 400, (name, response.status_code)
+                    rows.append(
+                        [
+                            mode,
+                            name,
+                            len(timer.held) / args.requests,
+                            sum(timer.held) / args.requests,
+                            percentile(timer.held, 99) if timer.held else 0.0,
+                            len(queries) / args.requests,
+                            percentile(latencies, 50),
+                        ]
+                    )
+        connection.settings_dict["ATOMIC_REQUESTS"] = original
+
+    print_table(
+        [
+            "mode",
+            "endpoint",
+            "transactions/request",
+            "held ms/request",
+            "held p99 ms",
+            "queries/request",
+            "p50 ms",
+        ],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Database queries per hour of django_celery_beat's DatabaseScheduler and
+InMemoryScheduler (backend_django/utils/beat.py) with --tasks periodic tasks, each
+running every --interval seconds:
+
+    python -m backend_django.benchmarks.bench_beat --tasks 1000 --interval 600
+
+Counts the queries of each scheduler operation and multiplies them by how often beat
+does it in an hour: a change check on every tick (one per task run, and at least every
+5 seconds; InMemoryScheduler at most every CHANGE_CHECK_SECONDS), a reload (every 5
+minutes, InMemoryScheduler every RELOAD_SECONDS) and a sync of the tasks that ran
+(every 3 minutes). Schedule changes, which make both reload, aren't counted.
+"""
+
+import argparse
+import time
+
+from backend_django.benchmarks import print_table, setup_django, test_database
+
+HOUR = 60 * 60
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--tasks", type=int, default=1000)
+    parser.add_argument("--interval", type=int, default=600, help="Seconds.")
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from django_celery_beat.models import IntervalSchedule, PeriodicTask, PeriodicTasks
+    from django_celery_beat.schedulers import (
+        DEFAULT_MAX_INTERVAL,
+        SCHEDULE_SYNC_MAX_INTERVAL,
+        DatabaseScheduler,
+    )
+
+    from backend_django.config.celery_app import app
+    from backend_django.utils import beat
+
+    def queries(func):
+        with CaptureQueriesContext(connection) as context:
+            start = time.perf_counter()
+            func()
+        return len(context), (time.perf_counter() - start) * 1000
+
+    runs = args.tasks * HOUR / args.interval
+    ticks = runs + HOUR / DEFAULT_MAX_INTERVAL
+    ran_per_sync = min(
+        args.tasks, round(args.tasks * DatabaseScheduler.sync_every / args.interval)
+    )
+    syncs = HOUR / DatabaseScheduler.sync_every
+
+    with test_database():
+        interval = IntervalSchedule.objects.create(
+            every=args.interval, period=IntervalSchedule.SECONDS
+        )
+        PeriodicTask.objects.bulk_create(
+            PeriodicTask(name=f"task {i}", task="bench.task", interval=interval)
+            for i in range(args.tasks)
+        )
+        PeriodicTasks.update_changed()
+
+        rows = []
+        for scheduler_class, checks, reloads in (
+            (DatabaseScheduler, ticks, HOUR / SCHEDULE_SYNC_MAX_INTERVAL),
+            (
+                beat.InMemoryScheduler,
+                min(ticks, HOUR / beat.CHANGE_CHECK_SECONDS),
+                HOUR / beat.RELOAD_SECONDS,
+            ),
+        ):
+            scheduler = scheduler_class(app=app, lazy=True)
+            scheduler.schedule
+            check, _ = queries(scheduler.schedule_changed)
+            reload, reload_ms = queries(scheduler.all_as_schedule)
+            for entry in list(scheduler.schedule.values())[:ran_per_sync]:
+                scheduler.reserve(entry)
+            sync, sync_ms = queries(scheduler.sync)
+            rows.append(
+                [
+                    scheduler_class.__name__,
+                    check,
+                    reload,
+                    reload_ms,
+                    sync,
+                    sync_ms,
+                    round(checks * check + reloads * reload + syncs * sync),
+                ]
+            )
+
+    print(
+        f"{args.tasks} tasks every {args.interval} s: {runs:.0f} runs, "
+        f"{ticks:.0f} ticks and {syncs:.0f} syncs of {ran_per_sync} tasks per hour"
+    )
+    print_table(
+        [
+            "scheduler",
+            "check",
+            "reload",
+            "reload ms",
+            "sync",
+            "sync ms",
+            "queries/hour",
+        ],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Round trip latency of a no-op Celery task through the broker, with its result
+ignored (the default, CELERY_TASK_IGNORE_RESULT) and stored in the result backend,
+and the result backend memory the stored results take:
+
+    python -m backend_django.benchmarks.bench_celery_results --tasks 500
+    python -m backend_django.benchmarks.bench_celery_results --result-bytes 4096
+
+Needs the Redis servers of CELERY_BROKER_URL and CELERY_RESULT_BACKEND_URL; the
+worker runs in this process. "executed" is the time from apply_async() until the
+task ran, "get" until the caller got the stored result with AsyncResult.get().
+"""
+
+import argparse
+import threading
+import time
+
+from backend_django.benchmarks import percentile, print_table, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--tasks", type=int, default=500)
+    parser.add_argument("--result-bytes", type=int, default=64)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from celery.contrib.testing.worker import start_worker
+
+    from backend_django.config.celery_app import app
+
+    executed = threading.Event()
+    payload = "x" * args.result_bytes
+
+    @app.task(name="bench.ignored", ignore_result=True)
+    def ignored():
+        executed.set()
+        return payload
+
+    @app.task(name="bench.stored", ignore_result=False)
+    def stored():
+        executed.set()
+        return payload
+
+    def used_memory():
+        return app.backend.client.info("memory")["used_memory"]
+
+    rows = []
+    with start_worker(app, pool="solo", perform_ping_check=False):
+        for task in (ignored, stored):
+            memory = used_memory()
+            published, ran, got = [], [], []
+            for _ in range(args.tasks):
+                executed.clear()
+                start = time.perf_counter()
+                result = task.apply_async()
+                published.append((time.perf_counter() - start) * 1000)
+                executed.wait(timeout=10)
+                ran.append((time.perf_counter() - start) * 1000)
+                if not task.ignore_result:
+                    result.get(timeout=10)
+                    got.append((time.perf_counter() - start) * 1000)
+            kib = (used_memory() - memory) / 1024
+            for name, samples in (
+                ("publish", published),
+                ("executed", ran),
+                ("get", got),
+            ):
+                if samples:
+                    rows.append(
+                        [
+                            task.name.split(".")[1],
+                            name,
+                            percentile(samples, 50),
+                            percentile(samples, 95),
+                            kib,
+                        ]
+                    )
+
+    print(f"{args.tasks} tasks, {args.result_bytes} byte results")
+    print_table(["results", "latency", "p50 ms", "p95 ms", "backend KiB"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Bytes and CPU time per request of the users API, for a full 200 response and for
+a revalidation answered with 304 (ConditionalResponseMixin):
+
+    python -m backend_django.benchmarks.bench_conditional --requests 2000
+
+CPU time is the process time of the whole request cycle (middleware, view,
+rendering) in the Django test client, without network transfer.
+"""
+
+import argparse
+import time
+
+from backend_django.benchmarks import (
+    percentile,
+    print_table,
+    setup_django,
+    test_database,
+)
+
+ENDPOINTS = [
+    "/api/v1/user/",
+    "/api/v1/users/me/",
+    "/api/v1/users/",
+    "/api/v1/users/{username}/",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--requests", type=int, default=1000)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from rest_framework.authtoken.models import Token
+    from rest_framework.test import APIClient
+
+    from backend_django.users.tests.factories import UserFactory
+
+    with test_database():
+        user = UserFactory()
+        client = APIClient()
+        client.credentials(
+            HTTP_AUTHORIZATION=f"Token {Token.objects.create(user=user).key}"
+        )
+
+        rows = []
+        for endpoint in ENDPOINTS:
+            url = endpoint.format(username=user.username)
+            etag = client.get(url)["ETag"]
+            for mode, headers in (("200", {}), ("304", {"HTTP_IF_NONE_MATCH": etag})):
+                cpu, sizes = [], []
+                with CaptureQueriesContext(connection) as queries:
+                    for _ in range(args.requests):
+                        start = time.process_time()
+                        response = client.get(url, **headers)
+                        cpu.append((time.process_time() - start) * 1000)
+                        sizes.append(len(response.content))
+                assert response.status_code == int(mode), (url, response.status_code)
+                rows.append(
+                    [
+                        url,
+                        mode,
+                        sum(sizes) // len(sizes),
+                        len(queries) / args.requests,
+                        sum(cpu) / len(cpu),
+                        percentile(cpu, 99),
+                    ]
+                )
+
+    print_table(
+        ["endpoint", "status", "body bytes", "queries/request", "CPU ms", "CPU p99 ms"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Password hashes per second of each hasher of the hash_password command, hashed in
+this process and across a process pool (as hash_password --batch and the bulk user
+import do):
+
+    python -m backend_django.benchmarks.bench_hashers --passwords 200 --workers 4
+
+Hashers whose library isn't installed (bcrypt) are skipped. The pool's start-up,
+spawning the workers and setting Django up in them, is reported separately.
+"""
+
+import argparse
+import os
+import time
+
+from backend_django.benchmarks import print_table, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--passwords", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    setup_django()
+
+    from backend_django.management.commands.hash_password import Command
+    from backend_django.utils.hashing import hash_passwords, hashing_pool
+
+    passwords = [f"password-{i}" for i in range(args.passwords)]
+    start = time.perf_counter()
+    with hashing_pool(args.workers) as pool:
+        if pool is not None:
+            # wait for the workers to be up
+            list(pool.map(abs, range(args.workers)))
+        startup = time.perf_counter() - start
+
+        rows = []
+        for name, hasher in Command.HASHERS.items():
+            try:
+                list(hash_passwords(["warm-up"], None, hasher))
+            except ValueError as e:
+                print(f"{name}: skipped, {e}")
+                continue
+            row = [name]
+            for in_pool in (None, pool):
+                start = time.perf_counter()
+                list(hash_passwords(passwords, in_pool, hasher))
+                row.append(args.passwords / (time.perf_counter() - start))
+            rows.append(row + [row[2] / row[1]])
+
+    print(f"{args.passwords} passwords, pool start-up {startup:.2f} s")
+    print_table(
+        ["hasher", "1 process/s", f"{args.workers} workers/s", "speed-up"], rows
+    )
+
+
+if __name__ == "__main__":
+    main()
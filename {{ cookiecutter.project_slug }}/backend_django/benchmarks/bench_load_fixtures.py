@@ -0,0 +1,95 @@
+"""
+Load a generated fixture of --rows users with Django's loaddata and with
+load_fixtures_fast, reporting time, rows per second and (with --trace-memory,
+which slows both down) the peak of Python memory allocations:
+
+    python -m backend_django.benchmarks.bench_load_fixtures --rows 1000000
+    python -m backend_django.benchmarks.bench_load_fixtures --rows 100000 --trace-memory
+
+loaddata keeps the whole file and saves row by row; expect it to take minutes
+for a million rows, --skip-loaddata leaves it out.
+"""
+
+import argparse
+import json
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from backend_django.benchmarks import print_table, setup_django, test_database
+
+
+def write_fixture(path: Path, rows: int):
+    with open(path, "w") as file:
+        file.write("[\n")
+        for pk in range(1, rows + 1):
+            row = {
+                "model": "users.user",
+                "pk": 10_000 + pk,
+                "fields": {
+                    "password": "!",
+                    "username": f"seed{pk}",
+                    "email": f"seed{pk}@example.com",
+                    "name": f"Seed User {pk}",
+                    "date_joined": "2025-01-01T00:00:00Z",
+                },
+            }
+            file.write(json.dumps(row) + (",\n" if pk < rows else "\n"))
+        file.write("]\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--batch-size", type=int, default=2000)
+    parser.add_argument("--trace-memory", action="store_true")
+    parser.add_argument("--skip-loaddata", action="store_true")
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.core.management import call_command
+
+    from backend_django.users.models import User
+
+    loaders = {
+        "load_fixtures_fast": lambda path: call_command(
+            "load_fixtures_fast", path, batch_size=args.batch_size, verbosity=0
+        ),
+    }
+    if not args.skip_loaddata:
+        loaders["loaddata"] = lambda path: call_command("loaddata", path, verbosity=0)
+
+    with tempfile.TemporaryDirectory() as directory, test_database():
+        path = Path(directory) / "users.json"
+        write_fixture(path, args.rows)
+        size = path.stat().st_size / 2**20
+
+        rows = []
+        for name, load in loaders.items():
+            User.objects.filter(pk__gt=10_000).delete()
+            if args.trace_memory:
+                tracemalloc.start()
+            start = time.perf_counter()
+            load(path)
+            elapsed = time.perf_counter() - start
+            peak = (
+                tracemalloc.get_traced_memory()[1] / 2**20
+                if args.trace_memory
+                else None
+            )
+            tracemalloc.stop()
+            assert User.objects.filter(pk__gt=10_000).count() == args.rows
+            rows.append(
+                [name, elapsed, args.rows / elapsed, "-" if peak is None else peak]
+            )
+
+    print(f"{args.rows} rows, {size:.0f} MB fixture")
+    print_table(["loader", "seconds", "rows/s", "peak MB"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Requests per second of the anonymous template pages (home, about, test) through
+the whole middleware stack, rendered on every request and served by the page
+cache (backend_django/utils/page_cache.py):
+
+    python -m backend_django.benchmarks.bench_page_cache --requests 2000
+"""
+
+import argparse
+
+from backend_django.benchmarks import (
+    measure,
+    percentile,
+    print_table,
+    setup_django,
+    test_database,
+)
+
+PATHS = ["/", "/about/", "/test/"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=1000)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.core.cache import caches
+    from django.test import Client, override_settings
+
+    from backend_django.utils.page_cache import CACHE_ALIAS
+
+    with test_database():
+        client = Client()
+        rows = []
+        for path in PATHS:
+            # a timeout of 0 stores nothing: every request renders the page
+            for mode, timeout in (("rendered", 0), ("cached", 60)):
+                caches[CACHE_ALIAS].clear()
+                with override_settings(PAGE_CACHE_TIMEOUT=timeout):
+                    assert client.get(path).status_code == 200
+                    samples = measure(lambda: client.get(path), args.requests)
+                rows.append(
+                    [
+                        path,
+                        mode,
+                        1000 * len(samples) / sum(samples),
+                        percentile(samples, 50),
+                        percentile(samples, 99),
+                    ]
+                )
+
+    print_table(["path", "mode", "requests/s", "p50 ms", "p99 ms"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+Load test gunicorn with sync workers (WSGI) and uvicorn workers (ASGI), each with
+gunicorn's defaults and with backend_django/config/gunicorn.conf.py ("-tuned").
+
+The servers are started one after the other against the same database, so run
+it with the environment of the deployment to compare (DJANGO_SETTINGS_MODULE,
+DATABASE_URL, ...), e.g. inside the production django container:
+
+    python -m backend_django.benchmarks.bench_server --modes wsgi wsgi-tuned --concurrency 64 --duration 30
+    python -m backend_django.benchmarks.bench_server --modes wsgi asgi --workers 2
+    python -m backend_django.benchmarks.bench_server --path /api/v1/user/ --token <auth token>
+
+Reports requests/s, latency percentiles and resident memory per worker (Linux only).
+The load generator is a thread pool in this process; use --concurrency to keep it
+from becoming the bottleneck or point a dedicated tool (wrk, hey) at a server
+started with the same command line.
+"""
+
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from backend_django.benchmarks import percentile, print_table
+
+ROOT_DIR = Path(__file__).resolve().parent.parent.parent
+GUNICORN_CONF = str(ROOT_DIR / "backend_django" / "config" / "gunicorn.conf.py")
+
+WSGI = ["backend_django.config.wsgi"]
+ASGI = [
+    "backend_django.config.asgi:application",
+    "--worker-class",
+    "uvicorn_worker.UvicornWorker",
+]
+SERVERS = {
+    "wsgi": WSGI,
+    "asgi": ASGI,
+    "wsgi-tuned": WSGI + ["--config", GUNICORN_CONF],
+    "asgi-tuned": ASGI + ["--config", GUNICORN_CONF],
+}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def rss_mb(pid: int) -> float:
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def worker_pids(master_pid: int) -> list:
+    with open(f"/proc/{master_pid}/task/{master_pid}/children") as children:
+        return [int(pid) for pid in children.read().split()]
+
+
+def request(url: str, headers: dict) -> float:
+    start = time.perf_counter()
+    with urllib.request.urlopen(
+        urllib.request.Request(url, headers=headers), timeout=30
+    ) as response:
+        response.read()
+    return (time.perf_counter() - start) * 1000
+
+
+def wait_until_ready(url: str, headers: dict, timeout: float = 60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            request(url, headers)
+            return
+        except urllib.error.HTTPError:
+            # the server is up but answers with an error (ALLOWED_HOSTS, auth, ...)
+            raise
+        except (urllib.error.URLError, ConnectionError):
+            time.sleep(0.5)
+    raise RuntimeError(f"server did not answer {url} within {timeout}s")
+
+
+def run_load(url: str, headers: dict, concurrency: int, duration: float):
+    deadline = time.monotonic() + duration
+
+    def client():
+        samples, errors = [], 0
+        while time.monotonic() < deadline:
+            try:
+                samples.append(request(url, headers))
+            except (urllib.error.URLError, ConnectionError):
+                errors += 1
+        return samples, errors
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda _: client(), range(concurrency)))
+    samples = [sample for result in results for sample in result[0]]
+    return samples, sum(result[1] for result in results)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--modes", nargs="+", default=list(SERVERS), choices=list(SERVERS)
+    )
+    parser.add_argument(
+        "--workers", type=int, help="overrides the number of workers of all modes"
+    )
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--path", default="/api/v1/ping/")
+    parser.add_argument(
+        "--token", help="DRF auth token sent as 'Authorization: Token <token>'"
+    )
+    args = parser.parse_args()
+
+    headers = {"Authorization": f"Token {args.token}"} if args.token else {}
+    rows = []
+    for mode in args.modes:
+        port = free_port()
+        url = f"http://127.0.0.1:{port}{args.path}"
+        command = [sys.executable, "-m", "gunicorn", *SERVERS[mode]]
+        command += ["--bind", f"127.0.0.1:{port}", "--chdir", str(ROOT_DIR)]
+        if args.workers:
+            command += ["--workers", str(args.workers)]
+        server = subprocess.Popen(
+            command, env=os.environ.copy(), stderr=subprocess.DEVNULL
+        )
+        try:
+            wait_until_ready(url, headers)
+            samples, errors = run_load(url, headers, args.concurrency, args.duration)
+            memory = [rss_mb(pid) for pid in worker_pids(server.pid)]
+        finally:
+            server.terminate()
+            server.wait()
+        rows.append(
+            [
+                mode,
+                len(samples) / args.duration,
+                percentile(samples, 50) if samples else 0.0,
+                percentile(samples, 99) if samples else 0.0,
+                errors,
+                len(memory),
+                sum(memory) / len(memory) if memory else 0.0,
+            ]
+        )
+
+    print_table(
+        [
+            "mode",
+            "requests/s",
+            "p50 ms",
+            "p99 ms",
+            "errors",
+            "workers",
+            "RSS/worker MB",
+        ],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
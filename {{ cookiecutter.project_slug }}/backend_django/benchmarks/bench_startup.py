@@ -0,0 +1,137 @@
+"""
+Startup time and imported modules of the gunicorn (wsgi) and Celery worker processes,
+see backend_django/utils/importtime.py, compared with startup_baseline.json:
+
+    python -m backend_django.benchmarks.bench_startup
+    python -m backend_django.benchmarks.bench_startup --check
+    python -m backend_django.benchmarks.bench_startup --update
+
+Each entry point is started --runs times in a new interpreter after one warm-up run
+(which writes the bytecode caches, unless PYTHONDONTWRITEBYTECODE is set as in the
+django image), the median counts. As wall times differ between machines, they are
+compared as a ratio to the startup of REFERENCE, which imports the parts of Django
+every process needs. The baseline has an entry per Python version and bytecode
+setting (baseline_key()), recorded in the django image that CI uses. --check exits
+with 1 when an entry point imports more than MODULES_TOLERANCE or starts more than
+--tolerance slower than the baseline, or the baseline has no entry for this
+interpreter; --update writes the entry after an intended change.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+from pathlib import Path
+
+from backend_django.benchmarks import print_table
+
+BASELINE = Path(__file__).resolve().parent / "startup_baseline.json"
+ENTRY_POINTS = ["wsgi", "celery"]
+REFERENCE = "import django.db.models, django.forms, django.template\n"
+MODULES_TOLERANCE = 0.05
+
+
+def baseline_key() -> str:
+    key = f"python{sys.version_info.major}.{sys.version_info.minor}"
+    if os.environ.get("PYTHONDONTWRITEBYTECODE"):
+        key += " PYTHONDONTWRITEBYTECODE"
+    return key
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--tolerance", type=float, default=0.5, help="Of the startup time ratio."
+    )
+    parser.add_argument("--check", action="store_true")
+    parser.add_argument("--update", action="store_true")
+    args = parser.parse_args()
+
+    # make 'backend_django' importable, like manage.py does
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+    # the settings of the baseline, whatever the environment sets
+    os.environ["DJANGO_SETTINGS_MODULE"] = "backend_django.config.settings.test"
+
+    from backend_django.utils.importtime import ENTRY_POINTS as CODE
+    from backend_django.utils.importtime import profile_code
+
+    def median_profile(name, code):
+        profile_code(name, code)
+        profiles = [profile_code(name, code) for _ in range(args.runs)]
+        seconds = statistics.median(profile.seconds for profile in profiles)
+        modules = statistics.median(len(profile.modules) for profile in profiles)
+        return seconds, round(modules)
+
+    reference, _ = median_profile("reference", REFERENCE)
+    results = {}
+    for entry_point in ENTRY_POINTS:
+        seconds, modules = median_profile(entry_point, CODE[entry_point])
+        results[entry_point] = {
+            "modules": modules,
+            "ratio": round(seconds / reference, 2),
+            "seconds": seconds,
+        }
+
+    baselines = json.loads(BASELINE.read_text()) if BASELINE.exists() else {}
+    key = baseline_key()
+    baseline = baselines.get(key, {})
+    rows, regressions = [], []
+    if not baseline:
+        regressions.append(f"{BASELINE.name} has no entry for {key}")
+    for entry_point, result in results.items():
+        expected = baseline.get(entry_point)
+        row = [entry_point, result["seconds"], result["modules"], result["ratio"]]
+        if expected:
+            row += [expected["modules"], expected["ratio"]]
+            if result["modules"] > expected["modules"] * (1 + MODULES_TOLERANCE):
+                regressions.append(
+                    f"{entry_point} imports {result['modules']} modules, "
+                    f"{expected['modules']} in the baseline"
+                )
+            if result["ratio"] > expected["ratio"] * (1 + args.tolerance):
+                regressions.append(
+                    f"{entry_point} starts in {result['ratio']} x the reference time, "
+                    f"{expected['ratio']} x in the baseline"
+                )
+        else:
+            row += ["-", "-"]
+        rows.append(row)
+
+    print(f"{key}, reference: {reference:.3f} s, median of {args.runs} runs")
+    print_table(
+        [
+            "entry point",
+            "seconds",
+            "modules",
+            "ratio",
+            "baseline modules",
+            "baseline ratio",
+        ],
+        rows,
+    )
+
+    if args.update:
+        baselines[key] = {
+            entry_point: {"modules": result["modules"], "ratio": result["ratio"]}
+            for entry_point, result in results.items()
+        }
+        BASELINE.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+        print(f"Wrote the {key} entry of {BASELINE}")
+    elif args.check:
+        for regression in regressions:
+            print(f"Regression: {regression}", file=sys.stderr)
+        if regressions:
+            print(
+                "Profile the imports with manage.py import_profile, or run this "
+                "with --update if the change is intended.",
+                file=sys.stderr,
+            )
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Compare DRF's TokenAuthentication with CachedTokenAuthentication.
+
+Reports database queries and latency per authenticated request:
+
+    python -m backend_django.benchmarks.bench_token_auth --requests 5000
+"""
+
+import argparse
+
+from backend_django.benchmarks import (
+    measure,
+    percentile,
+    print_table,
+    setup_django,
+    test_database,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from rest_framework.authentication import TokenAuthentication
+    from rest_framework.authtoken.models import Token
+    from rest_framework.test import APIRequestFactory
+
+    from backend_django.users.authentication import (
+        CachedTokenAuthentication,
+        get_token_cache,
+    )
+    from backend_django.users.tests.factories import UserFactory
+
+    with test_database():
+        token = Token.objects.create(user=UserFactory())
+        request = APIRequestFactory().get(
+            "/api/v1/user/", HTTP_AUTHORIZATION=f"Token {token.key}"
+        )
+
+        rows = []
+        for auth_class in (TokenAuthentication, CachedTokenAuthentication):
+            get_token_cache().clear()
+            auth = auth_class()
+            with CaptureQueriesContext(connection) as queries:
+                samples = measure(lambda: auth.authenticate(request), args.requests)
+            rows.append(
+                [
+                    auth_class.__name__,
+                    len(queries) / args.requests,
+                    percentile(samples, 50),
+                    percentile(samples, 99),
+                ]
+            )
+
+    print_table(["class", "queries/request", "p50 ms", "p99 ms"], rows)
+
+
+if __name__ == "__main__":
+    main()
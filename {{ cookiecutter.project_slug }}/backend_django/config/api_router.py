@@ -3,13 +3,16 @@ from django.urls import path, include
 
 from rest_framework.routers import DefaultRouter, SimpleRouter
 
+from backend_django.users.api.views import UserViewSet
+
 if settings.DEBUG:
     router = DefaultRouter()
 else:
     router = SimpleRouter()
 
-# router.register("users", UserViewSet)
+router.register("users", UserViewSet)
 # router.register("subscriptions", SubscriptionList3)
 
-app_name = "backend_django"
+# UserSerializer links to "api:user-detail"
+app_name = "api"
 urlpatterns = router.urls
@@ -0,0 +1,31 @@
+"""
+ASGI config for project.
+
+It exposes the ASGI callable as a module-level variable named ``application``
+and is used when gunicorn runs with uvicorn workers (DJANGO_SERVER_MODE=asgi in
+docker/production/django/start), see also the ``ASGI_APPLICATION`` setting.
+
+Native ``async def`` views are awaited directly on the event loop; synchronous
+views (e.g. all DRF views) are run by Django in a thread per request, so a slow
+client never blocks a whole worker process.
+
+"""
+
+import os
+import sys
+from pathlib import Path
+
+from django.core.asgi import get_asgi_application
+
+# This allows easy placement of apps within the interior
+# backend_django directory.
+ROOT_DIR = Path(__file__).resolve(strict=True).parent.parent  # /app/backend_django
+sys.path.insert(0, str(ROOT_DIR.parent))  # Add /app so 'backend_django' is importable
+sys.path.insert(0, str(ROOT_DIR))  # Add /app/backend_django for internal imports
+os.environ.setdefault(
+    "DJANGO_SETTINGS_MODULE", "backend_django.config.settings.production"
+)
+
+# This application object is used by any ASGI server configured to use this file.
+application = get_asgi_application()
+# Apply ASGI middleware here.
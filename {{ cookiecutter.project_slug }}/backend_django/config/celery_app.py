@@ -3,6 +3,8 @@ import sys
 from pathlib import Path
 
 from celery import Celery
+from celery.signals import task_prerun
+from kombu import Queue
 
 # Ensure backend_django is importable
 ROOT_DIR = Path(__file__).resolve(strict=True).parent.parent
@@ -10,6 +12,10 @@ sys.path.insert(0, str(ROOT_DIR.parent))
 
 # set the default Django settings module for the 'celery' program.
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend_django.config.settings.local")
+# Celery's Django fixup runs the system checks when a worker starts, which imports the
+# URLconf with all views (about a quarter of a worker's modules, see the import_profile
+# management command); they run with manage.py in the django container and in CI.
+os.environ.setdefault("CELERY_SKIP_CHECKS", "true")
 
 app = Celery("{{cookiecutter.project_slug}}")
 
@@ -19,9 +25,116 @@ app = Celery("{{cookiecutter.project_slug}}")
 #   should have a `CELERY_` prefix.
 app.config_from_object("django.conf:settings", namespace="CELERY")
 
+# Worker profiles, selected per worker container with CELERY_WORKER_PROFILE:
+#   latency  short tasks: one process per CPU, no prefetching past the running task
+#   cpu      long CPU bound tasks: as latency, but processes are recycled sooner
+#   io       tasks waiting on the network or the database: many threads
+# All acknowledge a task after it ran (task_acks_late), so a task of a crashed worker is
+# delivered again instead of lost; tasks must therefore be safe to run twice.
+# The memory limit (KiB) and max. tasks per child only apply to the prefork pool: the
+# child is replaced after the task that exceeded it. CELERY_WORKER_POOL, _CONCURRENCY,
+# _PREFETCH_MULTIPLIER, _MAX_TASKS_PER_CHILD and _MAX_MEMORY_PER_CHILD override a
+# profile's value; the worker start script passes CELERY_WORKER_POOL on as --pool, as
+# gevent (pip install gevent) patches the standard library before anything is imported.
+CPUS = os.cpu_count() or 1
+WORKER_PROFILES = {
+    "latency": {
+        "worker_pool": "prefork",
+        "worker_concurrency": CPUS,
+        "worker_prefetch_multiplier": 1,
+        "task_acks_late": True,
+        "worker_max_tasks_per_child": 1000,
+        "worker_max_memory_per_child": 256 * 1024,
+    },
+    "cpu": {
+        "worker_pool": "prefork",
+        "worker_concurrency": CPUS,
+        "worker_prefetch_multiplier": 1,
+        "task_acks_late": True,
+        "worker_max_tasks_per_child": 100,
+        "worker_max_memory_per_child": 512 * 1024,
+    },
+    "io": {
+        "worker_pool": "threads",
+        "worker_concurrency": 8 * CPUS,
+        "worker_prefetch_multiplier": 4,
+        "task_acks_late": True,
+        "worker_max_tasks_per_child": None,
+        "worker_max_memory_per_child": None,
+    },
+}
+
+
+def worker_profile(name: str | None = None) -> dict:
+    """The Celery settings of the profile `name` (default: CELERY_WORKER_PROFILE)."""
+    name = name or os.environ.get("CELERY_WORKER_PROFILE", "latency")
+    try:
+        profile = dict(WORKER_PROFILES[name])
+    except KeyError:
+        raise ValueError(
+            f"Unknown CELERY_WORKER_PROFILE {name!r}, expected one of {list(WORKER_PROFILES)}"
+        ) from None
+    for setting in (
+        "worker_concurrency",
+        "worker_prefetch_multiplier",
+        "worker_max_tasks_per_child",
+        "worker_max_memory_per_child",
+    ):
+        if value := os.environ.get(f"CELERY_{setting.upper()}"):
+            profile[setting] = int(value)
+    profile["worker_pool"] = (
+        os.environ.get("CELERY_WORKER_POOL") or profile["worker_pool"]
+    )
+    # a task of a killed child (e.g. out of memory) is redelivered, too
+    profile["task_reject_on_worker_lost"] = True
+    return profile
+
+
+app.conf.update(worker_profile())
+
+# Queues, consumed by the worker services of production.yml:
+#   high     short, user facing tasks (e.g. a user waits for the result)
+#   default  everything else
+#   bulk     long batch jobs, which would otherwise delay the tasks of other queues
+#   beat     periodic maintenance tasks
+# Tasks declare their queue and priority with backend_django.tasks.task(); task_routes
+# covers the tasks defined elsewhere (an explicit apply_async(queue=...) wins).
+HIGH, DEFAULT, BULK, BEAT = QUEUES = ("high", "default", "bulk", "beat")
+app.conf.task_queues = [Queue(name, routing_key=name) for name in QUEUES]
+app.conf.task_default_queue = DEFAULT
+
+
+def route_by_task_options(name, args, kwargs, options, task=None, **kw):
+    """
+    The queue and priority a task declares, also for tasks sent by name (send_task(),
+    which unlike apply_async() doesn't look at the task).
+    """
+    task = task or app.tasks.get(name)
+    if getattr(task, "queue", None):
+        return {"queue": task.queue, "priority": task.priority}
+    return None
+
+
+app.conf.task_routes = [
+    route_by_task_options,
+    {
+        # run by beat when results expire (result_expires)
+        "celery.backend_cleanup": {"queue": BEAT},
+    },
+]
+
 # Load task modules from all registered Django app configs.
 app.autodiscover_tasks()
 
+
+@task_prerun.connect
+def reset_database_pinning(**kwargs):
+    # worker processes run many tasks: don't let one task's writes pin the reads of
+    # the following ones to the primary, see backend_django/config/db_router.py
+    from backend_django.config.db_router import unpin
+
+    unpin()
+
 app.conf.beat_schedule = {
 
 }
@@ -0,0 +1,100 @@
+"""
+Read replica routing, enabled by DATABASE_REPLICA_URLS (see config/settings/base.py).
+
+Reads go to a random replica and writes to "default" (the primary). Replicas lag
+behind the primary, so reads are pinned to the primary
+
+- inside transactions on the primary
+- for the rest of the request (or Celery task) once it has written
+- for the whole request if it is a POST, PUT, PATCH or DELETE
+- for REPLICA_PIN_SECONDS after a request has written, through a cookie set by
+  ReplicaPinningMiddleware, so a redirect after a POST reads what was just written
+
+Use ``pin_to_primary()`` where fresh data is needed without a preceding write, e.g.
+in a task that reads a row created right before it was queued.
+"""
+
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from backend_django.utils.transactions import is_mutation
+
+PIN_COOKIE = "db_pin"
+
+# per thread / asyncio task: reads go to the primary
+_pinned = ContextVar("db_pinned", default=False)
+# per thread / asyncio task: something was written to the primary
+_wrote = ContextVar("db_wrote", default=False)
+
+
+def is_pinned() -> bool:
+    return _pinned.get() or connections[DEFAULT_DB_ALIAS].in_atomic_block
+
+
+def pin():
+    _pinned.set(True)
+
+
+def unpin(**kwargs):
+    """Forget pinning and writes, at the start of a request or task."""
+    _pinned.set(False)
+    _wrote.set(False)
+
+
+@contextmanager
+def pin_to_primary():
+    token = _pinned.set(True)
+    try:
+        yield
+    finally:
+        _pinned.reset(token)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if is_pinned() or not settings.DATABASE_REPLICAS:
+            return DEFAULT_DB_ALIAS
+        return random.choice(settings.DATABASE_REPLICAS)
+
+    def db_for_write(self, model, **hints):
+        _pinned.set(True)
+        _wrote.set(True)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # replicas hold the same data as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReplicaPinningMiddleware:
+    """
+    Reset pinning per request, pin unsafe requests and requests with a recent
+    write (PIN_COOKIE). Place it before SessionMiddleware, so session writes
+    after a login set the cookie too.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        unpin()
+        if is_mutation(request) or PIN_COOKIE in request.COOKIES:
+            pin()
+        response = self.get_response(request)
+        if _wrote.get():
+            response.set_cookie(
+                PIN_COOKIE,
+                "1",
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+        unpin()
+        return response
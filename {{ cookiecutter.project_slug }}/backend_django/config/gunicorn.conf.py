@@ -0,0 +1,137 @@
+"""
+Gunicorn configuration, used by docker/production/django/start.
+
+Workers and threads are derived from the CPUs and the memory limit of the
+container (cgroup v1/v2), every value can be overridden by environment variables:
+
+    WEB_CONCURRENCY                 number of worker processes
+    GUNICORN_THREADS                threads per worker (sync workers only, >1 switches to gthread)
+    GUNICORN_WORKER_MEMORY_MB       expected resident memory of one worker, used to cap the workers (default 200)
+    GUNICORN_MAX_REQUESTS           recycle a worker after that many requests (default 1000, 0 disables)
+    GUNICORN_MAX_REQUESTS_JITTER    random jitter added to max_requests (default 10% of max_requests)
+    GUNICORN_PRELOAD                load the app in the master before forking (default true)
+    GUNICORN_TIMEOUT                worker timeout in seconds (default 30)
+    GUNICORN_KEEPALIVE              keep-alive timeout in seconds (default 5)
+    GUNICORN_BIND                   socket to bind (default 0.0.0.0:5000)
+
+https://docs.gunicorn.org/en/stable/settings.html
+"""
+
+import gc
+import math
+import os
+from pathlib import Path
+
+MAX_THREADS = 4
+
+
+def env_int(name, default):
+    value = os.environ.get(name)
+    return int(value) if value not in (None, "") else default
+
+
+def env_bool(name, default):
+    value = os.environ.get(name)
+    if value in (None, ""):
+        return default
+    return value.lower() in ("1", "true", "yes", "on")
+
+
+def read_cgroup(*paths):
+    for path in paths:
+        try:
+            return Path(path).read_text().strip()
+        except OSError:
+            continue
+    return None
+
+
+def available_cpus() -> float:
+    """CPUs usable by this container: the cgroup quota if there is one, else the cores."""
+    cpus = (
+        len(os.sched_getaffinity(0))
+        if hasattr(os, "sched_getaffinity")
+        else os.cpu_count() or 1
+    )
+    # cgroup v2: "<quota> <period>" or "max <period>"
+    quota = read_cgroup("/sys/fs/cgroup/cpu.max")
+    if quota and not quota.startswith("max"):
+        limit, period = quota.split()
+        return min(cpus, int(limit) / int(period))
+    # cgroup v1
+    limit = read_cgroup("/sys/fs/cgroup/cpu/cpu.cfs_quota_us")
+    period = read_cgroup("/sys/fs/cgroup/cpu/cpu.cfs_period_us")
+    if limit and period and int(limit) > 0:
+        return min(cpus, int(limit) / int(period))
+    return cpus
+
+
+def memory_limit_mb():
+    """Memory limit of this container in MB, None if unlimited."""
+    limit = read_cgroup(
+        "/sys/fs/cgroup/memory.max", "/sys/fs/cgroup/memory/memory.limit_in_bytes"
+    )
+    if not limit or limit == "max":
+        return None
+    limit = int(limit)
+    # cgroup v1 reports "unlimited" as a huge number close to 2**63
+    return limit // (1024 * 1024) if limit < 2**60 else None
+
+
+def compute_concurrency(cpus, memory_mb, worker_memory_mb):
+    """
+    Return (workers, threads).
+
+    Start from the classic 2 * CPUs + 1 workers, cap the workers by the memory
+    limit and make up for capped workers with threads, so the number of requests
+    served concurrently stays close to the CPU based target.
+    """
+    target = 2 * math.ceil(cpus) + 1
+    workers = target
+    if memory_mb:
+        workers = max(1, min(workers, memory_mb // worker_memory_mb))
+    threads = min(MAX_THREADS, math.ceil(target / workers))
+    return workers, threads
+
+
+_workers, _threads = compute_concurrency(
+    available_cpus(), memory_limit_mb(), env_int("GUNICORN_WORKER_MEMORY_MB", 200)
+)
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:5000")
+workers = env_int("WEB_CONCURRENCY", _workers)
+threads = env_int("GUNICORN_THREADS", _threads)
+# threads are only used by the gthread worker; the ASGI mode passes --worker-class itself
+worker_class = "gthread" if threads > 1 else "sync"
+
+# load the Django app once in the master, forked workers share its memory copy-on-write
+preload_app = env_bool("GUNICORN_PRELOAD", True)
+
+# recycle workers to bound memory growth, jitter avoids all workers restarting at once
+max_requests = env_int("GUNICORN_MAX_REQUESTS", 1000)
+max_requests_jitter = env_int("GUNICORN_MAX_REQUESTS_JITTER", max_requests // 10)
+
+timeout = env_int("GUNICORN_TIMEOUT", 30)
+graceful_timeout = timeout
+keepalive = env_int("GUNICORN_KEEPALIVE", 5)
+# heartbeat files on tmpfs instead of the (possibly overlay) container filesystem
+worker_tmp_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+
+def pre_fork(server, worker):
+    if server.cfg.preload_app:
+        # close database connections the preloaded app opened while the master still
+        # owns them alone: a worker closing an inherited connection would end the
+        # session for the master and every other worker sharing the socket
+        from django.db import connections
+
+        connections.close_all()
+        # with DJANGO_DB_POOL, close_all() returns the connections to the psycopg pool,
+        # which keeps them open (and its threads, which don't survive a fork): close
+        # the pools the master created, each worker creates its own on first use
+        for connection in connections.all(initialized_only=True):
+            if connection.alias in getattr(connection, "_connection_pools", {}):
+                connection.close_pool()
+        # move everything allocated by the preloaded app out of the garbage collector's
+        # reach, otherwise gc passes in the workers touch (and copy) the shared pages
+        gc.freeze()
@@ -4,6 +4,7 @@ Base settings to build other settings files upon.
 from pathlib import Path
 import os
 import environ
+from django.core.exceptions import ImproperlyConfigured
 
 # ROOT_DIR points to project root (parent of backend_django)
 ROOT_DIR = Path(__file__).resolve(strict=True).parent.parent.parent.parent
@@ -57,15 +58,107 @@ LOCALE_PATHS = [str(APPS_DIR / "locale")]
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#databases
 DATABASES = {"default": env.db("DATABASE_URL")}
-DATABASES["default"]["ATOMIC_REQUESTS"] = True
+# ATOMIC_REQUESTS is off: only mutating requests run in a transaction, see
+# backend_django/utils/transactions.py and ATOMIC_REQUESTS_URLS below
+DATABASES["default"]["ATOMIC_REQUESTS"] = False
+# read replicas, comma separated database URLs; reads are routed to them by
+# backend_django/config/db_router.py
+DATABASE_REPLICA_URLS = env.list("DATABASE_REPLICA_URLS", default=[])
+DATABASE_REPLICAS = []
+for _index, _url in enumerate(DATABASE_REPLICA_URLS, start=1):
+    DATABASES[f"replica{_index}"] = env.db_url_config(_url)
+    # the test runner doesn't create test databases for replicas
+    DATABASES[f"replica{_index}"]["TEST"] = {"MIRROR": "default"}
+    DATABASE_REPLICAS.append(f"replica{_index}")
+# seconds a client keeps reading from the primary after it wrote (replication lag)
+REPLICA_PIN_SECONDS = env.int("DJANGO_REPLICA_PIN_SECONDS", default=5)
 DEFAULT_AUTO_FIELD = "django.db.models.AutoField"
 
+# CACHES
+# ------------------------------------------------------------------------------
+# https://docs.djangoproject.com/en/dev/ref/settings/#caches
+# Aliases: "default" (auth tokens, users, ...), "sessions" (SESSION_CACHE_ALIAS) and
+# "api" (HTTP responses). DJANGO_CACHE_BACKEND selects the kind of backend of all of them,
+# each environment only changes the default:
+#   redis      REDIS_URL (required in production), production and local
+#   fakeredis  an in-process Redis stand-in, tests
+#   file       DJANGO_CACHE_DIR, shared by all processes of a host (development without Redis)
+#   locmem     per process
+# Keys are prefixed with DJANGO_CACHE_KEY_PREFIX, the alias and APP_VERSION, so a release
+# never reads entries (e.g. pickled model instances) written by another one. Sessions are
+# not versioned, they survive deployments.
+# All aliases share one Redis database: clear() on any alias flushes all of them.
+# The backends (backend_django/utils/cache.py) count hits and misses, see the
+# cache_stats management command.
+CACHE_KEY_PREFIX = env("DJANGO_CACHE_KEY_PREFIX", default="{{ cookiecutter.project_slug }}")
+CACHE_ALIASES = {"default": True, "sessions": False, "api": True}  # alias: versioned
+
+
+def cache_settings(backend: str, redis_url: str = None) -> dict:
+    # the redis backend requires REDIS_URL, unless the settings pass a default
+    caches = {}
+    for alias, versioned in CACHE_ALIASES.items():
+        prefix = f"{CACHE_KEY_PREFIX}:{alias}" + (
+            f":{APP_VERSION}" if versioned else ""
+        )
+        if backend in ("redis", "fakeredis"):
+            options = {
+                "CLIENT_CLASS": "django_redis.client.DefaultClient",
+                # Mimicing memcache behavior.
+                # https://github.com/jazzband/django-redis#memcached-exceptions-behavior
+                "IGNORE_EXCEPTIONS": True,
+            }
+            if backend == "fakeredis":
+                import fakeredis
+
+                options["CONNECTION_POOL_KWARGS"] = {
+                    "connection_class": fakeredis.FakeRedisConnection
+                }
+                location = "redis://localhost:6379/0"
+            else:
+                location = (
+                    env("REDIS_URL", default=redis_url)
+                    if redis_url
+                    else env("REDIS_URL")
+                )
+            config = {
+                "BACKEND": "backend_django.utils.cache.RedisCache",
+                "LOCATION": location,
+                "OPTIONS": options,
+            }
+        elif backend == "file":
+            config = {
+                "BACKEND": "backend_django.utils.cache.FileBasedCache",
+                "LOCATION": str(
+                    Path(env("DJANGO_CACHE_DIR", default="/tmp/django_cache")) / alias
+                ),
+            }
+        elif backend == "locmem":
+            config = {
+                "BACKEND": "backend_django.utils.cache.LocMemCache",
+                "LOCATION": alias,
+            }
+        else:
+            raise ImproperlyConfigured(f"Unknown DJANGO_CACHE_BACKEND {backend!r}")
+        caches[alias] = {**config, "KEY_PREFIX": prefix}
+    return caches
+
+
+CACHES = cache_settings(env("DJANGO_CACHE_BACKEND", default="locmem"))
+# seconds the anonymous template pages stay in the "api" alias, see
+# backend_django/utils/page_cache.py and the warm_page_cache command; 0 disables it
+PAGE_CACHE_TIMEOUT = env.int("DJANGO_PAGE_CACHE_TIMEOUT", default=60 * 60)
+
 # URLS
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#root-urlconf
 ROOT_URLCONF = "backend_django.config.urls"
 # https://docs.djangoproject.com/en/dev/ref/settings/#wsgi-application
 WSGI_APPLICATION = "backend_django.config.wsgi.application"
+# https://docs.djangoproject.com/en/dev/ref/settings/#asgi-application
+ASGI_APPLICATION = "backend_django.config.asgi.application"
+# "wsgi" (gunicorn sync workers) or "asgi" (gunicorn with uvicorn workers), see docker/production/django/start
+SERVER_MODE = env("DJANGO_SERVER_MODE", default="wsgi")
 
 # APPS
 # ------------------------------------------------------------------------------
@@ -129,8 +222,9 @@ LOGIN_REDIRECT_URL = "users:redirect"
 # https://docs.djangoproject.com/en/dev/ref/settings/#password-hashers
 PASSWORD_HASHERS = [
     # https://docs.djangoproject.com/en/dev/topics/auth/passwords/#using-argon2-with-django
-    "django.contrib.auth.hashers.Argon2PasswordHasher",
-    "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+    # with the cost parameters of the calibrate_hashers command
+    "backend_django.users.hashers.Argon2PasswordHasher",
+    "backend_django.users.hashers.PBKDF2PasswordHasher",
     "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
     "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
 ]
@@ -156,11 +250,30 @@ MIDDLEWARE = [
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.middleware.locale.LocaleMiddleware",
     "django.middleware.common.CommonMiddleware",
-    "django.contrib.auth.middleware.AuthenticationMiddleware",
+    # AuthenticationMiddleware loading the user of a session through the cache
+    "backend_django.users.middleware.CachedAuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.common.BrokenLinkEmailsMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "allauth.account.middleware.AccountMiddleware",
+    # keep last, the transaction should cover the view only
+    "backend_django.utils.transactions.AtomicRequestsMiddleware",
+]
+if DATABASE_REPLICAS:
+    # https://docs.djangoproject.com/en/dev/topics/db/multi-db/#automatic-database-routing
+    DATABASE_ROUTERS = ["backend_django.config.db_router.ReplicaRouter"]
+    # before SessionMiddleware, see ReplicaPinningMiddleware
+    MIDDLEWARE.insert(
+        MIDDLEWARE.index("django.contrib.sessions.middleware.SessionMiddleware"),
+        "backend_django.config.db_router.ReplicaPinningMiddleware",
+    )
+# unsafe (POST, PUT, PATCH, DELETE) requests to these paths run in a transaction; own views
+# opt in with backend_django.utils.transactions.atomic_mutations / AtomicMutationsMixin
+ATOMIC_REQUESTS_URLS = [
+    # allauth: signup, login, email and password management
+    r"^/accounts/",
+    # dj_rest_auth: login, logout, password reset/change, user details, registration
+    r"^/api/v1/(login|logout|password|user|registration)/",
 ]
 
 # STATIC
@@ -271,6 +384,15 @@ SESSION_COOKIE_SAMESITE = "None"
 # may ensure that the cookie is only sent with an HTTPS connection.
 SESSION_COOKIE_SECURE = True
 
+# https://docs.djangoproject.com/en/dev/ref/settings/#session-engine
+# DJANGO_SESSION_BACKEND: "db", "cached_db" (reads through the cache, writes to both)
+# or "cache" (cache only: sessions are lost when the cache evicts or flushes them)
+SESSION_ENGINE = "django.contrib.sessions.backends." + env(
+    "DJANGO_SESSION_BACKEND", default="db"
+)
+# https://docs.djangoproject.com/en/dev/ref/settings/#session-cache-alias
+SESSION_CACHE_ALIAS = "sessions"
+
 
 # CORS
 # django-cors-headers - https://github.com/adamchainz/django-cors-headers#setup
@@ -407,7 +529,20 @@ if USE_TZ:
 # http://docs.celeryproject.org/en/latest/userguide/configuration.html#std:setting-broker_url
 CELERY_BROKER_URL = env("CELERY_BROKER_URL")
 # http://docs.celeryproject.org/en/latest/userguide/configuration.html#std:setting-result_backend
-CELERY_RESULT_BACKEND = CELERY_BROKER_URL
+# results are kept apart from the broker (production: the redis_results service), so
+# their memory doesn't slow down the queues; Redis URLs get compressed large results,
+# see backend_django/utils/celery_results.py
+_result_backend_url = env("CELERY_RESULT_BACKEND_URL", default=CELERY_BROKER_URL)
+CELERY_RESULT_BACKEND = (
+    f"backend_django.utils.celery_results:CompressedRedisBackend+{_result_backend_url}"
+    if _result_backend_url.startswith(("redis://", "rediss://"))
+    else _result_backend_url
+)
+# https://docs.celeryq.dev/en/stable/userguide/configuration.html#task-ignore-result
+# tasks store their result only if declared with ignore_result=False
+CELERY_TASK_IGNORE_RESULT = True
+# https://docs.celeryq.dev/en/stable/userguide/configuration.html#result-expires
+CELERY_RESULT_EXPIRES = env.int("CELERY_RESULT_EXPIRES", default=60 * 60)
 # http://docs.celeryproject.org/en/latest/userguide/configuration.html#std:setting-accept_content
 CELERY_ACCEPT_CONTENT = ["json"]
 # http://docs.celeryproject.org/en/latest/userguide/configuration.html#std:setting-task_serializer
@@ -420,8 +555,28 @@ CELERY_TASK_TIME_LIMIT = 60 * 60
 # http://docs.celeryproject.org/en/latest/userguide/configuration.html#task-soft-time-limit
 # TODO: set to whatever value is adequate in your circumstances
 # CELERY_TASK_SOFT_TIME_LIMIT = 60
+# https://docs.celeryq.dev/en/stable/getting-started/backends-and-brokers/redis.html#visibility-timeout
+# workers acknowledge tasks after running them (worker profiles in config/celery_app.py)
+# and Redis redelivers a task unacknowledged for this long: keep it above the time limit
+# priority_steps: every queue is split into ten lists, the tasks of priority 0 run first
+# (backend_django.tasks.task(priority=...)); queue_order_strategy: a worker consuming
+# several queues empties them in the order of its -Q argument
+CELERY_BROKER_TRANSPORT_OPTIONS = {
+    "visibility_timeout": 2 * CELERY_TASK_TIME_LIMIT,
+    "priority_steps": list(range(10)),
+    "sep": ":",
+    "queue_order_strategy": "priority",
+}
+# https://docs.celeryq.dev/en/stable/userguide/configuration.html#task-default-priority
+# without it, tasks that don't declare one would get 0, the first
+CELERY_TASK_DEFAULT_PRIORITY = 5
 # http://docs.celeryproject.org/en/latest/userguide/configuration.html#beat-scheduler
-CELERY_BEAT_SCHEDULER = "django_celery_beat.schedulers:DatabaseScheduler"
+# the periodic tasks of django_celery_beat (admin), kept in memory and reloaded when they
+# change, see backend_django/utils/beat.py; "django_celery_beat.schedulers:DatabaseScheduler"
+# polls the database instead
+CELERY_BEAT_SCHEDULER = env(
+    "CELERY_BEAT_SCHEDULER", default="backend_django.utils.beat:InMemoryScheduler"
+)
 
 
 # django-allauth
@@ -448,16 +603,37 @@ SOCIALACCOUNT_ADAPTER = "backend_django.users.adapters.SocialAccountAdapter"
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
         # "rest_framework.authentication.SessionAuthentication",
-        "rest_framework.authentication.TokenAuthentication",
+        # TokenAuthentication which resolves tokens via the cache instead of the database
+        "backend_django.users.authentication.CachedTokenAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
 }
+# cache alias and max. lifetime (seconds) of cached auth tokens, see backend_django.users.authentication
+AUTH_TOKEN_CACHE_ALIAS = "default"
+AUTH_TOKEN_CACHE_TIMEOUT = env.int("DJANGO_AUTH_TOKEN_CACHE_TIMEOUT", default=300)
+# max. lifetime (seconds) of users cached for sessions, see backend_django.users.middleware
+AUTH_USER_CACHE_TIMEOUT = env.int("DJANGO_AUTH_USER_CACHE_TIMEOUT", default=300)
+# password hashing processes of the bulk user import endpoint (/api/v1/users/import/),
+# started by its task, see backend_django/users/bulk_import.py; default: one per CPU,
+# 1 hashes in the task's process, as do the processes of a prefork Celery worker
+USER_IMPORT_HASH_WORKERS = env.int("DJANGO_USER_IMPORT_HASH_WORKERS", default=None)
+# login attempts per client IP and per account within a sliding window (seconds),
+# rejected before the password is hashed, and password checks running at once per
+# host before logins are shed; see backend_django/users/throttling.py; 0 disables one
+LOGIN_RATE_LIMIT_WINDOW = env.int("DJANGO_LOGIN_RATE_LIMIT_WINDOW", default=300)
+LOGIN_RATE_LIMIT_PER_IP = env.int("DJANGO_LOGIN_RATE_LIMIT_PER_IP", default=30)
+LOGIN_RATE_LIMIT_PER_ACCOUNT = env.int("DJANGO_LOGIN_RATE_LIMIT_PER_ACCOUNT", default=10)
+LOGIN_MAX_CONCURRENT_HASHES = env.int(
+    "DJANGO_LOGIN_MAX_CONCURRENT_HASHES", default=2 * (os.cpu_count() or 1)
+)
+# proxies in front of Django appending the client address to X-Forwarded-For
+TRUSTED_PROXY_COUNT = env.int("DJANGO_TRUSTED_PROXY_COUNT", default=0)
 
 # dj-rest-auth
 # -------------------------------------------------------------------------------
 # https://dj-rest-auth.readthedocs.io/en/latest/configuration.html
 REST_AUTH = {
-    'LOGIN_SERIALIZER': 'dj_rest_auth.serializers.LoginSerializer',
+    'LOGIN_SERIALIZER': 'backend_django.users.api.serializers.RateLimitedLoginSerializer',
     'TOKEN_SERIALIZER': 'dj_rest_auth.serializers.TokenSerializer',
     'JWT_SERIALIZER': 'dj_rest_auth.serializers.JWTSerializer',
     'JWT_SERIALIZER_WITH_EXPIRATION': 'dj_rest_auth.serializers.JWTSerializerWithExpiration',
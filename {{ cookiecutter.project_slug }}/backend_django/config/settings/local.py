@@ -27,12 +27,13 @@ CORS_ALLOW_ALL_ORIGINS = True
 # CACHES
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#caches
-CACHES = {
-    "default": {
-        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
-        "LOCATION": "",
-    }
-}
+# the Redis of local.yml like in production, DJANGO_CACHE_BACKEND=file without it
+CACHES = cache_settings(  # noqa F405
+    env("DJANGO_CACHE_BACKEND", default="redis"),  # noqa F405
+    redis_url="redis://localhost:6379/0",
+)
+# template changes show up on reload, set it to test the page cache locally
+PAGE_CACHE_TIMEOUT = env.int("DJANGO_PAGE_CACHE_TIMEOUT", default=0)  # noqa F405
 
 # EMAIL
 EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
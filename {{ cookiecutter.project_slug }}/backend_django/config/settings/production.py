@@ -1,3 +1,5 @@
+from copy import deepcopy
+
 from .base import *  # noqa
 from .base import env
 
@@ -11,23 +13,74 @@ ALLOWED_HOSTS = env.list("DJANGO_ALLOWED_HOSTS", default=["127.0.0.1"])
 # DATABASES
 # ------------------------------------------------------------------------------
 DATABASES["default"] = env.db("DATABASE_URL")  # noqa F405
-DATABASES["default"]["ATOMIC_REQUESTS"] = True  # noqa F405
-DATABASES["default"]["CONN_MAX_AGE"] = env.int("CONN_MAX_AGE", default=60)  # noqa F405
+# persistent connections are kept per thread; under ASGI every request runs its sync code in a
+# thread of its own, so persistent connections would pile up instead of being reused
+DATABASES["default"]["CONN_MAX_AGE"] = env.int(  # noqa F405
+    "CONN_MAX_AGE", default=0 if SERVER_MODE == "asgi" else 60  # noqa F405
+)
+
+# Connection pooling
+# Each gunicorn worker and celery process holds its own connection(s), so the number of
+# Postgres connections grows with the replicas. Two ways to bound it:
+#
+# 1. DJANGO_DB_POOL=True: psycopg3 connection pool inside every process
+#    https://docs.djangoproject.com/en/dev/ref/databases/#connection-pool
+#    Threads of one process (gthread/ASGI workers) share DJANGO_DB_POOL_MAX_SIZE connections;
+#    a request waits up to DJANGO_DB_POOL_TIMEOUT seconds for a free one.
+#    Processes still don't share connections, so size max_size * processes < max_connections.
+#    The preloaded gunicorn master closes its pool before forking (pre_fork in
+#    config/gunicorn.conf.py), so preload_app stays on and every worker opens its own pool.
+#
+# 2. DJANGO_DB_PGBOUNCER=True with POSTGRES_HOST=pgbouncer: connect through the optional
+#    PgBouncer service of production.yml in transaction pooling mode, where all processes
+#    share DEFAULT_POOL_SIZE server connections. Transaction pooling rules out server side
+#    cursors and (for PgBouncer < 1.21) prepared statements, both are disabled below.
+#
+# Transactions: a request wrapped in a transaction keeps its (pooled or PgBouncer server)
+# connection checked out from the first query until the view returns, instead of only for
+# the duration of each query in autocommit mode. This is why ATOMIC_REQUESTS is off and only
+# mutating requests opt in (ATOMIC_REQUESTS_URLS, backend_django/utils/transactions.py).
+if env.bool("DJANGO_DB_POOL", default=False):
+    # merged into the OPTIONS of DATABASE_URL (e.g. ?sslmode=require)
+    DATABASES["default"].setdefault("OPTIONS", {}).update(  # noqa F405
+        {
+            "pool": {
+                "min_size": env.int("DJANGO_DB_POOL_MIN_SIZE", default=2),
+                "max_size": env.int("DJANGO_DB_POOL_MAX_SIZE", default=4),
+                "timeout": env.float("DJANGO_DB_POOL_TIMEOUT", default=10),
+            }
+        }
+    )
+    # pooled connections are returned to the pool after each request instead of being persisted
+    DATABASES["default"]["CONN_MAX_AGE"] = 0  # noqa F405
+elif env.bool("DJANGO_DB_PGBOUNCER", default=False):
+    DATABASES["default"]["DISABLE_SERVER_SIDE_CURSORS"] = True  # noqa F405
+    DATABASES["default"].setdefault("OPTIONS", {})[  # noqa F405
+        "prepare_threshold"
+    ] = None
+
+# read replicas (DATABASE_REPLICA_URLS) use the connection settings of the primary,
+# OPTIONS of their own URL take precedence
+for _alias in DATABASE_REPLICAS:  # noqa F405
+    for _key in ("CONN_MAX_AGE", "DISABLE_SERVER_SIDE_CURSORS"):
+        if _key in DATABASES["default"]:  # noqa F405
+            DATABASES[_alias][_key] = deepcopy(DATABASES["default"][_key])  # noqa F405
+    DATABASES[_alias]["OPTIONS"] = {  # noqa F405
+        **deepcopy(DATABASES["default"].get("OPTIONS", {})),  # noqa F405
+        **DATABASES[_alias].get("OPTIONS", {}),  # noqa F405
+    }
 
 # CACHES
 # ------------------------------------------------------------------------------
-CACHES = {
-    "default": {
-        "BACKEND": "django_redis.cache.RedisCache",
-        "LOCATION": env("REDIS_URL"),
-        "OPTIONS": {
-            "CLIENT_CLASS": "django_redis.client.DefaultClient",
-            # Mimicing memcache behavior.
-            # https://github.com/jazzband/django-redis#memcached-exceptions-behavior
-            "IGNORE_EXCEPTIONS": True,
-        },
-    }
-}
+CACHES = cache_settings(env("DJANGO_CACHE_BACKEND", default="redis"))  # noqa F405
+
+# SESSIONS
+# ------------------------------------------------------------------------------
+# https://docs.djangoproject.com/en/dev/ref/settings/#session-engine
+# read sessions from Redis, the database only serves cache misses
+SESSION_ENGINE = "django.contrib.sessions.backends." + env(
+    "DJANGO_SESSION_BACKEND", default="cached_db"
+)
 
 # SECURITY
 # ------------------------------------------------------------------------------
@@ -59,6 +112,8 @@ CORS_ALLOW_ALL_ORIGINS = True
 
 # https://docs.djangoproject.com/en/dev/ref/settings/#secure-proxy-ssl-header
 SECURE_PROXY_SSL_HEADER = ("HTTP_X_FORWARDED_PROTO", "https")
+# traefik (production.yml) appends the client address to X-Forwarded-For
+TRUSTED_PROXY_COUNT = env.int("DJANGO_TRUSTED_PROXY_COUNT", default=1)
 # https://docs.djangoproject.com/en/dev/ref/settings/#secure-ssl-redirect
 SECURE_SSL_REDIRECT = env.bool("DJANGO_SECURE_SSL_REDIRECT", default=True)
 # https://docs.djangoproject.com/en/dev/ref/settings/#session-cookie-secure
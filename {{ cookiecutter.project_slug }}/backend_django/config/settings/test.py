@@ -18,17 +18,14 @@ TEST_RUNNER = "django.test.runner.DiscoverRunner"
 # CACHES
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#caches
-CACHES = {
-    "default": {
-        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
-        "LOCATION": "",
-    }
-}
+# an in-process Redis stand-in, so tests run against the backend of production
+CACHES = cache_settings(env("DJANGO_CACHE_BACKEND", default="fakeredis"))  # noqa F405
 
 # PASSWORDS
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#password-hashers
 PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+USER_IMPORT_HASH_WORKERS = 1
 
 # TEMPLATES
 # ------------------------------------------------------------------------------
@@ -42,6 +39,11 @@ TEMPLATES[-1]["OPTIONS"]["loaders"] = [  # type: ignore[index] # noqa F405
     )
 ]
 
+# VITE
+# ------------------------------------------------------------------------------
+# render pages without a frontend build (manifest.json)
+DJANGO_VITE["default"]["dev_mode"] = True  # noqa F405
+
 # EMAIL
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#email-backend
@@ -4,6 +4,12 @@ from django.contrib import admin
 from django.urls import include, path
 from django.views import defaults as default_views
 
+from backend_django.users.api.views import (
+    ConditionalUserDetailsView,
+    UserImportJobView,
+    UserImportView,
+)
+
 # from rest_framework.authtoken.views import obtain_auth_token
 
 
@@ -22,8 +28,21 @@ urlpatterns = [
 api_base = "api/v1/"
 urlpatterns += [
     # API base url
+    # dj_rest_auth's user details, with conditional GET
+    path(
+        api_base + "user/",
+        ConditionalUserDetailsView.as_view(),
+        name="rest_user_details",
+    ),
     path(api_base, include("dj_rest_auth.urls")),
     path(api_base + "registration/", include("dj_rest_auth.registration.urls")),
+    # before the router's users/<username>/
+    path(api_base + "users/import/", UserImportView.as_view(), name="user_import"),
+    path(
+        api_base + "users/import/<int:pk>/",
+        UserImportJobView.as_view(),
+        name="user_import_job",
+    ),
     path(api_base, include("backend_django.config.api_router")),
     path(api_base, include("backend_django.api.urls")),
     # DRF auth token
@@ -1,25 +1,66 @@
-from pathlib import Path
+import uuid
 
 import pytest
 
+from django.core.cache import caches
 from django.core.management import call_command
 
 from backend_django.users.models import User
 from backend_django.users.tests.factories import UserFactory
 
 
+@pytest.fixture(scope="session")
+def django_db_setup(
+    request,
+    django_test_environment,
+    django_db_blocker,
+    django_db_use_migrations,
+    django_db_keepdb,
+    django_db_createdb,
+    django_db_modify_db_settings,
+):
+    """
+    pytest-django's test database setup, but on PostgreSQL every (xdist) worker
+    clones a migrated and seeded template database, see backend_django/utils/testdb.py.
+    """
+    from django.apps import apps
+    from django.conf import settings
+
+    from backend_django.utils.testdb import setup_test_databases
+
+    if not django_db_use_migrations:
+        # --nomigrations: create the tables from the models
+        settings.MIGRATION_MODULES = {app.label: None for app in apps.get_app_configs()}
+    verbosity = request.config.option.verbose
+    with django_db_blocker.unblock():
+        teardown = setup_test_databases(
+            verbosity=verbosity,
+            keepdb=django_db_keepdb and not django_db_createdb,
+            rebuild=django_db_createdb,
+            run_id=getattr(request.config, "workerinput", {}).get(
+                "testrunuid", uuid.uuid4().hex
+            ),
+        )
+
+    yield
+
+    if not django_db_keepdb:
+        with django_db_blocker.unblock():
+            teardown()
+
+
 @pytest.fixture(autouse=True, scope="session")
 def _load_fixtures(django_db_setup, django_db_blocker):
-    """Load all JSON fixtures into the test database, guarded by SetupFlag."""
+    """Load the fixtures into the test database, new and changed ones only."""
     with django_db_blocker.unblock():
-        from backend_django.site_config.models import SetupFlag
-
-        if not SetupFlag.objects.filter(setup_complete=True).exists():
-            fixture_dir = Path(__file__).resolve().parent / "fixtures"
-            fixtures = sorted(fixture_dir.glob("*.json"))
-            if fixtures:
-                call_command("loaddata", *[str(f) for f in fixtures])
-            SetupFlag.objects.create(setup_complete=True)
+        call_command("load_fixtures_fast", guard=True, verbosity=0)
+
+
+@pytest.fixture(autouse=True)
+def _clear_caches():
+    """Cached tokens and users must not leak into tests reusing the same pks."""
+    for cache in caches.all():
+        cache.clear()
 
 
 @pytest.fixture(autouse=True)
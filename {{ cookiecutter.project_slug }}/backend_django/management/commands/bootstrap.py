@@ -0,0 +1,177 @@
+import hashlib
+import os
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.staticfiles.finders import get_finders
+from django.core.cache import caches
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.migrations.executor import MigrationExecutor
+from django.utils import translation
+from django.utils.crypto import salted_hmac
+
+from backend_django.site_config.fixtures import (
+    changed_fixtures,
+    fixture_files,
+    removed_fixtures,
+)
+from backend_django.utils.page_cache import CACHE_ALIAS, cached_paths, page_cache_key
+
+PHASES = ["migrate", "fixtures", "superuser", "collectstatic", "pages"]
+
+# fingerprint of the static files last collected, kept in STATIC_ROOT (of the image,
+# see docker/production/django/Dockerfile)
+STATIC_FINGERPRINT = ".collectstatic-fingerprint"
+# digest of the superuser last created or updated, kept in the default cache
+SUPERUSER_MARKER = "bootstrap:superuser"
+
+
+class Command(BaseCommand):
+    """
+    Prepare the database, static files and caches for a container start in one
+    process, instead of one Django start-up per step:
+
+      migrate        apply migrations                   skipped: none unapplied
+      fixtures       load new/changed fixtures          skipped: none changed
+      superuser      create_or_update_superuser         skipped: user up to date
+      collectstatic  collect static files               skipped: files unchanged
+      pages          warm_page_cache                    skipped: pages cached/disabled
+
+    and report the time of each phase. --force runs every selected phase.
+    """
+
+    help = "Runs the start-up steps of a container in one process."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--only",
+            action="append",
+            choices=PHASES,
+            help="Run only this phase (repeatable).",
+        )
+        parser.add_argument(
+            "--skip",
+            action="append",
+            choices=PHASES,
+            default=[],
+            help="Don't run this phase (repeatable).",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Run the phases even if their inputs have not changed.",
+        )
+        parser.add_argument(
+            "--exclude-dev",
+            action="store_true",
+            help="Don't load the dev_* fixtures (production).",
+        )
+
+    def handle(self, *args, **options):
+        self.verbosity = options["verbosity"]
+        phases = [
+            phase for phase in options["only"] or PHASES if phase not in options["skip"]
+        ]
+        total = time.perf_counter()
+        timings = []
+        for phase in phases:
+            start = time.perf_counter()
+            skipped = getattr(self, phase)(options["force"], options)
+            elapsed = time.perf_counter() - start
+            timings.append(
+                (phase, f"skipped, {skipped}" if skipped else "done", elapsed)
+            )
+
+        for phase, status, elapsed in timings:
+            self.stdout.write(f"{phase:<14} {elapsed:7.2f}s  {status}")
+        self.stdout.write(f"{'total':<14} {time.perf_counter() - total:7.2f}s")
+
+    # Each phase returns why it was skipped, or None when it ran.
+
+    def migrate(self, force, options):
+        executor = MigrationExecutor(connections[DEFAULT_DB_ALIAS])
+        if not force and not executor.migration_plan(
+            executor.loader.graph.leaf_nodes()
+        ):
+            return "no unapplied migrations"
+        call_command("migrate", interactive=False, verbosity=self.verbosity)
+
+    def fixtures(self, force, options):
+        paths = fixture_files(exclude_dev=options["exclude_dev"])
+        if not force and not (
+            changed_fixtures(paths, DEFAULT_DB_ALIAS)
+            or removed_fixtures(DEFAULT_DB_ALIAS)
+        ):
+            return "fixtures unchanged"
+        call_command(
+            "load_fixtures_fast",
+            guard=not force,
+            exclude_dev=options["exclude_dev"],
+            verbosity=self.verbosity,
+        )
+
+    def superuser(self, force, options):
+        cache = caches["default"]
+        marker = superuser_marker()
+        if not force and marker and cache.get(SUPERUSER_MARKER) == marker:
+            return "superuser is up to date"
+        call_command("create_or_update_superuser", verbosity=self.verbosity)
+        if marker := superuser_marker():
+            cache.set(SUPERUSER_MARKER, marker, timeout=None)
+
+    def collectstatic(self, force, options):
+        marker = Path(settings.STATIC_ROOT) / STATIC_FINGERPRINT
+        fingerprint = static_fingerprint()
+        if not force and marker.exists() and marker.read_text() == fingerprint:
+            return "static files unchanged"
+        call_command("collectstatic", interactive=False, verbosity=self.verbosity)
+        marker.write_text(fingerprint)
+
+    def pages(self, force, options):
+        if not settings.PAGE_CACHE_TIMEOUT:
+            return "page cache is disabled"
+        cache = caches[CACHE_ALIAS]
+        language = translation.get_supported_language_variant(settings.LANGUAGE_CODE)
+        keys = [page_cache_key(path, language) for path in cached_paths()]
+        if not force and all(key in cache for key in keys):
+            return "pages are cached"
+        call_command("warm_page_cache", verbosity=self.verbosity)
+
+
+def superuser_marker():
+    """
+    Digest of the DJANGO_SUPERUSER_* settings and the stored password hash of that
+    superuser, None if there is none. Compared instead of checking the password, which
+    costs a password hash; a password changed in the admin changes it as well.
+    """
+    username = os.environ.get("DJANGO_SUPERUSER_USERNAME")
+    email = os.environ.get("DJANGO_SUPERUSER_EMAIL")
+    password = os.environ.get("DJANGO_SUPERUSER_PASSWORD")
+    if not (username and password):
+        return None
+    user = (
+        get_user_model()
+        .objects.filter(
+            username=username, email=email, is_staff=True, is_superuser=True
+        )
+        .values_list("password", flat=True)
+        .first()
+    )
+    if user is None:
+        return None
+    value = "\0".join([username, email or "", password, user])
+    return salted_hmac(SUPERUSER_MARKER, value, algorithm="sha256").hexdigest()
+
+
+def static_fingerprint() -> str:
+    """Hash of the path, size and modification time of every static source file."""
+    digest = hashlib.sha256(repr(settings.STORAGES["staticfiles"]).encode())
+    for finder in get_finders():
+        for path, storage in finder.list(["CVS", ".*", "*~"]):
+            stat = os.stat(storage.path(path))
+            digest.update(f"{path}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()
@@ -0,0 +1,76 @@
+import json
+import sys
+from contextlib import nullcontext
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from backend_django.users.bulk_import import FORMATS, import_users, read_rows
+from backend_django.utils.hashing import hashing_pool
+
+
+class Command(BaseCommand):
+    """
+    Create users from a CSV file (with a header row) or a JSON Lines file, see
+    backend_django/users/bulk_import.py for the fields. Skipped rows are listed with
+    their line number and errors at the end.
+    """
+
+    help = "Creates users in bulk from a CSV or JSON Lines file ('-' for stdin)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV or JSON Lines file, '-' for stdin.")
+        parser.add_argument(
+            "--format",
+            choices=FORMATS,
+            help="Input format (default: from the file suffix, csv for stdin).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Users per transaction (default: 1000).",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            help="Password hashing processes (default: one per CPU).",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        format = options["format"]
+        if format is None:
+            format = "jsonl" if Path(path).suffix in (".jsonl", ".ndjson") else "csv"
+        if path == "-":
+            file = nullcontext(sys.stdin)
+        else:
+            try:
+                file = open(path, newline="", encoding="utf-8")
+            except OSError as e:
+                raise CommandError(f"Cannot read {path}: {e}")
+
+        def progress(result):
+            if options["verbosity"] >= 1:
+                self.stdout.write(
+                    f"{result.created} users created, {len(result.errors)} skipped "
+                    f"({result.users_per_second:.0f} users/s)"
+                )
+
+        with file as lines, hashing_pool(options["workers"]) as pool:
+            result = import_users(
+                read_rows(lines, format),
+                batch_size=options["batch_size"],
+                pool=pool,
+                progress=progress,
+            )
+
+        for error in result.errors:
+            self.stderr.write(f"line {error['line']}: {json.dumps(error['errors'])}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {result.created} users in {result.seconds:.1f} s "
+                f"({result.users_per_second:.0f} users/s), "
+                f"skipped {len(result.errors)} rows."
+            )
+        )
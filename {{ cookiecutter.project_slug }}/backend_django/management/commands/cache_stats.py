@@ -0,0 +1,62 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management.base import BaseCommand
+
+
+def format_bytes(size: int) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+class Command(BaseCommand):
+    """
+    Report hit ratio, number of keys and memory of every cache alias.
+
+    Hits and misses are counted by the backends of backend_django/utils/cache.py across
+    all processes since the last --reset; memory of Redis aliases is extrapolated from
+    a sample of keys.
+    """
+
+    help = "Reports hit ratio, key count and memory per cache alias."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Reset the hit/miss counters after reporting.",
+        )
+
+    def handle(self, *args, **options):
+        rows = [("alias", "backend", "hits", "misses", "hit ratio", "keys", "memory")]
+        for alias in settings.CACHES:
+            cache = caches[alias]
+            backend = settings.CACHES[alias]["BACKEND"].rsplit(".", 1)[-1]
+            if not hasattr(cache, "read_stats"):
+                rows.append((alias, backend, "-", "-", "-", "-", "-"))
+                continue
+
+            stats = cache.read_stats()
+            keys, memory = cache.key_stats()
+            lookups = stats["hits"] + stats["misses"]
+            ratio = f"{stats['hits'] / lookups:.1%}" if lookups else "-"
+            rows.append(
+                (
+                    alias,
+                    backend,
+                    str(stats["hits"]),
+                    str(stats["misses"]),
+                    ratio,
+                    str(keys),
+                    format_bytes(memory),
+                )
+            )
+            if options["reset"]:
+                cache.reset_stats()
+
+        widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+        for row in rows:
+            self.stdout.write(
+                "  ".join(cell.ljust(width) for cell, width in zip(row, widths))
+            )
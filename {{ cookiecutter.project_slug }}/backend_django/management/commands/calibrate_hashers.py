@@ -0,0 +1,179 @@
+import os
+import platform
+import statistics
+import time
+from datetime import date
+from pathlib import Path
+
+from django.contrib.auth import hashers
+from django.core.management.base import BaseCommand
+
+from backend_django.users import hashers as project_hashers
+
+# OWASP password storage cheat sheet minimums
+ARGON2_MIN_COST = 19 * 1024 * 2  # KiB x iterations
+PBKDF2_MIN_ITERATIONS = 600_000
+
+MODULE = '''"""
+Password hashers of PASSWORD_HASHERS with the project's cost parameters, generated
+by `python manage.py calibrate_hashers --write` for {target_ms} ms per hash on
+{host} ({cpus} CPUs) on {date}.
+
+They keep the algorithm names of Django's hashers, so they verify existing hashes,
+and a user logging in with a hash of other parameters (older or costlier) gets it
+rehashed with these (Django's check_password() and must_update()).
+"""
+
+from django.contrib.auth import hashers
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    time_cost = {time_cost}
+    memory_cost = {memory_cost}  # KiB
+    parallelism = {parallelism}
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    iterations = {iterations}
+'''
+
+
+class Command(BaseCommand):
+    """
+    Find the Argon2 and PBKDF2 cost parameters taking --target-ms per hash on this
+    host and print backend_django/users/hashers.py with them (--write replaces it).
+    Run it on a production host, under no other load.
+
+    Argon2 (per --parallelism): the largest memory up to --max-memory for which one
+    iteration stays within the target, then as many iterations as fit. The CPU time
+    column shows what a login costs the host: lanes run in parallel threads, so more
+    of them lower the latency but not the CPU time of a burst of logins.
+    """
+
+    help = "Calibrates the password hasher cost parameters to a target time per hash."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--target-ms",
+            type=float,
+            default=100,
+            help="Time per hash to calibrate for (default: 100).",
+        )
+        parser.add_argument(
+            "--max-memory",
+            type=int,
+            default=64,
+            help="Argon2 memory limit per hash in MiB (default: 64).",
+        )
+        parser.add_argument(
+            "--parallelism",
+            type=int,
+            nargs="+",
+            default=[1],
+            help="Argon2 lanes to try, the strongest fit is used (default: 1).",
+        )
+        parser.add_argument(
+            "--rounds",
+            type=int,
+            default=5,
+            help="Hashes per measurement, the median is used (default: 5).",
+        )
+        parser.add_argument(
+            "--write",
+            action="store_true",
+            help="Replace backend_django/users/hashers.py instead of printing it.",
+        )
+
+    def handle(self, *args, **options):
+        self.target = options["target_ms"]
+        self.rounds = options["rounds"]
+
+        fits = [
+            self.calibrate_argon2(parallelism, options["max_memory"] * 1024)
+            for parallelism in options["parallelism"]
+        ]
+        time_cost, memory_cost, parallelism = max(fits, key=lambda p: p[0] * p[1])
+        if time_cost * memory_cost < ARGON2_MIN_COST:
+            self.stderr.write(
+                self.style.WARNING(
+                    "Argon2 cost is below the OWASP minimum (19 MiB, 2 iterations), "
+                    "raise --target-ms."
+                )
+            )
+        iterations = self.calibrate_pbkdf2()
+        if iterations < PBKDF2_MIN_ITERATIONS:
+            self.stderr.write(
+                self.style.WARNING(
+                    f"PBKDF2 iterations are below the OWASP minimum "
+                    f"({PBKDF2_MIN_ITERATIONS}), raise --target-ms."
+                )
+            )
+
+        module = MODULE.format(
+            target_ms=f"{self.target:g}",
+            host=platform.node(),
+            cpus=os.cpu_count(),
+            date=date.today().isoformat(),
+            time_cost=time_cost,
+            memory_cost=memory_cost,
+            parallelism=parallelism,
+            iterations=iterations,
+        )
+        if options["write"]:
+            Path(project_hashers.__file__).write_text(module)
+            self.stderr.write(f"Wrote {project_hashers.__file__}")
+        else:
+            self.stdout.write(module, ending="")
+
+    def measure(self, hasher_class, **params) -> float:
+        """Median wall time of a hash in ms, reporting it and the CPU time."""
+        hasher = type("Hasher", (hasher_class,), params)()
+        wall, cpu = [], []
+        for _ in range(self.rounds):
+            start, start_cpu = time.perf_counter(), time.process_time()
+            hasher.encode("calibration password", hasher.salt())
+            wall.append((time.perf_counter() - start) * 1000)
+            cpu.append((time.process_time() - start_cpu) * 1000)
+        ms = statistics.median(wall)
+        self.stderr.write(
+            f"{hasher_class.algorithm} "
+            + ", ".join(f"{key}={value}" for key, value in params.items())
+            + f": {ms:.1f} ms, {statistics.median(cpu):.1f} ms CPU"
+        )
+        return ms
+
+    def calibrate_argon2(self, parallelism: int, max_memory: int):
+        """(time_cost, memory_cost, parallelism) within the target."""
+
+        def measure(time_cost, memory_cost):
+            return self.measure(
+                hashers.Argon2PasswordHasher,
+                time_cost=time_cost,
+                memory_cost=memory_cost,
+                parallelism=parallelism,
+            )
+
+        # argon2 needs at least 8 KiB per lane
+        memory_cost = max_memory
+        ms = measure(1, memory_cost)
+        while ms > self.target and memory_cost // 2 >= 8 * parallelism:
+            memory_cost //= 2
+            ms = measure(1, memory_cost)
+        # the time grows linearly with the iterations
+        time_cost = max(1, int(self.target // ms))
+        while time_cost > 1 and measure(time_cost, memory_cost) > self.target:
+            time_cost -= 1
+        return time_cost, memory_cost, parallelism
+
+    def calibrate_pbkdf2(self) -> int:
+        """Iterations within the target, rounded down to 1000."""
+        probe = 100_000
+        ms = self.measure(hashers.PBKDF2PasswordHasher, iterations=probe)
+        iterations = max(1000, int(probe * self.target / ms) // 1000 * 1000)
+        while (
+            iterations > 1000
+            and self.measure(hashers.PBKDF2PasswordHasher, iterations=iterations)
+            > self.target
+        ):
+            iterations = max(1000, int(iterations * 0.9) // 1000 * 1000)
+        return iterations
@@ -0,0 +1,66 @@
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+
+from backend_django.config.celery_app import app
+
+
+class Command(BaseCommand):
+    """
+    Give the task, group and chord results of the Redis result backend that don't
+    expire (stored before CELERY_RESULT_EXPIRES was set, or with it disabled) the
+    current expiry, or delete them with --delete.
+    """
+
+    help = "Expires or deletes the Celery results stored without an expiry."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--delete",
+            action="store_true",
+            help="Delete the results instead of letting them expire.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only count the results.",
+        )
+
+    def handle(self, *args, **options):
+        backend = app.backend
+        client = getattr(backend, "client", None)
+        if client is None or not hasattr(client, "scan_iter"):
+            raise CommandError(
+                f"{type(backend).__name__} isn't a Redis result backend."
+            )
+        expires = backend.expires
+        if not (options["delete"] or options["dry_run"] or expires):
+            raise CommandError("CELERY_RESULT_EXPIRES is disabled, use --delete.")
+
+        scanned = persistent = 0
+        for prefix in (backend.task_keyprefix, backend.group_keyprefix):
+            keys = client.scan_iter(match=prefix + b"*", count=1000)
+            while batch := list(islice(keys, 1000)):
+                scanned += len(batch)
+                pipe = client.pipeline(transaction=False)
+                for key in batch:
+                    pipe.ttl(key)
+                stale = [key for key, ttl in zip(batch, pipe.execute()) if ttl == -1]
+                persistent += len(stale)
+                if stale and not options["dry_run"]:
+                    if options["delete"]:
+                        client.delete(*stale)
+                    else:
+                        pipe = client.pipeline(transaction=False)
+                        for key in stale:
+                            pipe.expire(key, int(expires))
+                        pipe.execute()
+
+        action = (
+            "found"
+            if options["dry_run"]
+            else "deleted" if options["delete"] else f"set to expire in {expires:.0f} s"
+        )
+        self.stdout.write(
+            f"{scanned} results, {persistent} without an expiry {action}."
+        )
@@ -1,24 +1,32 @@
 from django.core.management.base import BaseCommand, CommandError
 from django.contrib.auth.hashers import (
     make_password,
-    Argon2PasswordHasher,
-    PBKDF2PasswordHasher,
     PBKDF2SHA1PasswordHasher,
     BCryptSHA256PasswordHasher
 )
 import getpass
+import sys
+from contextlib import nullcontext
+from itertools import islice
+
+from backend_django.users.hashers import Argon2PasswordHasher, PBKDF2PasswordHasher
+from backend_django.utils.hashing import hash_passwords, hashing_pool
 
 
 class Command(BaseCommand):
     help = 'Hash a password using Django\'s password hashers'
     
-    # Available hashers mapping
+    # Available hashers mapping (argon2 and pbkdf2 with the project's cost parameters)
     HASHERS = {
         'argon2': Argon2PasswordHasher,
         'pbkdf2': PBKDF2PasswordHasher,
         'pbkdf2_sha1': PBKDF2SHA1PasswordHasher,
         'bcrypt': BCryptSHA256PasswordHasher,
     }
+
+    # passwords of --batch sent to the pool at once: bounds the memory for large
+    # inputs, while the pool's per-task chunks keep every worker busy
+    BATCH_CHUNK = 1024
     
     def add_arguments(self, parser):
         parser.add_argument('passw', type=str, nargs='?', help='Password to hash (optional, will prompt if not provided)')
@@ -29,10 +37,29 @@ class Command(BaseCommand):
             choices=list(self.HASHERS.keys()),
             help='Hash algorithm to use (default: argon2)'
         )
+        parser.add_argument(
+            '--batch',
+            metavar='FILE',
+            help=(
+                "Hash the passwords of FILE ('-' for stdin), one per line, optionally "
+                "prefixed with an id and a tab; prints one 'id<TAB>hash' line per "
+                "password, in input order (the id defaults to the line number)"
+            )
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            help='Hashing processes in batch mode (default: one per CPU)'
+        )
     
     def handle(self, *args, **options):
         password = options['passw']
         hash_type = options['hash_type']
+
+        if options['batch']:
+            if password:
+                raise CommandError("Pass either a password or --batch, not both")
+            return self.handle_batch(options['batch'], hash_type, options['workers'])
         
         # If no password provided, ask interactively
         if not password:
@@ -68,3 +95,30 @@ class Command(BaseCommand):
             
         except Exception as e:
             raise CommandError(f"Error hashing password: {e}")
+
+    def handle_batch(self, path, hash_type, workers):
+        try:
+            file = nullcontext(sys.stdin) if path == '-' else open(path, encoding='utf-8')
+        except OSError as e:
+            raise CommandError(f"Cannot read {path}: {e}")
+
+        with file as lines, hashing_pool(workers) as pool:
+            entries = self.read_entries(lines)
+            while chunk := list(islice(entries, self.BATCH_CHUNK)):
+                hashes = hash_passwords(
+                    [password for _, password in chunk], pool, self.HASHERS[hash_type]
+                )
+                self.stdout.write(
+                    ''.join(f"{id}\t{hashed}\n" for (id, _), hashed in zip(chunk, hashes)),
+                    ending='',
+                )
+
+    @staticmethod
+    def read_entries(lines):
+        """Yield (id, password) of the non-empty lines."""
+        for number, line in enumerate(lines, start=1):
+            line = line.rstrip('\r\n')
+            if not line:
+                continue
+            id, tab, password = line.partition('\t')
+            yield (id, password) if tab else (str(number), line)
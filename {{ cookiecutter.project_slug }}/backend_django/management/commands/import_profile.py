@@ -0,0 +1,88 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from backend_django.utils.importtime import ENTRY_POINTS, profile_imports
+
+
+class Command(BaseCommand):
+    """
+    Report the startup import time of the gunicorn (wsgi/asgi) and Celery worker
+    processes with their heaviest packages and modules, measured with python -X
+    importtime in a new interpreter with the current settings, see
+    backend_django/utils/importtime.py. Self times are a module's own import, cumulative
+    times include the modules it imported first.
+    """
+
+    help = "Reports the heaviest imports of the web and worker processes at startup."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "entry_points",
+            nargs="*",
+            help=f"Of {', '.join(ENTRY_POINTS)} (default: wsgi and celery).",
+        )
+        parser.add_argument(
+            "--top",
+            type=int,
+            default=15,
+            help="Packages and modules listed per process (default: 15).",
+        )
+        parser.add_argument(
+            "--cumulative",
+            action="store_true",
+            help="Rank modules by cumulative instead of self time.",
+        )
+        parser.add_argument("--json", action="store_true", help="Output JSON.")
+
+    def handle(self, *args, **options):
+        top = options["top"]
+        profiles = []
+        for entry_point in options["entry_points"] or ["wsgi", "celery"]:
+            if entry_point not in ENTRY_POINTS:
+                raise CommandError(f"Unknown entry point {entry_point}")
+            try:
+                profiles.append(profile_imports(entry_point))
+            except RuntimeError as e:
+                raise CommandError(str(e))
+
+        if options["json"]:
+            self.stdout.write(
+                json.dumps(
+                    {
+                        profile.entry_point: {
+                            "seconds": round(profile.seconds, 3),
+                            "import_seconds": round(profile.import_seconds, 3),
+                            "modules": len(profile.modules),
+                            "packages": profile.heaviest_packages(top),
+                            "heaviest": profile.heaviest_modules(
+                                top, options["cumulative"]
+                            ),
+                        }
+                        for profile in profiles
+                    },
+                    indent=2,
+                )
+            )
+            return
+
+        kind = "cumulative" if options["cumulative"] else "self"
+        for profile in profiles:
+            self.stdout.write(
+                self.style.MIGRATE_HEADING(
+                    f"{profile.entry_point}: {profile.seconds:.2f} s to start, "
+                    f"{profile.import_seconds:.2f} s importing "
+                    f"{len(profile.modules)} modules"
+                )
+            )
+            self.stdout.write(f"  {'package':<40} {'self ms':>9} {'modules':>8}")
+            for package, microseconds, modules in profile.heaviest_packages(top):
+                self.stdout.write(
+                    f"  {package:<40} {microseconds / 1000:>9.1f} {modules:>8}"
+                )
+            self.stdout.write(f"\n  {'module':<56} {kind + ' ms':>15}")
+            for module, microseconds in profile.heaviest_modules(
+                top, options["cumulative"]
+            ):
+                self.stdout.write(f"  {module:<56} {microseconds / 1000:>15.1f}")
+            self.stdout.write("")
@@ -0,0 +1,223 @@
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from django.core import serializers
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.base import DEFER_FIELD
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, connections, router, transaction
+
+from backend_django.site_config.fixtures import (
+    changed_fixtures,
+    dependency_order,
+    fixture_files,
+    iter_objects,
+    record_fixtures,
+    removed_fixtures,
+)
+from backend_django.site_config.models import SetupFlag
+
+
+class Command(BaseCommand):
+    """
+    Load JSON/JSONL fixtures like loaddata, but streamed and in bulk: objects are
+    parsed one at a time (see iter_objects), collected per model and inserted with
+    bulk_create every --batch-size objects, so memory stays bounded and a batch
+    costs one query. Rows with an existing primary key are updated.
+
+    Everything runs in one transaction with constraint checks deferred to the end,
+    so a fixture may reference objects of later batches or files. Files are loaded
+    in dependency order and their content hashes recorded; with --guard, unchanged
+    files are skipped. Rows only upsert by primary key, so fixtures that may change
+    need a "pk" for every object, and rows dropped from a fixture stay in the
+    database.
+
+    As with loaddata, field values are written as they are in the fixture (auto_now
+    fields included) and a many-to-many field listed for an object replaces the
+    object's relations. Unlike loaddata, no pre_save/post_save signals are sent and
+    Model.save() is not called.
+    """
+
+    help = "Loads fixtures (default: backend_django/fixtures) in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "paths",
+            nargs="*",
+            type=Path,
+            help="Fixture files (default: all of backend_django/fixtures).",
+        )
+        parser.add_argument("--batch-size", type=int, default=2000)
+        parser.add_argument(
+            "--exclude-dev",
+            action="store_true",
+            help="Skip the dev_* fixtures of backend_django/fixtures (production).",
+        )
+        parser.add_argument(
+            "--guard",
+            action="store_true",
+            help="Load only new and changed fixtures (content hash), set SetupFlag.",
+        )
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        using = options["database"]
+        paths = options["paths"] or fixture_files(options["exclude_dev"])
+        for path in paths:
+            if not path.exists():
+                raise CommandError(f"No fixture {path}")
+
+        removed = []
+        if options["guard"]:
+            paths = changed_fixtures(paths, using)
+            if not options["paths"]:
+                removed = removed_fixtures(using)
+            if not paths and not removed:
+                self.stdout.write("Fixtures unchanged. Skipping fixture load.")
+                return
+        paths = dependency_order(paths)
+
+        start = time.perf_counter()
+        with transaction.atomic(using=using):
+            loader = BulkLoader(using, options["batch_size"])
+            for path in paths:
+                loader.load(path)
+            loader.finish()
+            record_fixtures(paths, using, removed)
+            flags = SetupFlag.objects.using(using)
+            if options["guard"] and not flags.filter(setup_complete=True).exists():
+                flags.create(setup_complete=True)
+
+        if options["verbosity"] >= 1:
+            self.stdout.write(
+                f"Installed {loader.count} object(s) from {len(paths)} fixture(s) "
+                f"in {time.perf_counter() - start:.1f}s"
+            )
+            for name in removed:
+                self.stdout.write(f"Forgot removed fixture {name}, its rows are kept.")
+
+
+class BulkLoader:
+    def __init__(self, using: str, batch_size: int):
+        self.using = using
+        self.batch_size = batch_size
+        self.connection = connections[using]
+        self.pending = defaultdict(list)
+        self.deferred = []
+        self.models = set()
+        self.count = 0
+
+    def load(self, path: Path):
+        objects = serializers.deserialize(
+            "python",
+            iter_objects(path),
+            using=self.using,
+            handle_forward_references=True,
+        )
+        with self.connection.constraint_checks_disabled():
+            for obj in objects:
+                model = type(obj.object)
+                if not router.allow_migrate_model(self.using, model):
+                    continue
+                batch = self.pending[model]
+                batch.append(obj)
+                if len(batch) >= self.batch_size:
+                    self.flush(model)
+            for model in list(self.pending):
+                self.flush(model)
+
+    def flush(self, model):
+        batch = self.pending.pop(model, [])
+        if not batch:
+            return
+        self.models.add(model)
+        instances = [obj.object for obj in batch]
+        manager = model._base_manager.using(self.using)
+        update_fields = [
+            field.name for field in model._meta.concrete_fields if not field.primary_key
+        ]
+        # bulk_create() runs Field.pre_save(), which sets auto_now fields, loaddata
+        # saves raw values: the values it changed are written again below
+        raw = [
+            [getattr(instance, field.attname) for field in model._meta.concrete_fields]
+            for instance in instances
+        ]
+        if all(instance.pk is not None for instance in instances):
+            # upsert, as loaddata overwrites existing rows
+            manager.bulk_create(
+                instances,
+                update_conflicts=bool(update_fields),
+                ignore_conflicts=not update_fields,
+                unique_fields=[model._meta.pk.name] if update_fields else None,
+                update_fields=update_fields or None,
+            )
+        else:
+            manager.bulk_create(instances)
+        self.restore_raw_values(model, instances, raw)
+        self.save_m2m(model, batch)
+        self.deferred += [obj for obj in batch if obj.deferred_fields]
+        self.count += len(batch)
+
+    def restore_raw_values(self, model, instances, raw):
+        fields = model._meta.concrete_fields
+        changed = {
+            field
+            for instance, values in zip(instances, raw)
+            for field, value in zip(fields, values)
+            if not field.primary_key and getattr(instance, field.attname) != value
+        }
+        if not changed:
+            return
+        for instance, values in zip(instances, raw):
+            for field, value in zip(fields, values):
+                if field in changed:
+                    setattr(instance, field.attname, value)
+        model._base_manager.using(self.using).bulk_update(
+            [instance for instance in instances if instance.pk is not None],
+            [field.name for field in changed],
+        )
+
+    def save_m2m(self, model, batch):
+        for field in model._meta.many_to_many:
+            through = field.remote_field.through
+            source = through._meta.get_field(field.m2m_field_name()).attname
+            target = through._meta.get_field(field.m2m_reverse_field_name()).attname
+            # objects listing the field, except forward references, which
+            # save_deferred_fields() sets
+            relations = {
+                obj.object.pk: pks
+                for obj in batch
+                if (pks := (obj.m2m_data or {}).get(field.name, DEFER_FIELD))
+                is not DEFER_FIELD
+            }
+            if not relations:
+                continue
+            rows = through._base_manager.using(self.using)
+            # replace the relations, as loaddata's related_manager.set() does
+            rows.filter(**{f"{source}__in": list(relations)}).delete()
+            rows.bulk_create(
+                [
+                    through(**{source: pk, target: target_pk})
+                    for pk, target_pks in relations.items()
+                    for target_pk in target_pks
+                ],
+                ignore_conflicts=True,
+            )
+
+    def finish(self):
+        """Resolve forward references, check the constraints, reset sequences."""
+        with self.connection.constraint_checks_disabled():
+            for obj in self.deferred:
+                obj.save_deferred_fields(using=self.using)
+        try:
+            self.connection.check_constraints(
+                table_names=[model._meta.db_table for model in self.models]
+            )
+        except Exception as e:
+            raise CommandError(f"Problem installing fixtures: {e}") from e
+        sql = self.connection.ops.sequence_reset_sql(no_style(), self.models)
+        if sql:
+            with self.connection.cursor() as cursor:
+                for line in sql:
+                    cursor.execute(line)
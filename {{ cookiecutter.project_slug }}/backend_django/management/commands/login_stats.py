@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from backend_django.users.throttling import get_redis, hash_concurrency
+
+
+class Command(BaseCommand):
+    """
+    Report the password checks of logins running right now per host, the
+    hash-work concurrency that LOGIN_MAX_CONCURRENT_HASHES sheds logins at, see
+    backend_django/users/throttling.py.
+    """
+
+    help = "Reports the login password checks running per host."
+
+    def handle(self, *args, **options):
+        if get_redis() is None:
+            self.stdout.write("Login limits need a Redis cache backend.")
+            return
+        limit = settings.LOGIN_MAX_CONCURRENT_HASHES or "unlimited"
+        running = hash_concurrency()
+        for host, count in sorted(running.items()):
+            self.stdout.write(f"{host}: {count} password checks running (max {limit})")
+        if not running:
+            self.stdout.write("No password checks running.")
@@ -0,0 +1,55 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import caches
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+from django.urls import get_resolver
+from django.utils import translation
+
+from backend_django.utils.page_cache import (
+    CACHE_ALIAS,
+    cached_paths,
+    page_cache_key,
+)
+
+
+class Command(BaseCommand):
+    """
+    Render the pages of backend_django/utils/page_cache.py into the cache, run at
+    deploy time so that the first visitors of a release don't pay for the rendering.
+    Pages already cached are rendered again.
+    """
+
+    help = "Pre-renders the anonymous page cache."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--language",
+            action="append",
+            dest="languages",
+            help="Language to render (repeatable, default: LANGUAGE_CODE).",
+        )
+
+    def handle(self, *args, **options):
+        cache = caches[CACHE_ALIAS]
+        factory = RequestFactory()
+        resolver = get_resolver()
+        for language in options["languages"] or [settings.LANGUAGE_CODE]:
+            # as LocaleMiddleware does, e.g. "en-us" -> "en"
+            language = translation.get_supported_language_variant(language)
+            with translation.override(language):
+                for path in cached_paths():
+                    cache.delete(page_cache_key(path, language))
+                    request = factory.get(path)
+                    request.user = AnonymousUser()
+                    start = time.perf_counter()
+                    match = resolver.resolve(path)
+                    response = match.func(request, *match.args, **match.kwargs)
+                    elapsed = (time.perf_counter() - start) * 1000
+                    cached = page_cache_key(path, language) in cache
+                    self.stdout.write(
+                        f"{language} {path}: {response.status_code}, "
+                        f"{'cached' if cached else 'not cacheable'} ({elapsed:.1f} ms)"
+                    )
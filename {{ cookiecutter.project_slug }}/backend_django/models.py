@@ -1,4 +1,3 @@
-from celery.utils.functional import uniq
 from django.db import models
 from django.contrib.auth import get_user_model
 
@@ -12,3 +11,41 @@ logger = logging.getLogger(__name__)
 
 User = get_user_model()
 
+
+class ChunkedJob(models.Model):
+    """
+    Progress and result of a fan_out() of a chunk task over the primary key ranges of a
+    queryset, see backend_django/tasks.py.
+    """
+
+    class Status(models.TextChoices):
+        PROCESSING = "processing"
+        COMPLETED = "completed"
+        FAILED = "failed"
+
+    name = models.CharField(max_length=255)
+    task = models.CharField(max_length=255)
+    status = models.CharField(
+        max_length=16, choices=Status.choices, default=Status.PROCESSING
+    )
+    chunks_total = models.PositiveIntegerField(default=0)
+    chunks_done = models.PositiveIntegerField(default=0)
+    retries = models.PositiveIntegerField(default=0)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.name} ({self.status})"
+
+    @property
+    def progress(self) -> float:
+        """Share of the chunks done, 0 to 1."""
+        if self.status == self.Status.COMPLETED:
+            return 1.0
+        return self.chunks_done / self.chunks_total if self.chunks_total else 0.0
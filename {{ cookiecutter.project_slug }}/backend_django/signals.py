@@ -0,0 +1,12 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from django_celery_beat.models import PeriodicTasks
+
+
+@receiver(post_save, sender=PeriodicTasks, dispatch_uid="beat_schedule_changed")
+def beat_schedule_changed(sender, instance, **kwargs):
+    # only beat needs the scheduler (and celery.beat): imported on the first change
+    from backend_django.utils.beat import notify_schedule_changed
+
+    # django_celery_beat saves PeriodicTasks on every change to a periodic task
+    notify_schedule_changed()
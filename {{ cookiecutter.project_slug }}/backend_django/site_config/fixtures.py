@@ -0,0 +1,178 @@
+"""
+The seed data in backend_django/fixtures, loaded by the bootstrap management command
+and the test suite. The content hash of every loaded file is recorded (LoadedFixture),
+so that only new and changed files are loaded again.
+
+Fixtures are Django's JSON serialization, either one array (*.json) or one object
+per line (*.jsonl, for large datasets). Files named dev_* hold development data
+(e.g. test users) and are not loaded in production.
+"""
+
+import hashlib
+import json
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from django.apps import apps
+
+FIXTURE_DIR = Path(__file__).resolve().parent.parent / "fixtures"
+FIXTURE_SUFFIXES = (".json", ".jsonl")
+
+_separators = re.compile(r"[\s,]*")
+# "model": "app_label.model_name" of the objects (or of a field value that looks like one)
+_model_label = re.compile(rb'"model"\s*:\s*"(\w+\.\w+)"')
+
+
+def fixture_files(exclude_dev: bool = False) -> list[Path]:
+    return [
+        path
+        for path in sorted(FIXTURE_DIR.iterdir())
+        if path.suffix in FIXTURE_SUFFIXES
+        and not (exclude_dev and path.name.startswith("dev_"))
+    ]
+
+
+def iter_objects(path: Path, chunk_size: int = 1 << 16):
+    """
+    Yield the objects of a fixture one by one, holding a chunk of the file and the
+    current object in memory rather than the whole file.
+    """
+    with open(path, encoding="utf-8") as file:
+        if path.suffix == ".jsonl":
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
+            return
+
+        decoder = json.JSONDecoder()
+        buffer = file.read(chunk_size).lstrip()
+        if not buffer.startswith("["):
+            raise ValueError(f"{path}: not a JSON array")
+        pos = 1
+        while True:
+            pos = _separators.match(buffer, pos).end()
+            if pos < len(buffer) and buffer[pos] == "]":
+                return
+            try:
+                obj, pos = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # the object continues in the next chunk (or the file is broken)
+                chunk = file.read(max(chunk_size, len(buffer) - pos))
+                if not chunk:
+                    raise
+                buffer, pos = buffer[pos:] + chunk, 0
+                continue
+            yield obj
+
+
+@dataclass(frozen=True)
+class FixtureScan:
+    sha256: str
+    # labels of the models the fixture holds
+    models: frozenset
+
+
+def scan_fixture(path: Path) -> FixtureScan:
+    """
+    Content hash and models of a fixture, from one read of the raw file (no JSON
+    parsing) per version of the file, shared by the guard, the dependency order and
+    the record of a load.
+    """
+    stat = path.stat()
+    return _scan_fixture(path.resolve(), stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=256)
+def _scan_fixture(path: Path, mtime_ns: int, size: int) -> FixtureScan:
+    digest = hashlib.sha256()
+    labels = set()
+    tail = b""
+    with open(path, "rb") as file:
+        while chunk := file.read(1 << 20):
+            digest.update(chunk)
+            # labels spanning two chunks are found in the tail of the previous one
+            data = tail + chunk
+            labels.update(match[1].decode() for match in _model_label.finditer(data))
+            tail = data[-256:]
+    return FixtureScan(digest.hexdigest(), frozenset(labels))
+
+
+def file_hash(path: Path) -> str:
+    return scan_fixture(path).sha256
+
+
+def changed_fixtures(paths: list[Path], using: str) -> list[Path]:
+    """The paths that were never loaded or have changed since."""
+    from backend_django.site_config.models import LoadedFixture
+
+    loaded = dict(LoadedFixture.objects.using(using).values_list("name", "sha256"))
+    return [path for path in paths if loaded.get(path.name) != file_hash(path)]
+
+
+def removed_fixtures(using: str) -> list[str]:
+    """Names of loaded fixtures no longer in FIXTURE_DIR."""
+    from backend_django.site_config.models import LoadedFixture
+
+    names = {path.name for path in fixture_files()}
+    return [
+        name
+        for name in LoadedFixture.objects.using(using).values_list("name", flat=True)
+        if name not in names
+    ]
+
+
+def record_fixtures(paths: list[Path], using: str, removed=()):
+    from backend_django.site_config.models import LoadedFixture
+
+    for path in paths:
+        if path.parent.resolve() == FIXTURE_DIR.resolve():
+            LoadedFixture.objects.using(using).update_or_create(
+                name=path.name, defaults={"sha256": file_hash(path)}
+            )
+    LoadedFixture.objects.using(using).filter(name__in=removed).delete()
+
+
+def related_models(model) -> set:
+    return {
+        field.related_model
+        for field in [*model._meta.fields, *model._meta.many_to_many]
+        if field.remote_field and field.related_model is not model
+    }
+
+
+def fixture_models(path: Path) -> set:
+    models = set()
+    for label in scan_fixture(path).models:
+        try:
+            models.add(apps.get_model(label))
+        except LookupError:
+            # not an object's model, but a field value
+            continue
+    return models
+
+
+def dependency_order(paths: list[Path]) -> list[Path]:
+    """
+    Sort fixtures so that a file comes after the files holding the models it refers
+    to, by name otherwise (and in cycles, constraints are only checked at the end).
+    """
+    if len(paths) < 2:
+        return list(paths)
+    models = {path: fixture_models(path) for path in paths}
+    needs = {
+        path: set().union(*map(related_models, models[path])) - models[path]
+        for path in paths
+    }
+    ordered, remaining = [], sorted(paths)
+    while remaining:
+        ready = [
+            path
+            for path in remaining
+            if not any(needs[path] & models[other] for other in remaining)
+        ]
+        path = (ready or remaining)[0]
+        ordered.append(path)
+        remaining.remove(path)
+    return ordered
@@ -0,0 +1,30 @@
+# Generated by Django 5.1.15 on 2026-10-17 19:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("site_config", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LoadedFixture",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=255, unique=True)),
+                ("sha256", models.CharField(max_length=64)),
+                ("loaded_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
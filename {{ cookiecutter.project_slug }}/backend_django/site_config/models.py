@@ -6,3 +6,16 @@ class SetupFlag(models.Model):
     has been completed.
     """
     setup_complete = models.BooleanField(default=False)
+
+
+class LoadedFixture(models.Model):
+    """
+    The content hash of a file in backend_django/fixtures when it was last loaded,
+    so that only new and changed fixtures are loaded again.
+    """
+    name = models.CharField(max_length=255, unique=True)
+    sha256 = models.CharField(max_length=64)
+    loaded_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.name
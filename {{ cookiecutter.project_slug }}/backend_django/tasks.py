@@ -1,17 +1,355 @@
 from logging import debug
 from re import X
 from backend_django.config import celery_app
-from celery import shared_task, Task
+import hashlib
+import json
+import threading
+
+from celery import chord, shared_task, Task, uuid
+from celery.exceptions import Ignore
 from celery.utils.log import get_task_logger
-from celery.signals import task_revoked
+from celery.signals import task_postrun, task_revoked
 
 from django.conf import settings
-from django.db.models import Q
+from django.db import InterfaceError, OperationalError, transaction
+from django.db.models import F, Max, Min, Q
+from django.utils import timezone
+from redis.exceptions import RedisError, WatchError
 
+from backend_django.config.celery_app import BULK, DEFAULT, QUEUES
+from backend_django.models import ChunkedJob
+from backend_django.utils.cache import redis_client
 
 
 logger = get_task_logger(__name__)
 
 
+class RoutedTask(Task):
+    """
+    Base class of the project's tasks: `queue` is one of QUEUES (see
+    backend_django/config/celery_app.py), `priority` orders the tasks within it,
+    0 (first) to 9, default CELERY_TASK_DEFAULT_PRIORITY.
+    """
+
+    queue = DEFAULT
+    priority = None
+
+
+def task(queue: str = DEFAULT, priority: int | None = None, **options):
+    """
+    celery_app.task() for a task sent to `queue` with `priority`:
+
+        @task(queue=BULK)
+        def rebuild_search_index(): ...
+    """
+    if queue not in QUEUES:
+        raise ValueError(f"Unknown queue {queue!r}, expected one of {QUEUES}")
+    if priority is not None and not 0 <= priority <= 9:
+        raise ValueError(f"Priority {priority} isn't between 0 and 9")
+    options.setdefault("base", RoutedTask)
+    return celery_app.task(queue=queue, priority=priority, **options)
+
+
+# Singleton tasks: a SingletonTask doesn't start while another run of it with the same
+# arguments (lock_by_args, otherwise any run of the task) holds its lock, e.g. a beat job
+# that took longer than its interval; the second run is ignored. The lock is a Redis key
+# with a lease of lock_expires seconds, renewed while the task runs so that only the lock
+# of a killed worker expires, and released when the task returns, is retried or is
+# revoked (task_revoked). With dedup_window, sending the task again with the same
+# arguments within dedup_window seconds returns the AsyncResult of the first one
+# instead of queuing a duplicate (apply_async() only, not app.send_task()).
+#
+#     @task(queue=BEAT, base=SingletonTask, dedup_window=5 * 60)
+#     def sync_accounts(): ...
+#
+# Both use the Redis client of the default cache; with other cache backends (locmem in
+# development) nothing is locked or deduplicated. Redis errors let the task through.
+
+
+def arguments_hash(args, kwargs) -> str:
+    arguments = json.dumps(
+        [list(args or ()), kwargs or {}], sort_keys=True, default=str
+    )
+    return hashlib.sha256(arguments.encode()).hexdigest()
+
+
+def if_owner(client, key: str, owner: str, command) -> bool:
+    """Run command(pipeline) in a transaction if `key` is set to `owner`."""
+    with client.pipeline() as pipe:
+        try:
+            pipe.watch(key)
+            if pipe.get(key) != owner.encode():
+                return False
+            pipe.multi()
+            command(pipe)
+            pipe.execute()
+            return True
+        except WatchError:
+            return False
+
+
+class LockLease(threading.Thread):
+    """Renews the lock of a running SingletonTask every third of its expiry."""
+
+    def __init__(self, client, key: str, owner: str, expires: float):
+        super().__init__(name=f"lease {key}", daemon=True)
+        self.client, self.key, self.owner, self.expires = client, key, owner, expires
+        self.stopped = threading.Event()
+
+    def run(self):
+        expires_ms = int(self.expires * 1000)
+        while not self.stopped.wait(self.expires / 3):
+            try:
+                renewed = if_owner(
+                    self.client,
+                    self.key,
+                    self.owner,
+                    lambda pipe: pipe.pexpire(self.key, expires_ms),
+                )
+            except RedisError:
+                logger.warning("Renewing lock %s failed", self.key, exc_info=True)
+                continue
+            if not renewed:
+                logger.warning("Lost lock %s of task %s", self.key, self.owner)
+                return
+
+    def stop(self):
+        self.stopped.set()
+
+
+# task id -> LockLease of the running SingletonTasks of this process
+_leases = {}
+
+
+class SingletonTask(RoutedTask):
+    """Base class of tasks that don't run concurrently, see above."""
+
+    lock_expires = 60
+    lock_by_args = True
+    dedup_window = 0
+
+    def lock_key(self, args, kwargs) -> str:
+        key = f"{settings.CACHE_KEY_PREFIX}:celery:lock:{self.name}"
+        return f"{key}:{arguments_hash(args, kwargs)}" if self.lock_by_args else key
+
+    def dedup_key(self, args, kwargs) -> str:
+        return (
+            f"{settings.CACHE_KEY_PREFIX}:celery:dedup:{self.name}:"
+            f"{arguments_hash(args, kwargs)}"
+        )
+
+    def apply_async(self, args=None, kwargs=None, task_id=None, **options):
+        client = redis_client() if self.dedup_window else None
+        if client is not None:
+            task_id = task_id or uuid()
+            key = self.dedup_key(args, kwargs)
+            try:
+                if not client.set(key, task_id, nx=True, ex=self.dedup_window):
+                    sent = client.get(key)
+                    # retries are sent with the same task id
+                    if sent and sent.decode() != task_id:
+                        logger.info("%s was sent as %s", self.name, sent.decode())
+                        return self.AsyncResult(sent.decode())
+            except RedisError:
+                logger.warning("Deduplicating %s failed", self.name, exc_info=True)
+        return super().apply_async(args, kwargs, task_id=task_id, **options)
+
+    def before_start(self, task_id, args, kwargs):
+        client = redis_client()
+        if client is None:
+            return
+        key = self.lock_key(args, kwargs)
+        try:
+            locked = client.set(key, task_id, nx=True, px=int(self.lock_expires * 1000))
+            # a redelivered task may hold its own lock still
+            locked = locked or client.get(key) == task_id.encode()
+        except RedisError:
+            logger.warning("Locking %s failed", key, exc_info=True)
+            return
+        if not locked:
+            logger.info("Ignoring %s[%s], it is running already", self.name, task_id)
+            raise Ignore()
+        lease = _leases[task_id] = LockLease(client, key, task_id, self.lock_expires)
+        lease.start()
+
+    def release_lock(self, task_id, args, kwargs):
+        lease = _leases.pop(task_id, None)
+        if lease is not None:
+            lease.stop()
+        client = redis_client()
+        if client is None:
+            return
+        key = self.lock_key(args, kwargs)
+        try:
+            if_owner(client, key, task_id, lambda pipe: pipe.delete(key))
+        except RedisError:
+            logger.warning("Releasing lock %s failed", key, exc_info=True)
+
+
+@task_postrun.connect
+def release_singleton_lock(sender=None, task_id=None, args=None, kwargs=None, **_):
+    if isinstance(sender, SingletonTask):
+        sender.release_lock(task_id, args, kwargs)
+
+
+@task_revoked.connect
+def release_revoked_lock(sender=None, request=None, **_):
+    # a terminated task's process is killed before task_postrun
+    if isinstance(sender, SingletonTask) and request is not None:
+        sender.release_lock(request.id, request.args, request.kwargs)
+
+
+# Chunked fan-out: a batch job over a large queryset, split into primary key ranges of
+# chunk_size rows, each processed by a chunk task on the bulk queue. The ranges are
+# dispatched in waves of max_in_flight chunks, each wave a chord whose callback
+# (fan_out_step) combines the chunk results into the job's ChunkedJob and dispatches the
+# next wave, so the broker holds at most max_in_flight chunks of a job at a time. A chunk
+# is retried on database connection errors; a chunk that still fails fails the job.
+#
+#     @chunk_task()
+#     def count_active(first, last):
+#         return User.objects.filter(pk__range=(first, last), is_active=True).count()
+#
+#     job = fan_out(count_active, User.objects.filter(is_active=True), name="active")
+#     ChunkedJob.objects.get(pk=job.pk).progress  # 0 to 1, then .result
+#
+# Chunk tasks get the first and last primary key of their range and have to apply the
+# queryset's filters themselves. Results must be JSON serializable; by default they are
+# combined with add_results().
+
+
+def add_results(total, result):
+    """Sum numbers, and dicts of numbers key by key."""
+    if total is None:
+        return result
+    if isinstance(total, dict):
+        return {
+            key: add_results(total.get(key), result.get(key))
+            for key in total.keys() | result.keys()
+        }
+    if result is None:
+        return total
+    return total + result
+
+
+def pk_ranges(queryset, chunk_size: int):
+    """Yield (first, last) primary keys of consecutive chunks of `queryset`."""
+    pks = queryset.order_by("pk").values("pk")
+    last = None
+    while True:
+        chunk = pks if last is None else pks.filter(pk__gt=last)
+        bounds = chunk[:chunk_size].aggregate(first=Min("pk"), last=Max("pk"))
+        if bounds["first"] is None:
+            return
+        last = bounds["last"]
+        yield bounds["first"], last
+
+
+class ChunkTask(RoutedTask):
+    """
+    Base class of chunk tasks, see chunk_task(). Called with the (first, last) primary
+    keys of a range and the job_id of its ChunkedJob, which it keeps up to date.
+    """
+
+    queue = BULK
+    ignore_result = False  # the chord callback needs the results
+    autoretry_for = (OperationalError, InterfaceError)
+    max_retries = 3
+    retry_backoff = True
+    combine = staticmethod(add_results)
+
+    def on_success(self, retval, task_id, args, kwargs):
+        if kwargs.get("job_id") is not None:
+            ChunkedJob.objects.filter(pk=kwargs["job_id"]).update(
+                chunks_done=F("chunks_done") + 1, updated_at=timezone.now()
+            )
+
+    def on_retry(self, exc, task_id, args, kwargs, einfo):
+        if kwargs.get("job_id") is not None:
+            ChunkedJob.objects.filter(pk=kwargs["job_id"]).update(
+                retries=F("retries") + 1, updated_at=timezone.now()
+            )
+
+    def on_failure(self, exc, task_id, args, kwargs, einfo):
+        if kwargs.get("job_id") is not None:
+            fail_job(kwargs["job_id"], f"Chunk {args[0]}-{args[1]}: {exc!r}")
+
+
+def chunk_task(queue: str = BULK, combine=add_results, **options):
+    """
+    task() for a chunk task of fan_out(), a function of the first and last primary key
+    of its range. `combine(total, result)` accumulates the chunk results (total is None
+    at first).
+    """
+    options.setdefault("base", ChunkTask)
+
+    def decorator(fun):
+        def run(first, last, job_id=None):
+            return fun(first, last)
+
+        for attr in ("__module__", "__name__", "__qualname__", "__doc__"):
+            setattr(run, attr, getattr(fun, attr))
+        return task(queue=queue, combine=staticmethod(combine), **options)(run)
+
+    return decorator
+
+
+def fail_job(job_id: int, error: str):
+    logger.error("Chunked job %s failed: %s", job_id, error)
+    now = timezone.now()
+    ChunkedJob.objects.filter(pk=job_id, status=ChunkedJob.Status.PROCESSING).update(
+        status=ChunkedJob.Status.FAILED, error=error, updated_at=now, finished_at=now
+    )
+
+
+def fan_out(
+    chunk_task: ChunkTask,
+    queryset,
+    name: str = "",
+    chunk_size: int = 10_000,
+    max_in_flight: int = 8,
+) -> ChunkedJob:
+    """
+    Run `chunk_task` over `queryset` in chunks of `chunk_size` rows, at most
+    `max_in_flight` at a time, see above. Returns the job's ChunkedJob; the first wave
+    is sent when the current transaction commits.
+    """
+    ranges = list(pk_ranges(queryset, chunk_size))
+    job = ChunkedJob.objects.create(
+        name=name or chunk_task.name, task=chunk_task.name, chunks_total=len(ranges)
+    )
+    if ranges:
+        transaction.on_commit(lambda: _dispatch(job.pk, ranges, max_in_flight))
+    else:
+        fan_out_step([], job_id=job.pk, ranges=[], max_in_flight=max_in_flight)
+        job.refresh_from_db()
+    return job
+
+
+def _dispatch(job_id: int, ranges: list, max_in_flight: int):
+    chunk_task = celery_app.tasks[ChunkedJob.objects.get(pk=job_id).task]
+    wave, rest = ranges[:max_in_flight], ranges[max_in_flight:]
+    chord(
+        [chunk_task.s(first, last, job_id=job_id) for first, last in wave],
+        fan_out_step.s(job_id=job_id, ranges=rest, max_in_flight=max_in_flight),
+    ).apply_async()
 
 
+@task()
+def fan_out_step(results, job_id, ranges, max_in_flight):
+    """Chord callback of a wave of fan_out(): combine its results, send the next wave."""
+    with transaction.atomic():
+        job = ChunkedJob.objects.select_for_update().get(pk=job_id)
+        if job.status != ChunkedJob.Status.PROCESSING:
+            return
+        combine = celery_app.tasks[job.task].combine
+        for result in results:
+            job.result = combine(job.result, result)
+        job.chunks_done = job.chunks_total - len(ranges)
+        job.updated_at = timezone.now()
+        if not ranges:
+            job.status = ChunkedJob.Status.COMPLETED
+            job.finished_at = job.updated_at
+        job.save()
+    if ranges:
+        _dispatch(job_id, ranges, max_in_flight)
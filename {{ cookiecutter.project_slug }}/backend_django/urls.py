@@ -1,10 +1,16 @@
 from django.urls import path, include
 from django.views.generic import TemplateView
 
+from backend_django.utils.page_cache import cache_anonymous_page
+
+
+def page(template_name):
+    return cache_anonymous_page(TemplateView.as_view(template_name=template_name))
+
 
 urlpatterns = [
-    path("", TemplateView.as_view(template_name="home.html"), name="home"),
-    path("test/", TemplateView.as_view(template_name="test.html"), name="test"),
-    path("about/", TemplateView.as_view(template_name="about.html"), name="about"),
+    path("", page("home.html"), name="home"),
+    path("test/", page("test.html"), name="test"),
+    path("about/", page("about.html"), name="about"),
     path("users/", include("backend_django.users.urls", namespace="users")),
 ]
@@ -1,6 +1,10 @@
+from dj_rest_auth.serializers import LoginSerializer
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
 
+from backend_django.models import ChunkedJob
+from backend_django.users.throttling import check_login_rate, hashing_slot
+
 User = get_user_model()
 
 
@@ -12,3 +16,33 @@ class UserSerializer(serializers.ModelSerializer):
         extra_kwargs = {
             "url": {"view_name": "api:user-detail", "lookup_field": "username"}
         }
+
+
+class ImportJobSerializer(serializers.ModelSerializer):
+    progress = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = ChunkedJob
+        fields = [
+            "id",
+            "status",
+            "progress",
+            "result",
+            "error",
+            "created_at",
+            "finished_at",
+        ]
+
+
+class RateLimitedLoginSerializer(LoginSerializer):
+    """
+    dj_rest_auth's login, rejecting attempts over the per IP and per account limits
+    and shedding them while too many password checks run, before any password is
+    hashed; see backend_django/users/throttling.py.
+    """
+
+    def validate(self, attrs):
+        account = attrs.get("email") or attrs.get("username") or ""
+        check_login_rate(self.context["request"], account)
+        with hashing_slot():
+            return super().validate(attrs)
@@ -1,16 +1,40 @@
+import uuid
+
+from dj_rest_auth.views import UserDetailsView
 from django.contrib.auth import get_user_model
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import transaction
 from rest_framework import status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ParseError
+from rest_framework.generics import RetrieveAPIView
 from rest_framework.mixins import ListModelMixin, RetrieveModelMixin, UpdateModelMixin
+from rest_framework.parsers import BaseParser
+from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
+from rest_framework.reverse import reverse
+from rest_framework.views import APIView
 from rest_framework.viewsets import GenericViewSet
 
-from .serializers import UserSerializer
+from backend_django.api.conditional import ConditionalResponseMixin, version_key
+from backend_django.models import ChunkedJob
+from backend_django.users.tasks import import_users_file
+from backend_django.utils.transactions import AtomicMutationsMixin
+
+from .serializers import ImportJobSerializer, UserSerializer
 
 User = get_user_model()
 
 
-class UserViewSet(RetrieveModelMixin, ListModelMixin, UpdateModelMixin, GenericViewSet):
+class UserViewSet(
+    AtomicMutationsMixin,
+    ConditionalResponseMixin,
+    RetrieveModelMixin,
+    ListModelMixin,
+    UpdateModelMixin,
+    GenericViewSet,
+):
     serializer_class = UserSerializer
     queryset = User.objects.all()
     lookup_field = "username"
@@ -18,7 +42,79 @@ class UserViewSet(RetrieveModelMixin, ListModelMixin, UpdateModelMixin, GenericV
     def get_queryset(self, *args, **kwargs):
         return self.queryset.filter(id=self.request.user.id)
 
+    def get_version_keys(self):
+        # every action only shows the requesting user
+        return [version_key(User, self.request.user.pk)]
+
     @action(detail=False, methods=["GET"])
     def me(self, request):
+        # a sync view under ASGI as well, see "Server Modes" in docs/backend/django.md
         serializer = UserSerializer(request.user, context={"request": request})
         return Response(status=status.HTTP_200_OK, data=serializer.data)
+
+
+class ConditionalUserDetailsView(ConditionalResponseMixin, UserDetailsView):
+    """dj_rest_auth's /user/ endpoint (fetched by the Vue client) with ETag/304."""
+
+    def get_version_keys(self):
+        return [version_key(User, self.request.user.pk)]
+
+
+class StreamParser(BaseParser):
+    """Leaves the body unread, as a stream of byte lines, for the view to read."""
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        return stream
+
+
+class CSVStreamParser(StreamParser):
+    media_type = "text/csv"
+
+
+class JSONLinesStreamParser(StreamParser):
+    media_type = "application/jsonl"
+
+
+class NDJSONStreamParser(JSONLinesStreamParser):
+    media_type = "application/x-ndjson"
+
+
+class UserImportView(APIView):
+    """
+    Bulk user import for admins: POST a CSV (text/csv) or JSON Lines
+    (application/jsonl) body, see backend_django/users/bulk_import.py. The body is
+    streamed to the default storage and imported by the import_users_file task on
+    the bulk queue; the response (202) has the id and URL of the job, whose result
+    lists the skipped rows.
+    """
+
+    permission_classes = [IsAdminUser]
+    parser_classes = [CSVStreamParser, JSONLinesStreamParser, NDJSONStreamParser]
+
+    def post(self, request):
+        # DRF parses no body (Content-Length 0 or missing) to an empty dict
+        if not hasattr(request.data, "read"):
+            raise ParseError("Empty upload.")
+        format = "csv" if request.content_type.startswith("text/csv") else "jsonl"
+        name = default_storage.save(
+            f"user_imports/{uuid.uuid4().hex}.{format}", File(request.data)
+        )
+        job = ChunkedJob.objects.create(name="user_import", task=import_users_file.name)
+        encoding = request.encoding or "utf-8"
+        transaction.on_commit(
+            lambda: import_users_file.delay(job.pk, name, format, encoding)
+        )
+        url = reverse("user_import_job", args=[job.pk], request=request)
+        return Response(
+            {"id": job.pk, "url": url},
+            status=status.HTTP_202_ACCEPTED,
+            headers={"Location": url},
+        )
+
+
+class UserImportJobView(RetrieveAPIView):
+    """Status, progress (0 to 1) and, once completed, result of a user import."""
+
+    permission_classes = [IsAdminUser]
+    serializer_class = ImportJobSerializer
+    queryset = ChunkedJob.objects.filter(task=import_users_file.name)
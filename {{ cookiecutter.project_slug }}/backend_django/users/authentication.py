@@ -0,0 +1,108 @@
+import hashlib
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+
+def get_token_cache():
+    return caches[getattr(settings, "AUTH_TOKEN_CACHE_ALIAS", "default")]
+
+
+def token_cache_key(key: str) -> str:
+    # hash the token so raw credentials never show up in the cache keyspace
+    return "authtoken:key:" + hashlib.sha256(key.encode()).hexdigest()
+
+
+def user_token_cache_key(user_pk) -> str:
+    return f"authtoken:user:{user_pk}"
+
+
+def invalidate_user_token(user_pk):
+    """Drop the cached token of a user (if any), e.g. after the user row changed."""
+    cache = get_token_cache()
+    index_key = user_token_cache_key(user_pk)
+    # the user's entry holds the cache key of the token, not the token itself
+    cache_key = cache.get(index_key)
+    if cache_key is not None:
+        cache.delete_many([cache_key, index_key])
+
+
+def invalidate_token(key: str, user_pk=None):
+    """Drop a single cached token, e.g. after it was deleted on logout."""
+    cache = get_token_cache()
+    keys = [token_cache_key(key)]
+    if user_pk is not None:
+        keys.append(user_token_cache_key(user_pk))
+    cache.delete_many(keys)
+
+
+def user_fields(user) -> dict:
+    """The columns of a user that are cached, all but the password hash."""
+    return {
+        field.attname: getattr(user, field.attname)
+        for field in user._meta.concrete_fields
+        if field.attname != "password"
+    }
+
+
+def user_from_fields(fields: dict):
+    """
+    A user built from user_fields() with the password deferred: reading it queries
+    the database and save() only writes the cached fields.
+    """
+    return get_user_model().from_db(
+        DEFAULT_DB_ALIAS, list(fields), list(fields.values())
+    )
+
+
+def user_cache_key(user_pk) -> str:
+    return f"authuser:{user_pk}"
+
+
+def invalidate_cached_user(user_pk):
+    """Drop a user cached by backend_django.users.middleware."""
+    get_token_cache().delete(user_cache_key(user_pk))
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Drop-in replacement for DRF's TokenAuthentication which resolves tokens
+    through the cache instead of joining authtoken_token and users_user on
+    every request.
+
+    Entries live for at most AUTH_TOKEN_CACHE_TIMEOUT seconds and are dropped
+    as soon as the token is deleted (dj_rest_auth logout) or the user is
+    saved/deleted, see backend_django.users.signals.
+    Unknown or inactive tokens are never cached, so they still hit the database.
+    Entries hold the user's columns without the password hash (see user_fields()).
+    """
+
+    def authenticate_credentials(self, key):
+        cache = get_token_cache()
+        cache_key = token_cache_key(key)
+
+        entry = cache.get(cache_key)
+        if entry is not None:
+            user = user_from_fields(entry["user"])
+            token = Token.from_db(
+                DEFAULT_DB_ALIAS,
+                ["key", "user_id", "created"],
+                [key, user.pk, entry["created"]],
+            )
+            token.user = user
+            return user, token
+
+        user, token = super().authenticate_credentials(key)
+        # neither the token nor the password hash are stored in the cache
+        cache.set_many(
+            {
+                cache_key: {"user": user_fields(user), "created": token.created},
+                user_token_cache_key(user.pk): cache_key,
+            },
+            timeout=getattr(settings, "AUTH_TOKEN_CACHE_TIMEOUT", 300),
+        )
+        return user, token
@@ -0,0 +1,191 @@
+"""
+Bulk user import from CSV or JSON Lines, for the bulk_import_users management command
+and the /api/v1/users/import/ endpoint (the import_users_file task).
+
+Rows have the fields email (required), username (default: the email), name and
+password (default: an unusable password, e.g. for users signing in with a password
+reset). Each batch is validated, hashed in a process pool (backend_django/utils/
+hashing.py) and inserted with one bulk_create per table. Invalid rows, and rows whose
+username or email already exists (in the database or earlier in the input), are
+skipped and reported with their line number.
+
+bulk_create sends no post_save signals; no cache holds users that didn't exist yet.
+"""
+
+import csv
+import json
+import time
+from dataclasses import dataclass, field
+
+from allauth.account.models import EmailAddress
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.password_validation import validate_password
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models.functions import Lower
+from rest_framework import serializers
+
+from backend_django.api.conditional import bump_version
+from backend_django.utils.hashing import hash_passwords
+
+User = get_user_model()
+
+FORMATS = ("csv", "jsonl")
+
+
+class ImportRowSerializer(serializers.Serializer):
+    email = serializers.EmailField(max_length=254)
+    username = serializers.CharField(
+        max_length=150, required=False, validators=[User.username_validator]
+    )
+    name = serializers.CharField(max_length=255, required=False, allow_blank=True)
+    password = serializers.CharField(required=False, allow_blank=True)
+
+    def validate(self, data):
+        data["email"] = data["email"].lower()
+        data.setdefault("username", data["email"])
+        if data.get("password"):
+            try:
+                validate_password(
+                    data["password"],
+                    User(username=data["username"], email=data["email"]),
+                )
+            except ValidationError as e:
+                raise serializers.ValidationError({"password": e.messages})
+        return data
+
+
+@dataclass
+class ImportResult:
+    created: int = 0
+    errors: list = field(default_factory=list)
+    started: float = field(default_factory=time.perf_counter)
+
+    @property
+    def seconds(self) -> float:
+        return time.perf_counter() - self.started
+
+    @property
+    def users_per_second(self) -> float:
+        return self.created / self.seconds if self.seconds else 0.0
+
+    def error(self, line: int, errors):
+        self.errors.append({"line": line, "errors": errors})
+
+    def as_dict(self) -> dict:
+        return {
+            "created": self.created,
+            "skipped": len(self.errors),
+            "seconds": round(self.seconds, 3),
+            "users_per_second": round(self.users_per_second, 1),
+            "errors": self.errors,
+        }
+
+
+def read_rows(lines, format: str):
+    """Yield (line number, row dict) from an iterable of text lines."""
+    if format == "csv":
+        reader = csv.DictReader(lines)
+        for row in reader:
+            yield reader.line_num, {k: v for k, v in row.items() if k and v}
+    elif format == "jsonl":
+        for number, line in enumerate(lines, start=1):
+            if line.strip():
+                try:
+                    row = json.loads(line)
+                except ValueError as e:
+                    row = {"__error__": f"Invalid JSON: {e}"}
+                yield number, (
+                    row if isinstance(row, dict) else {"__error__": "Not an object"}
+                )
+    else:
+        raise ValueError(f"Unknown format {format!r}, expected one of {FORMATS}")
+
+
+def import_users(rows, batch_size=1000, pool=None, progress=None) -> ImportResult:
+    """
+    Create the users of `rows`, (line number, dict) pairs, batch by batch. `pool` is a
+    hashing_pool(); `progress` is called with the ImportResult after every batch.
+    """
+    result = ImportResult()
+    seen_usernames, seen_emails = set(), set()
+    batch = []
+    for line, row in rows:
+        if "__error__" in row:
+            result.error(line, {"row": [row["__error__"]]})
+            continue
+        serializer = ImportRowSerializer(data=row)
+        if not serializer.is_valid():
+            result.error(line, serializer.errors)
+            continue
+        data = serializer.validated_data
+        if data["username"] in seen_usernames or data["email"] in seen_emails:
+            result.error(line, {"row": ["Duplicate username or email in the input."]})
+            continue
+        seen_usernames.add(data["username"])
+        seen_emails.add(data["email"])
+        batch.append((line, data))
+        if len(batch) >= batch_size:
+            _create_batch(batch, pool, result)
+            batch = []
+            if progress:
+                progress(result)
+    if batch:
+        _create_batch(batch, pool, result)
+        if progress:
+            progress(result)
+    if result.created:
+        bump_version(User)
+    return result
+
+
+def _create_batch(batch, pool, result: ImportResult):
+    usernames = {data["username"] for _, data in batch}
+    emails = {data["email"] for _, data in batch}
+    taken_usernames = set(
+        User.objects.filter(username__in=usernames).values_list("username", flat=True)
+    )
+    taken_emails = set(
+        User.objects.annotate(email_lower=Lower("email"))
+        .filter(email_lower__in=emails)
+        .values_list("email_lower", flat=True)
+    )
+    new = []
+    for line, data in batch:
+        if data["username"] in taken_usernames or data["email"] in taken_emails:
+            result.error(line, {"row": ["A user with this username or email exists."]})
+        else:
+            new.append(data)
+
+    with_password = [data for data in new if data.get("password")]
+    hashes = hash_passwords([data["password"] for data in with_password], pool)
+    for data, hashed in zip(with_password, hashes):
+        data["password"] = hashed
+    users = [
+        User(
+            username=data["username"],
+            email=data["email"],
+            name=data.get("name", ""),
+            password=data.get("password") or make_password(None),
+        )
+        for data in new
+    ]
+    with transaction.atomic():
+        users = User.objects.bulk_create(users, batch_size=len(users) or None)
+        if users and users[0].pk is None:
+            # backends without RETURNING on bulk inserts
+            by_username = dict(
+                User.objects.filter(
+                    username__in=[u.username for u in users]
+                ).values_list("username", "pk")
+            )
+            for user in users:
+                user.pk = by_username[user.username]
+        EmailAddress.objects.bulk_create(
+            EmailAddress(
+                user_id=user.pk, email=user.email, primary=True, verified=False
+            )
+            for user in users
+        )
+    result.created += len(users)
@@ -0,0 +1,21 @@
+"""
+Password hashers of PASSWORD_HASHERS with the project's cost parameters, generated
+by `python manage.py calibrate_hashers --write`; these are Django's defaults, run the
+command on a production host to replace them with calibrated ones.
+
+They keep the algorithm names of Django's hashers, so they verify existing hashes,
+and a user logging in with a hash of other parameters (older or costlier) gets it
+rehashed with these (Django's check_password() and must_update()).
+"""
+
+from django.contrib.auth import hashers
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    time_cost = 2
+    memory_cost = 102400  # KiB
+    parallelism = 8
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    iterations = 870000
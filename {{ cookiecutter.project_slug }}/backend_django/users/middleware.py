@@ -0,0 +1,71 @@
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.utils.crypto import constant_time_compare
+from django.utils.functional import SimpleLazyObject
+
+from backend_django.users.authentication import (
+    get_token_cache,
+    user_cache_key,
+    user_fields,
+    user_from_fields,
+)
+
+
+def get_user(request):
+    """
+    django.contrib.auth.get_user() with the user loaded through the cache.
+
+    An entry holds the user's columns without the password hash (user_fields()) and
+    the session auth hash, which Django derives from the password hash: a session
+    whose hash doesn't match it goes through get_user() as before, which verifies it
+    (fallback secrets, password changes) and flushes it if need be.
+    """
+    session = request.session
+    user_id = session.get(auth.SESSION_KEY)
+    session_hash = session.get(auth.HASH_SESSION_KEY)
+    if (
+        user_id is None
+        or not session_hash
+        or session.get(auth.BACKEND_SESSION_KEY) not in settings.AUTHENTICATION_BACKENDS
+    ):
+        return auth.get_user(request)
+
+    cache = get_token_cache()
+    key = user_cache_key(user_id)
+    entry = cache.get(key)
+    if entry is not None and constant_time_compare(entry["session_hash"], session_hash):
+        return user_from_fields(entry["user"])
+
+    user = auth.get_user(request)
+    # unknown and inactive users are anonymous and not cached
+    if user.is_authenticated:
+        cache.set(
+            key,
+            {"user": user_fields(user), "session_hash": user.get_session_auth_hash()},
+            timeout=getattr(settings, "AUTH_USER_CACHE_TIMEOUT", 300),
+        )
+    return user
+
+
+class CachedAuthenticationMiddleware(AuthenticationMiddleware):
+    """
+    Django's AuthenticationMiddleware, loading the user of a session through the
+    cache instead of querying users_user on every session authenticated request.
+
+    Entries live for at most AUTH_USER_CACHE_TIMEOUT seconds and are dropped when
+    the user is saved or deleted, see backend_django.users.signals. Bulk updates
+    (QuerySet.update) bypass the signals, invalidate_cached_user() after them.
+    The authentication backends, whose paths are stored in the sessions, stay
+    Django's and allauth's.
+    """
+
+    def process_request(self, request):
+        super().process_request(request)
+        request.user = SimpleLazyObject(lambda: self.get_user(request))
+
+    @staticmethod
+    def get_user(request):
+        if not hasattr(request, "_cached_user"):
+            request._cached_user = get_user(request)
+        return request._cached_user
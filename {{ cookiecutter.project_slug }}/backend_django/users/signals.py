@@ -0,0 +1,34 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from backend_django.api.conditional import bump_version
+from backend_django.users.authentication import (
+    invalidate_cached_user,
+    invalidate_token,
+    invalidate_user_token,
+)
+
+User = get_user_model()
+
+
+@receiver(post_delete, sender=Token, dispatch_uid="users_invalidate_deleted_token")
+def invalidate_deleted_token(sender, instance, **kwargs):
+    invalidate_token(instance.key, user_pk=instance.user_id)
+
+
+@receiver(post_save, sender=User, dispatch_uid="users_invalidate_token_on_user_save")
+@receiver(
+    post_delete, sender=User, dispatch_uid="users_invalidate_token_on_user_delete"
+)
+def invalidate_user_token_cache(sender, instance, **kwargs):
+    invalidate_user_token(instance.pk)
+    invalidate_cached_user(instance.pk)
+
+
+@receiver(post_save, sender=User, dispatch_uid="users_bump_version_on_user_save")
+@receiver(post_delete, sender=User, dispatch_uid="users_bump_version_on_user_delete")
+def bump_user_version(sender, instance, **kwargs):
+    # ETag/Last-Modified of the users API, see backend_django.api.conditional
+    bump_version(User, instance.pk)
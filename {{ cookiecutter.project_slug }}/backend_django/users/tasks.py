@@ -1,11 +1,94 @@
+import codecs
+import math
+
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.db.models import Count, F, Q
+from django.utils import timezone
 
-from backend_django.config import celery_app
+from backend_django.config.celery_app import BULK
+from backend_django.models import ChunkedJob
+from backend_django.tasks import chunk_task, fail_job, fan_out, task
+from backend_django.users.bulk_import import import_users, read_rows
+from backend_django.utils.hashing import hashing_pool
 
 User = get_user_model()
 
 
-@celery_app.task()
+@task()
 def get_users_count():
     """A pointless Celery task to demonstrate usage."""
     return User.objects.count()
+
+
+@chunk_task()
+def count_users_chunk(first, last):
+    """User counts of a primary key range, see user_stats()."""
+    return User.objects.filter(pk__range=(first, last)).aggregate(
+        users=Count("pk"),
+        active=Count("pk", filter=Q(is_active=True)),
+        staff=Count("pk", filter=Q(is_staff=True)),
+        never_logged_in=Count("pk", filter=Q(last_login__isnull=True)),
+    )
+
+
+@task(queue=BULK)
+def user_stats(chunk_size=10_000, max_in_flight=8):
+    """
+    The counts of count_users_chunk() over all users, as a chunked job: the result is
+    in the ChunkedJob named "user_stats" once it completed.
+    """
+    job = fan_out(
+        count_users_chunk,
+        User.objects.all(),
+        name="user_stats",
+        chunk_size=chunk_size,
+        max_in_flight=max_in_flight,
+    )
+    return job.pk
+
+
+@task(queue=BULK)
+def import_users_file(job_id, name, format, encoding="utf-8", batch_size=1000):
+    """
+    Import the users of an upload to /api/v1/users/import/, the default_storage file
+    `name`, which is deleted afterwards. The job's ChunkedJob has one chunk per batch
+    (estimated from the line count) and the ImportResult so far.
+    """
+    try:
+        with default_storage.open(name, "rb") as file:
+            lines = sum(1 for _ in file)
+        ChunkedJob.objects.filter(pk=job_id).update(
+            chunks_total=max(1, math.ceil(lines / batch_size))
+        )
+
+        def progress(result):
+            ChunkedJob.objects.filter(pk=job_id).update(
+                chunks_done=F("chunks_done") + 1,
+                result=result.as_dict(),
+                updated_at=timezone.now(),
+            )
+
+        with (
+            default_storage.open(name, "rb") as file,
+            hashing_pool(settings.USER_IMPORT_HASH_WORKERS) as pool,
+        ):
+            rows = read_rows(codecs.iterdecode(file, encoding), format)
+            result = import_users(rows, batch_size, pool=pool, progress=progress)
+    except UnicodeDecodeError as e:
+        fail_job(job_id, f"Invalid encoding: {e}")
+        return
+    except Exception as e:
+        fail_job(job_id, repr(e))
+        raise
+    finally:
+        default_storage.delete(name)
+    now = timezone.now()
+    ChunkedJob.objects.filter(pk=job_id).update(
+        status=ChunkedJob.Status.COMPLETED,
+        chunks_done=F("chunks_total"),
+        result=result.as_dict(),
+        updated_at=now,
+        finished_at=now,
+    )
@@ -0,0 +1,14 @@
+from django.conf import settings
+from django.test import Client
+from django.urls import reverse
+
+
+def test_ping(client: Client):
+    response = client.get(reverse("ping"))
+
+    assert response.status_code == 200
+    assert response.json() == {"status": "ok", "version": settings.APP_VERSION}
+
+
+def test_ping_only_answers_get(client: Client):
+    assert client.post(reverse("ping")).status_code == 405
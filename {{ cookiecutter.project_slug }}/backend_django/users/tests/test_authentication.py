@@ -0,0 +1,80 @@
+import pytest
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+
+from backend_django.users.authentication import (
+    CachedTokenAuthentication,
+    get_token_cache,
+    token_cache_key,
+)
+from backend_django.users.models import User
+
+pytestmark = pytest.mark.django_db
+
+
+class TestCachedTokenAuthentication:
+    def test_second_lookup_hits_no_database(
+        self, user: User, django_assert_num_queries
+    ):
+        token = Token.objects.create(user=user)
+        auth = CachedTokenAuthentication()
+
+        with django_assert_num_queries(1):
+            assert auth.authenticate_credentials(token.key) == (user, token)
+        with django_assert_num_queries(0):
+            cached_user, cached_token = auth.authenticate_credentials(token.key)
+
+        assert cached_user == user
+        assert cached_token.key == token.key
+
+    def test_invalid_token_is_not_cached(self):
+        with pytest.raises(AuthenticationFailed):
+            CachedTokenAuthentication().authenticate_credentials("invalid")
+
+        assert get_token_cache().get(token_cache_key("invalid")) is None
+
+    def test_token_delete_invalidates(self, user: User):
+        key = Token.objects.create(user=user).key
+        auth = CachedTokenAuthentication()
+        auth.authenticate_credentials(key)
+
+        # what dj_rest_auth's LogoutView does
+        user.auth_token.delete()
+
+        assert get_token_cache().get(token_cache_key(key)) is None
+        with pytest.raises(AuthenticationFailed):
+            auth.authenticate_credentials(key)
+
+    def test_user_change_invalidates(self, user: User):
+        token = Token.objects.create(user=user)
+        auth = CachedTokenAuthentication()
+        auth.authenticate_credentials(token.key)
+
+        user.is_active = False
+        user.save()
+
+        assert get_token_cache().get(token_cache_key(token.key)) is None
+        with pytest.raises(AuthenticationFailed):
+            auth.authenticate_credentials(token.key)
+
+    def test_cache_holds_no_credentials(self, user: User):
+        token = Token.objects.create(user=user)
+        CachedTokenAuthentication().authenticate_credentials(token.key)
+
+        entry = get_token_cache().get(token_cache_key(token.key))
+        assert "password" not in entry["user"]
+        assert token.key not in repr(entry)
+
+    def test_saving_a_cached_user_keeps_the_password(self, user: User):
+        password = user.password
+        token = Token.objects.create(user=user)
+        auth = CachedTokenAuthentication()
+        auth.authenticate_credentials(token.key)
+        cached_user, _ = auth.authenticate_credentials(token.key)
+
+        cached_user.name = "Changed"
+        cached_user.save()
+
+        user.refresh_from_db()
+        assert user.name == "Changed"
+        assert user.password == password
@@ -0,0 +1,92 @@
+import pytest
+from django_celery_beat.models import CrontabSchedule, IntervalSchedule, PeriodicTask
+
+from backend_django.config.celery_app import app
+from backend_django.utils import beat
+from backend_django.utils.beat import InMemoryScheduler
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def periodic_tasks(django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        every_minute = IntervalSchedule.objects.create(
+            every=1, period=IntervalSchedule.MINUTES
+        )
+        nightly = CrontabSchedule.objects.create(minute="0", hour="3")
+        for i in range(5):
+            PeriodicTask.objects.create(
+                name=f"task {i}", task="tests.task", interval=every_minute
+            )
+        PeriodicTask.objects.create(name="nightly", task="tests.task", crontab=nightly)
+        PeriodicTask.objects.create(
+            name="disabled", task="tests.task", interval=every_minute, enabled=False
+        )
+
+
+@pytest.fixture
+def scheduler(periodic_tasks, monkeypatch):
+    # the connection is in the test's transaction, closing it would end the test
+    monkeypatch.setattr(beat, "close_old_connections", lambda: None)
+    scheduler = InMemoryScheduler(app=app, lazy=True)
+    scheduler.schedule
+    return scheduler
+
+
+def expire_check(scheduler):
+    scheduler._last_check -= beat.CHANGE_CHECK_SECONDS
+
+
+def test_loads_all_enabled_tasks_in_one_query(
+    periodic_tasks, django_assert_num_queries
+):
+    scheduler = InMemoryScheduler(app=app, lazy=True)
+
+    with django_assert_num_queries(1):
+        schedule = scheduler.schedule
+
+    assert set(schedule) == {
+        "task 0",
+        "task 1",
+        "task 2",
+        "task 3",
+        "task 4",
+        "nightly",
+    }
+
+
+def test_unchanged_schedule_isnt_reloaded(scheduler, django_assert_num_queries):
+    schedule = scheduler.schedule
+    expire_check(scheduler)
+
+    with django_assert_num_queries(0):
+        assert scheduler.schedule is schedule
+        assert scheduler.schedules_equal(None, schedule)
+
+
+def test_reloads_on_change(scheduler, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        PeriodicTask.objects.filter(name="disabled").get().save()
+        PeriodicTask.objects.filter(name="task 0").update(enabled=False)
+
+    # checked every CHANGE_CHECK_SECONDS
+    assert "task 0" in scheduler.schedule
+    expire_check(scheduler)
+
+    assert "task 0" not in scheduler.schedule
+    assert not scheduler.schedules_equal(None, scheduler.schedule)
+    assert scheduler.schedules_equal(None, scheduler.schedule)
+
+
+def test_sync_writes_in_one_query(scheduler, django_assert_num_queries):
+    for entry in list(scheduler.schedule.values()):
+        scheduler.reserve(entry)
+
+    with django_assert_num_queries(1):
+        scheduler.sync()
+
+    assert not scheduler._dirty
+    assert set(
+        PeriodicTask.objects.filter(total_run_count=1).values_list("name", flat=True)
+    ) == set(scheduler.schedule)
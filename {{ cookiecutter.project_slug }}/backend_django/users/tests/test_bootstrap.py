@@ -0,0 +1,76 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from backend_django.users.models import User
+
+pytestmark = pytest.mark.django_db
+
+
+def run(*args) -> str:
+    out = StringIO()
+    call_command("bootstrap", *args, stdout=out)
+    return out.getvalue()
+
+
+def bootstrap(*args) -> str:
+    return run("--skip", "collectstatic", "--skip", "pages", *args)
+
+
+@pytest.fixture(autouse=True)
+def superuser_env(monkeypatch):
+    monkeypatch.setenv("DJANGO_SUPERUSER_USERNAME", "admin")
+    monkeypatch.setenv("DJANGO_SUPERUSER_EMAIL", "admin@example.com")
+    monkeypatch.setenv("DJANGO_SUPERUSER_PASSWORD", "secret-password")
+
+
+class TestBootstrap:
+    def test_first_run_creates_the_superuser(self):
+        output = bootstrap()
+
+        # the test database is migrated and the fixtures loaded by conftest
+        assert "skipped, no unapplied migrations" in output
+        assert "skipped, fixtures unchanged" in output
+        assert User.objects.get(username="admin").is_superuser
+
+    def test_unchanged_superuser_is_skipped(self):
+        bootstrap()
+
+        assert "skipped, superuser is up to date" in bootstrap()
+
+    def test_unchanged_superuser_hashes_no_password(self, monkeypatch):
+        bootstrap()
+        monkeypatch.setattr(User, "check_password", pytest.fail)
+        monkeypatch.setattr(User, "set_password", pytest.fail)
+
+        assert "skipped, superuser is up to date" in bootstrap()
+
+    def test_password_changed_in_the_admin_is_reset(self):
+        bootstrap()
+        admin = User.objects.get(username="admin")
+        admin.set_password("changed-in-the-admin")
+        admin.save()
+
+        assert "superuser is up to date" not in bootstrap()
+        assert User.objects.get(username="admin").check_password("secret-password")
+
+    def test_changed_password_updates_the_superuser(self, monkeypatch):
+        bootstrap()
+        monkeypatch.setenv("DJANGO_SUPERUSER_PASSWORD", "new-password")
+
+        assert "superuser is up to date" not in bootstrap()
+        assert User.objects.get(username="admin").check_password("new-password")
+
+    def test_force_runs_skipped_phases(self):
+        bootstrap()
+
+        assert "skipped" not in bootstrap("--force", "--only", "superuser")
+
+    def test_collectstatic_is_skipped_when_files_are_unchanged(
+        self, settings, tmp_path
+    ):
+        settings.STATIC_ROOT = str(tmp_path / "static")
+
+        assert "skipped" not in run("--only", "collectstatic")
+        assert "skipped, static files unchanged" in run("--only", "collectstatic")
@@ -0,0 +1,205 @@
+import json
+import multiprocessing
+from pathlib import Path
+
+import pytest
+from allauth.account.models import EmailAddress
+from django.contrib.auth.hashers import check_password
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from backend_django.config.celery_app import app
+from backend_django.models import ChunkedJob
+from backend_django.users import bulk_import
+from backend_django.users.bulk_import import import_users, read_rows
+from backend_django.users.models import User
+from backend_django.users.tests.factories import UserFactory
+from backend_django.utils.hashing import hash_passwords, hashing_pool
+
+pytestmark = pytest.mark.django_db
+
+CSV = """email,username,name,password
+alice@example.com,alice,Alice,correct-horse-battery
+BOB@example.com,,Bob,
+not-an-email,carol,Carol,
+dave@example.com,dave,Dave,123
+alice@example.com,alice2,Alice Again,
+"""
+
+
+def import_csv(text: str, **options):
+    return import_users(read_rows(text.splitlines(keepends=True), "csv"), **options)
+
+
+class TestImportUsers:
+    def test_creates_valid_rows(self):
+        result = import_csv(CSV)
+
+        assert result.created == 2
+        alice = User.objects.get(username="alice")
+        assert alice.name == "Alice"
+        assert alice.check_password("correct-horse-battery")
+        bob = User.objects.get(email="bob@example.com")
+        assert bob.username == "bob@example.com"
+        assert not bob.has_usable_password()
+        assert EmailAddress.objects.get(user=alice).primary
+
+    def test_reports_invalid_rows(self):
+        result = import_csv(CSV)
+
+        errors = {error["line"]: error["errors"] for error in result.errors}
+        assert set(errors) == {4, 5, 6}
+        assert "email" in errors[4]
+        assert "password" in errors[5]
+        assert "Duplicate" in errors[6]["row"][0]
+
+    def test_existing_users_are_skipped(self, user: User):
+        result = import_csv(f"email,username\nnew@example.com,{user.username}\n")
+
+        assert result.created == 0
+        assert result.errors[0]["line"] == 2
+
+    def test_batches(self, django_assert_max_num_queries):
+        text = "email\n" + "".join(f"user{i}@example.com\n" for i in range(30))
+        batches = []
+
+        # per batch: 2 lookups, savepoint, 2 inserts, release
+        with django_assert_max_num_queries(3 * 6 + 5):
+            result = import_csv(text, batch_size=10, progress=batches.append)
+
+        assert result.created == 30
+        assert len(batches) == 3
+
+    def test_jsonl(self):
+        lines = [
+            json.dumps({"email": "eve@example.com", "name": "Eve"}) + "\n",
+            "not json\n",
+            "[]\n",
+        ]
+
+        result = import_users(read_rows(lines, "jsonl"))
+
+        assert result.created == 1
+        assert [error["line"] for error in result.errors] == [2, 3]
+
+
+def test_hashing_pool():
+    passwords = [f"password{i}" for i in range(20)]
+
+    with hashing_pool(2) as pool:
+        hashes = list(hash_passwords(passwords, pool))
+
+    assert all(map(check_password, passwords, hashes))
+
+
+def test_no_hashing_pool_in_daemonic_processes(monkeypatch):
+    # e.g. a Celery prefork worker process
+    monkeypatch.setattr(multiprocessing.current_process(), "daemon", True)
+
+    with hashing_pool(2) as pool:
+        assert pool is None
+
+
+def test_command(tmp_path: Path, capsys):
+    path = tmp_path / "users.csv"
+    path.write_text(CSV)
+
+    call_command("bulk_import_users", str(path), workers=1)
+
+    out, err = capsys.readouterr()
+    assert "Created 2 users" in out
+    assert "line 4:" in err
+    assert User.objects.filter(username="alice").exists()
+
+
+class TestUserImportView:
+    url = reverse("user_import")
+
+    @pytest.fixture
+    def client(self, monkeypatch, django_capture_on_commit_callbacks):
+        """An admin's client, running the import task eagerly after the request."""
+        monkeypatch.setattr(app.conf, "task_always_eager", True)
+        client = APIClient()
+        client.force_authenticate(UserFactory(is_staff=True))
+        post = client.post
+
+        def post_and_run(*args, **kwargs):
+            with django_capture_on_commit_callbacks(execute=True):
+                return post(*args, **kwargs)
+
+        client.post = post_and_run
+        return client
+
+    def test_admin_only(self, user: User):
+        client = APIClient()
+        client.force_authenticate(user)
+
+        response = client.post(self.url, CSV, content_type="text/csv")
+
+        assert response.status_code == 403
+        assert client.get(reverse("user_import_job", args=[1])).status_code == 403
+
+    def test_csv(self, client, settings):
+        response = client.post(self.url, CSV, content_type="text/csv")
+
+        assert response.status_code == 202
+        assert response["Location"] == response.data["url"]
+        job = client.get(response.data["url"]).data
+        assert job["status"] == "completed"
+        assert job["progress"] == 1.0
+        assert job["result"]["created"] == 2
+        assert [error["line"] for error in job["result"]["errors"]] == [4, 5, 6]
+        # the upload is deleted
+        assert not list(Path(settings.MEDIA_ROOT).rglob("*.csv"))
+
+    def test_jsonl(self, client):
+        body = json.dumps({"email": "eve@example.com"}) + "\n"
+
+        response = client.post(self.url, body, content_type="application/x-ndjson")
+
+        job = client.get(response.data["url"]).data
+        assert job["result"]["created"] == 1
+
+    def test_progress(self, client, monkeypatch):
+        progress = []
+        monkeypatch.setattr(
+            bulk_import,
+            "_create_batch",
+            lambda batch, pool, result: progress.append(
+                ChunkedJob.objects.get(name="user_import").progress
+            ),
+        )
+        body = "".join(
+            json.dumps({"email": f"user{i}@example.com"}) + "\n" for i in range(2500)
+        )
+
+        client.post(self.url, body, content_type="application/jsonl")
+
+        assert progress == [0.0, 1 / 3, 2 / 3]
+
+    def test_invalid_encoding(self, client):
+        response = client.post(self.url, b"email\n\xff\n", content_type="text/csv")
+
+        job = client.get(response.data["url"]).data
+        assert job["status"] == "failed"
+        assert job["error"].startswith("Invalid encoding")
+
+    def test_empty_upload(self, client):
+        response = client.post(self.url, b"", content_type="text/csv")
+
+        assert response.status_code == 400
+        assert response.data["detail"] == "Empty upload."
+        assert not ChunkedJob.objects.filter(name="user_import").exists()
+
+    def test_unsupported_media_type(self, client):
+        response = client.post(self.url, {"email": "eve@example.com"}, format="json")
+
+        assert response.status_code == 415
+
+    def test_other_jobs_are_not_found(self, client):
+        job = ChunkedJob.objects.create(name="user_stats", task="users.user_stats")
+
+        response = client.get(reverse("user_import_job", args=[job.pk]))
+
+        assert response.status_code == 404
@@ -0,0 +1,127 @@
+import fakeredis
+import pytest
+from django.core.cache import caches
+from django.core.management import call_command
+
+from backend_django.utils.cache import (
+    STATS_FLUSH_EVERY,
+    STATS_HITS,
+    STATS_MISSES,
+    StatsMixin,
+)
+
+pytestmark = pytest.mark.parametrize(
+    "cache_config", ["locmem", "fakeredis"], indirect=True
+)
+
+
+@pytest.fixture
+def cache_config(request):
+    """The CACHES entry of a fresh cache, in memory or in a fake Redis server."""
+    if request.param == "locmem":
+        return {
+            "BACKEND": "backend_django.utils.cache.LocMemCache",
+            "LOCATION": request.node.name,
+        }
+    return {
+        "BACKEND": "backend_django.utils.cache.RedisCache",
+        "LOCATION": "redis://localhost:6379/0",
+        "OPTIONS": {
+            "CONNECTION_POOL_KWARGS": {
+                "connection_class": fakeredis.FakeRedisConnection,
+                "server": fakeredis.FakeServer(),
+            },
+        },
+    }
+
+
+@pytest.fixture
+def stats_caches(cache_config, settings):
+    """Two caches sharing their storage, as in two processes."""
+    settings.CACHES = {"one": cache_config, "two": cache_config}
+    yield caches["one"], caches["two"]
+    caches["one"].clear()
+
+
+def stored(cache, key):
+    # the counter kept in the cache, without counting the lookup
+    return super(StatsMixin, cache).get(key)
+
+
+def test_counts_are_flushed_every_stats_flush_every_lookups(stats_caches):
+    cache = stats_caches[0]
+    cache.set("key", 1)
+
+    for _ in range(STATS_FLUSH_EVERY - 3):
+        cache.get("key")
+    cache.get_many(["missing"])
+
+    assert stored(cache, STATS_HITS) is None
+
+    cache.get_many(["key", "missing"])
+
+    assert stored(cache, STATS_HITS) == STATS_FLUSH_EVERY - 2
+    assert stored(cache, STATS_MISSES) == 2
+
+
+def test_read_stats_includes_the_unflushed_counts_of_this_process(stats_caches):
+    one, two = stats_caches
+    one.set("key", 1)
+    one.get("key")
+    one.get("missing")
+    two.get("missing")
+
+    assert one.read_stats() == {"hits": 1, "misses": 1}
+    # the unflushed count of the other process is missing until it flushes
+    assert two.read_stats() == {"hits": 1, "misses": 2}
+    # reading doesn't count as lookups
+    assert one.read_stats() == {"hits": 1, "misses": 2}
+
+
+def test_counter_evicted_before_incr(stats_caches, monkeypatch):
+    cache = stats_caches[0]
+    cache.get("missing")
+
+    def evicted(key, delta=1, version=None):
+        cache.delete(key)
+        raise ValueError(f"Key '{key}' not found")
+
+    monkeypatch.setattr(cache, "incr", evicted)
+
+    assert cache.read_stats() == {"hits": 0, "misses": 1}
+
+
+def test_reset(stats_caches):
+    cache = stats_caches[0]
+    cache.get("missing")
+
+    call_command("cache_stats", reset=True)
+
+    assert cache.read_stats() == {"hits": 0, "misses": 0}
+
+
+def test_table(stats_caches, capsys):
+    one, two = stats_caches
+    one.set("key", "value")
+    one.get("key")
+    one.get("key")
+    one.get("missing")
+
+    call_command("cache_stats")
+
+    header, *rows = capsys.readouterr().out.splitlines()
+    assert header.split() == [
+        "alias",
+        "backend",
+        "hits",
+        "misses",
+        "hit",
+        "ratio",
+        "keys",
+        "memory",
+    ]
+    backend = type(one).__name__
+    # the key and the two counters; two shares them
+    assert rows[0].split()[:6] == ["one", backend, "2", "1", "66.7%", "3"]
+    assert rows[1].split()[:6] == ["two", backend, "2", "1", "66.7%", "3"]
+    assert rows[0].split()[-1] == "B"
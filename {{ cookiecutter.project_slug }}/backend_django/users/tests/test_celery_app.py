@@ -0,0 +1,95 @@
+from unittest import mock
+
+import pytest
+
+from backend_django.config.celery_app import (
+    BEAT,
+    BULK,
+    DEFAULT,
+    HIGH,
+    app,
+    worker_profile,
+)
+from backend_django.tasks import task
+from backend_django.users.tasks import get_users_count
+
+
+@task(queue=BULK, priority=2)
+def bulk_task():
+    pass
+
+
+def published(name: str, **options) -> dict:
+    """Send a task with the broker publishing mocked, returning the message options."""
+    with (
+        mock.patch.object(app.amqp, "send_task_message") as send,
+        mock.patch.object(app.backend, "on_task_call"),
+    ):
+        app.send_task(name, **options)
+    return send.call_args.kwargs
+
+
+def test_default_profile():
+    assert app.conf.worker_prefetch_multiplier == 1
+    assert app.conf.task_acks_late
+    assert app.conf.task_reject_on_worker_lost
+    assert app.conf.broker_transport_options["visibility_timeout"] > (
+        app.conf.task_time_limit
+    )
+
+
+def test_io_profile():
+    profile = worker_profile("io")
+
+    assert profile["worker_pool"] == "threads"
+    assert profile["worker_prefetch_multiplier"] == 4
+
+
+def test_environment_overrides(monkeypatch):
+    monkeypatch.setenv("CELERY_WORKER_PROFILE", "cpu")
+    monkeypatch.setenv("CELERY_WORKER_CONCURRENCY", "3")
+    monkeypatch.setenv("CELERY_WORKER_POOL", "gevent")
+
+    profile = worker_profile()
+
+    assert profile["worker_concurrency"] == 3
+    assert profile["worker_pool"] == "gevent"
+    assert profile["worker_max_tasks_per_child"] == 100
+
+
+def test_unknown_profile():
+    with pytest.raises(ValueError, match="CELERY_WORKER_PROFILE"):
+        worker_profile("fast")
+
+
+class TestRouting:
+    @pytest.mark.parametrize(
+        "name, queue",
+        [
+            (get_users_count.name, DEFAULT),
+            (bulk_task.name, BULK),
+            ("celery.backend_cleanup", BEAT),
+            ("some.other.task", DEFAULT),
+        ],
+    )
+    def test_queue(self, name: str, queue: str):
+        assert published(name)["queue"].name == queue
+
+    def test_priority(self):
+        assert published(bulk_task.name)["priority"] == 2
+
+    def test_explicit_queue(self):
+        assert published(bulk_task.name, queue=HIGH)["queue"].name == HIGH
+
+    def test_apply_async(self):
+        with (
+            mock.patch.object(app.amqp, "send_task_message") as send,
+            mock.patch.object(app.backend, "on_task_call"),
+        ):
+            bulk_task.apply_async()
+
+        assert send.call_args.kwargs["queue"].name == BULK
+
+    def test_unknown_queue(self):
+        with pytest.raises(ValueError, match="queue"):
+            task(queue="urgent")
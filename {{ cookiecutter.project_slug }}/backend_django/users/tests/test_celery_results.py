@@ -0,0 +1,65 @@
+import fakeredis
+import pytest
+from django.core.management import call_command
+
+from backend_django.config.celery_app import app
+from backend_django.users.tasks import get_users_count
+from backend_django.utils.celery_results import (
+    COMPRESSED_PREFIX,
+    CompressedRedisBackend,
+)
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    backend = app.backend
+    monkeypatch.setattr(
+        backend, "client", fakeredis.FakeRedis(server=fakeredis.FakeServer())
+    )
+    return backend
+
+
+def test_settings():
+    assert isinstance(app.backend, CompressedRedisBackend)
+    assert app.backend.expires == 60 * 60
+    assert get_users_count.ignore_result
+
+
+def test_large_results_are_compressed(backend):
+    backend.store_result("large", "x" * 10_000, "SUCCESS")
+    backend.store_result("small", "x", "SUCCESS")
+
+    raw = backend.client.get(backend.get_key_for_task("large"))
+    assert raw.startswith(COMPRESSED_PREFIX)
+    assert len(raw) < 1000
+    assert not backend.client.get(backend.get_key_for_task("small")).startswith(
+        COMPRESSED_PREFIX
+    )
+    assert backend.get_result("large") == "x" * 10_000
+    assert backend.get_result("small") == "x"
+
+
+class TestResultsGC:
+    def test_expire(self, backend, capsys):
+        backend.client.set(backend.get_key_for_task("old"), b"{}")
+        backend.store_result("new", 1, "SUCCESS")
+
+        call_command("celery_results_gc")
+
+        assert "2 results, 1 without an expiry" in capsys.readouterr().out
+        assert 0 < backend.client.ttl(backend.get_key_for_task("old")) <= 60 * 60
+
+    def test_delete(self, backend):
+        backend.client.set(backend.get_key_for_task("old"), b"{}")
+        backend.client.set(backend.get_key_for_group("group"), b"{}")
+
+        call_command("celery_results_gc", delete=True)
+
+        assert backend.client.dbsize() == 0
+
+    def test_dry_run(self, backend):
+        backend.client.set(backend.get_key_for_task("old"), b"{}")
+
+        call_command("celery_results_gc", dry_run=True)
+
+        assert backend.client.ttl(backend.get_key_for_task("old")) == -1
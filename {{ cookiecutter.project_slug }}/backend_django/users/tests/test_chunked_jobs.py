@@ -0,0 +1,107 @@
+import pytest
+from django.db import OperationalError
+
+from backend_django.config.celery_app import app
+from backend_django.models import ChunkedJob
+from backend_django.tasks import add_results, chunk_task, fan_out, pk_ranges
+from backend_django.users.models import User
+from backend_django.users.tasks import count_users_chunk, user_stats
+from backend_django.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+attempts = []
+
+
+@chunk_task(name="tests.flaky_chunk", retry_backoff=False)
+def flaky_chunk(first, last):
+    attempts.append((first, last))
+    if attempts.count((first, last)) == 1:
+        raise OperationalError("connection lost")
+    return 1
+
+
+@chunk_task(name="tests.failing_chunk", max_retries=0)
+def failing_chunk(first, last):
+    raise OperationalError("connection lost")
+
+
+@pytest.fixture
+def eager(monkeypatch, django_capture_on_commit_callbacks):
+    """Run tasks eagerly, the waves of fan_out() when the context exits."""
+    monkeypatch.setattr(app.conf, "task_always_eager", True)
+    monkeypatch.setattr(app.conf, "task_eager_propagates", False)
+    return lambda: django_capture_on_commit_callbacks(execute=True)
+
+
+def test_pk_ranges():
+    UserFactory.create_batch(7)
+    pks = list(User.objects.order_by("pk").values_list("pk", flat=True))
+
+    ranges = list(pk_ranges(User.objects.all(), 3))
+
+    assert ranges == [
+        (pks[i], pks[min(i + 2, len(pks) - 1)]) for i in range(0, len(pks), 3)
+    ]
+    assert list(pk_ranges(User.objects.none(), 3)) == []
+
+
+def test_add_results():
+    total = add_results(None, {"users": 2, "staff": 1})
+
+    assert add_results(total, {"users": 3, "active": 1}) == {
+        "users": 5,
+        "staff": 1,
+        "active": 1,
+    }
+    assert add_results(add_results(None, 1), 2) == 3
+
+
+def test_user_stats(eager):
+    UserFactory.create_batch(5)
+    UserFactory.create_batch(2, is_active=False, is_staff=True)
+
+    chunks = -(-User.objects.count() // 2)
+
+    with eager():
+        job_id = user_stats.delay(chunk_size=2, max_in_flight=2).get()
+
+    job = ChunkedJob.objects.get(pk=job_id)
+    assert job.status == ChunkedJob.Status.COMPLETED
+    assert (job.chunks_done, job.chunks_total, job.progress) == (chunks, chunks, 1.0)
+    assert job.result == count_users_chunk(0, User.objects.latest("pk").pk)
+    assert job.result["staff"] >= 2
+
+
+def test_empty_queryset():
+    job = fan_out(count_users_chunk, User.objects.none())
+
+    assert job.status == ChunkedJob.Status.COMPLETED
+    assert job.chunks_total == 0
+    assert job.name == count_users_chunk.name
+
+
+def test_chunks_are_retried(eager):
+    UserFactory.create_batch(3)
+    attempts.clear()
+
+    with eager():
+        job = fan_out(flaky_chunk, User.objects.all(), chunk_size=2)
+
+    job.refresh_from_db()
+    assert job.status == ChunkedJob.Status.COMPLETED
+    chunks = -(-User.objects.count() // 2)
+    assert (job.retries, job.result) == (chunks, chunks)
+
+
+def test_failed_chunk_fails_the_job(eager):
+    UserFactory.create_batch(3)
+
+    # eagerly, the chord raises the chunk's error
+    with pytest.raises(OperationalError), eager():
+        job = fan_out(failing_chunk, User.objects.all(), chunk_size=2)
+
+    job.refresh_from_db()
+    assert job.status == ChunkedJob.Status.FAILED
+    assert "connection lost" in job.error
+    assert job.finished_at
@@ -0,0 +1,123 @@
+"""
+ReplicaRouter with a second, empty SQLite database standing in for a read replica:
+as nothing replicates into it, a user is only found when the read went to the primary.
+"""
+
+import pytest
+from django.db import connections, transaction
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from backend_django.config.db_router import (
+    PIN_COOKIE,
+    ReplicaPinningMiddleware,
+    pin_to_primary,
+    unpin,
+)
+from backend_django.users.models import User
+from backend_django.users.tasks import get_users_count
+from backend_django.users.tests.factories import UserFactory
+
+REPLICA = "replica1"
+
+pytestmark = pytest.mark.django_db(transaction=True, databases=["default", REPLICA])
+
+
+@pytest.fixture(scope="module", autouse=True)
+def replica_database(django_db_setup, django_db_blocker):
+    configured = connections.configure_settings(
+        {
+            "default": connections.settings["default"],
+            REPLICA: {"ENGINE": "django.db.backends.sqlite3", "NAME": ""},
+        }
+    )
+    connections.settings[REPLICA] = configured[REPLICA]
+    with django_db_blocker.unblock():
+        connection = connections[REPLICA]
+        old_name = connection.creation.create_test_db(verbosity=0, serialize=False)
+        yield
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+    del connections[REPLICA]
+    del connections.settings[REPLICA]
+
+
+@pytest.fixture(autouse=True)
+def router(settings):
+    settings.DATABASE_REPLICAS = [REPLICA]
+    settings.DATABASE_ROUTERS = ["backend_django.config.db_router.ReplicaRouter"]
+    settings.REPLICA_PIN_SECONDS = 5
+    yield
+    unpin()
+
+
+@pytest.fixture
+def user() -> User:
+    user = UserFactory()
+    # forget that this test just wrote
+    unpin()
+    return user
+
+
+def exists(user: User) -> bool:
+    return User.objects.filter(pk=user.pk).exists()
+
+
+class TestReplicaRouter:
+    def test_reads_go_to_the_replica(self, user: User):
+        assert not exists(user)
+
+    def test_reads_after_a_write_go_to_the_primary(self, user: User):
+        User.objects.filter(pk=user.pk).update(name="Changed")
+
+        assert exists(user)
+
+    def test_reads_in_a_transaction_go_to_the_primary(self, user: User):
+        with transaction.atomic():
+            assert exists(user)
+        assert not exists(user)
+
+    def test_pin_to_primary(self, user: User):
+        with pin_to_primary():
+            assert exists(user)
+        assert not exists(user)
+
+    def test_celery_tasks_start_unpinned(self, user: User):
+        User.objects.filter(pk=user.pk).update(name="Changed")
+
+        # the task counts the users of the (empty) replica
+        assert get_users_count.apply().get() == 0
+
+
+class TestReplicaPinningMiddleware:
+    @pytest.fixture
+    def read(self, user: User):
+        return ReplicaPinningMiddleware(lambda request: HttpResponse(exists(user)))
+
+    def test_safe_request_reads_from_the_replica(self, read, rf: RequestFactory):
+        response = read(rf.get("/"))
+
+        assert response.content == b"False"
+        assert PIN_COOKIE not in response.cookies
+
+    def test_unsafe_request_reads_from_the_primary(self, read, rf: RequestFactory):
+        assert read(rf.post("/")).content == b"True"
+
+    def test_write_sets_the_pin_cookie(self, user: User, rf: RequestFactory):
+        def write(request):
+            User.objects.filter(pk=user.pk).update(name="Changed")
+            return HttpResponse()
+
+        response = ReplicaPinningMiddleware(write)(rf.post("/"))
+
+        assert response.cookies[PIN_COOKIE]["max-age"] == 5
+
+    def test_pin_cookie_reads_from_the_primary(self, read, rf: RequestFactory):
+        request = rf.get("/")
+        request.COOKIES[PIN_COOKIE] = "1"
+
+        response = read(request)
+
+        assert response.content == b"True"
+        # only writes (re)set the cookie, so the pin expires REPLICA_PIN_SECONDS
+        # after the last write
+        assert PIN_COOKIE not in response.cookies
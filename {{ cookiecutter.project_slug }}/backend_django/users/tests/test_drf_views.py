@@ -1,34 +1,88 @@
 import pytest
 from django.test import RequestFactory
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
 
 from backend_django.users.api.views import UserViewSet
 from backend_django.users.models import User
+from backend_django.users.tests.factories import UserFactory
 
 pytestmark = pytest.mark.django_db
 
 
-# class TestUserViewSet:
-#     def test_get_queryset(self, user: User, rf: RequestFactory):
-#         view = UserViewSet()
-#         request = rf.get("/fake-url/")
-#         request.user = user
+class TestUserViewSet:
+    def test_get_queryset(self, user: User, rf: RequestFactory):
+        view = UserViewSet()
+        request = rf.get("/fake-url/")
+        request.user = user
 
-#         view.request = request
+        view.request = request
 
-#         assert user in view.get_queryset()
+        assert user in view.get_queryset()
 
-#     def test_me(self, user: User, rf: RequestFactory):
-#         view = UserViewSet()
-#         request = rf.get("/fake-url/")
-#         request.user = user
+    def test_me(self, user: User, rf: RequestFactory):
+        view = UserViewSet()
+        request = rf.get("/fake-url/")
+        request.user = user
 
-#         view.request = request
+        view.request = request
 
-#         response = view.me(request)
+        response = view.me(request)
 
-#         assert response.data == {
-#             "username": user.username,
-#             "email": user.email,
-#             "name": user.name,
-#             "url": f"http://testserver/api/users/{user.username}/",
-#         }
+        assert response.data == {
+            "username": user.username,
+            "email": user.email,
+            "name": user.name,
+            "url": f"http://testserver/api/v1/users/{user.username}/",
+        }
+
+
+class TestConditionalResponses:
+    @pytest.fixture
+    def api_client(self, user: User) -> APIClient:
+        client = APIClient()
+        token = Token.objects.create(user=user)
+        client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        return client
+
+    @pytest.mark.parametrize("url", ["/api/v1/users/me/", "/api/v1/user/"])
+    def test_unchanged_resource_is_not_modified(
+        self, api_client, url, django_assert_num_queries
+    ):
+        response = api_client.get(url)
+        assert response.status_code == 200
+        assert response["Cache-Control"] == "private, no-cache"
+        assert response["Last-Modified"]
+
+        with django_assert_num_queries(0):
+            revalidated = api_client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+
+        assert revalidated.status_code == 304
+        assert revalidated.content == b""
+        assert revalidated["ETag"] == response["ETag"]
+
+    def test_change_makes_a_new_etag(self, user: User, api_client):
+        response = api_client.get("/api/v1/users/me/")
+
+        user.name = "Changed"
+        user.save()
+        revalidated = api_client.get(
+            "/api/v1/users/me/", HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+
+        assert revalidated.status_code == 200
+        assert revalidated.data["name"] == "Changed"
+        assert revalidated["ETag"] != response["ETag"]
+
+    def test_etag_varies_with_the_user(self, api_client):
+        response = api_client.get("/api/v1/users/me/")
+        other = APIClient()
+        other.force_authenticate(UserFactory())
+
+        assert other.get("/api/v1/users/me/")["ETag"] != response["ETag"]
+
+    def test_unsafe_methods_are_not_conditional(self, api_client):
+        response = api_client.patch("/api/v1/user/", {}, format="json")
+
+        assert response.status_code == 200
+        assert "ETag" not in response
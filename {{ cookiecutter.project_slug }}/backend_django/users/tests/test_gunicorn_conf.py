@@ -0,0 +1,140 @@
+import importlib.util
+import os
+from pathlib import Path
+
+import pytest
+
+import backend_django.config
+
+spec = importlib.util.spec_from_file_location(
+    "gunicorn_conf", Path(backend_django.config.__file__).parent / "gunicorn.conf.py"
+)
+gunicorn_conf = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(gunicorn_conf)
+
+
+@pytest.fixture
+def cgroup(monkeypatch):
+    """The cgroup files of a container with 8 cores, none by default."""
+    files = {}
+    monkeypatch.setattr(os, "sched_getaffinity", lambda pid: set(range(8)))
+    monkeypatch.setattr(
+        gunicorn_conf,
+        "read_cgroup",
+        lambda *paths: next((files[path] for path in paths if path in files), None),
+    )
+    return files
+
+
+def test_cpus_without_limit(cgroup):
+    assert gunicorn_conf.available_cpus() == 8
+
+
+def test_cpus_cgroup_v2_quota(cgroup):
+    cgroup["/sys/fs/cgroup/cpu.max"] = "150000 100000"
+
+    assert gunicorn_conf.available_cpus() == 1.5
+
+
+def test_cpus_cgroup_v2_max(cgroup):
+    cgroup["/sys/fs/cgroup/cpu.max"] = "max 100000"
+
+    assert gunicorn_conf.available_cpus() == 8
+
+
+def test_cpus_cgroup_v2_quota_above_the_cores(cgroup):
+    cgroup["/sys/fs/cgroup/cpu.max"] = "1600000 100000"
+
+    assert gunicorn_conf.available_cpus() == 8
+
+
+def test_cpus_cgroup_v1_quota(cgroup):
+    cgroup["/sys/fs/cgroup/cpu/cpu.cfs_quota_us"] = "200000"
+    cgroup["/sys/fs/cgroup/cpu/cpu.cfs_period_us"] = "100000"
+
+    assert gunicorn_conf.available_cpus() == 2
+
+
+def test_cpus_cgroup_v1_unlimited(cgroup):
+    cgroup["/sys/fs/cgroup/cpu/cpu.cfs_quota_us"] = "-1"
+    cgroup["/sys/fs/cgroup/cpu/cpu.cfs_period_us"] = "100000"
+
+    assert gunicorn_conf.available_cpus() == 8
+
+
+def test_memory_without_limit(cgroup):
+    assert gunicorn_conf.memory_limit_mb() is None
+
+
+def test_memory_cgroup_v2(cgroup):
+    cgroup["/sys/fs/cgroup/memory.max"] = str(512 * 1024 * 1024)
+
+    assert gunicorn_conf.memory_limit_mb() == 512
+
+
+def test_memory_cgroup_v2_max(cgroup):
+    cgroup["/sys/fs/cgroup/memory.max"] = "max"
+
+    assert gunicorn_conf.memory_limit_mb() is None
+
+
+def test_memory_cgroup_v1(cgroup):
+    cgroup["/sys/fs/cgroup/memory/memory.limit_in_bytes"] = str(1024**3)
+
+    assert gunicorn_conf.memory_limit_mb() == 1024
+
+
+def test_memory_cgroup_v1_unlimited(cgroup):
+    # the page aligned maximum cgroup v1 reports without a limit
+    cgroup["/sys/fs/cgroup/memory/memory.limit_in_bytes"] = "9223372036854771712"
+
+    assert gunicorn_conf.memory_limit_mb() is None
+
+
+@pytest.mark.parametrize(
+    "cpus, memory_mb, expected",
+    [
+        (2, None, (5, 1)),
+        (1.5, None, (5, 1)),
+        (2, 4096, (5, 1)),
+        # 2 workers fit: threads make up for the 3 missing ones
+        (2, 400, (2, 3)),
+        # 1 worker fits, threads are capped at MAX_THREADS
+        (4, 256, (1, gunicorn_conf.MAX_THREADS)),
+        (2, 100, (1, gunicorn_conf.MAX_THREADS)),
+    ],
+)
+def test_compute_concurrency(cpus, memory_mb, expected):
+    assert gunicorn_conf.compute_concurrency(cpus, memory_mb, 200) == expected
+
+
+class FakeServer:
+    class cfg:
+        preload_app = True
+
+
+# closes the connection, which a transaction of the test would keep open
+@pytest.mark.django_db(transaction=True)
+def test_pre_fork_closes_the_pools(monkeypatch):
+    from django.db import DEFAULT_DB_ALIAS, connections
+
+    connection = connections[DEFAULT_DB_ALIAS]
+    closed = []
+    monkeypatch.setattr(gunicorn_conf.gc, "freeze", lambda: None)
+    monkeypatch.setattr(
+        type(connection),
+        "_connection_pools",
+        {connection.alias: object()},
+        raising=False,
+    )
+    monkeypatch.setattr(
+        type(connection),
+        "close_pool",
+        lambda self: closed.append(self.alias),
+        raising=False,
+    )
+    connection.ensure_connection()
+
+    gunicorn_conf.pre_fork(FakeServer, worker=None)
+
+    assert closed == [connection.alias]
@@ -0,0 +1,17 @@
+from pathlib import Path
+
+from django.contrib.auth.hashers import Argon2PasswordHasher
+from django.core.management import call_command
+
+
+def test_batch(tmp_path: Path, capsys):
+    path = tmp_path / "passwords.txt"
+    path.write_text("first\n\nalice\tsecond\tpart\nthird\n")
+
+    call_command("hash_password", batch=str(path), workers=1)
+
+    lines = [line.split("\t") for line in capsys.readouterr().out.splitlines()]
+    assert [id for id, _ in lines] == ["1", "alice", "4"]
+    hasher = Argon2PasswordHasher()
+    passwords = ["first", "second\tpart", "third"]
+    assert all(map(hasher.verify, passwords, [hashed for _, hashed in lines]))
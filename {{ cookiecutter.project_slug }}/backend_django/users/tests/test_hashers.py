@@ -0,0 +1,53 @@
+import pytest
+from django.contrib.auth import authenticate, hashers
+from django.core.management import call_command
+
+from backend_django.users import hashers as project_hashers
+from backend_django.users.models import User
+from backend_django.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def argon2(settings, monkeypatch):
+    settings.PASSWORD_HASHERS = ["backend_django.users.hashers.Argon2PasswordHasher"]
+    # cheap parameters, the defaults take 100 MiB per hash
+    Hasher = project_hashers.Argon2PasswordHasher
+    monkeypatch.setattr(Hasher, "time_cost", 2)
+    monkeypatch.setattr(Hasher, "memory_cost", 1024)
+    monkeypatch.setattr(Hasher, "parallelism", 1)
+    return Hasher()
+
+
+@pytest.mark.parametrize("time_cost", [1, 3], ids=["older", "costlier"])
+def test_rehash_on_login(argon2, time_cost: int):
+    old = type(
+        "Old",
+        (hashers.Argon2PasswordHasher,),
+        {"time_cost": time_cost, "memory_cost": 1024, "parallelism": 1},
+    )()
+    user = UserFactory(password="!")
+    User.objects.filter(pk=user.pk).update(
+        password=old.encode("secret-password", old.salt())
+    )
+
+    assert authenticate(username=user.username, password="secret-password") == user
+
+    user.refresh_from_db()
+    assert argon2.decode(user.password)["time_cost"] == 2
+    assert not argon2.must_update(user.password)
+
+
+def test_calibrate_hashers(capsys):
+    call_command(
+        "calibrate_hashers", target_ms=5, max_memory=1, rounds=1, parallelism=[1, 2]
+    )
+
+    module = capsys.readouterr().out
+    namespace = {}
+    exec(compile(module, "hashers.py", "exec"), namespace)
+    hasher = namespace["Argon2PasswordHasher"]
+    assert hasher.memory_cost <= 1024
+    assert hasher.parallelism in (1, 2)
+    assert namespace["PBKDF2PasswordHasher"].iterations >= 1000
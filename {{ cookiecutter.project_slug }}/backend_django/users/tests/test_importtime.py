@@ -0,0 +1,28 @@
+from backend_django.utils.importtime import ImportProfile, parse_importtime
+
+OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:      2000 |       2500 |     django.utils
+import time:       500 |       3000 |   django
+import time:      1500 |       1500 | celery
+Traceback (most recent call last):
+"""
+
+
+def test_parse_importtime():
+    assert parse_importtime(OUTPUT) == {
+        "_io": (120, 120),
+        "django.utils": (2000, 2500),
+        "django": (500, 3000),
+        "celery": (1500, 1500),
+    }
+
+
+def test_heaviest():
+    profile = ImportProfile("wsgi", 1.0, parse_importtime(OUTPUT))
+
+    assert profile.import_seconds == 0.00412
+    assert profile.heaviest_modules(2) == [("django.utils", 2000), ("celery", 1500)]
+    assert profile.heaviest_modules(1, cumulative=True) == [("django", 3000)]
+    assert profile.heaviest_packages(2) == [("django", 2500, 2), ("celery", 1500, 1)]
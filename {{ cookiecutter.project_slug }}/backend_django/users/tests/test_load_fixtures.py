@@ -0,0 +1,210 @@
+import json
+from pathlib import Path
+
+import pytest
+from django.contrib.auth.models import Group
+from django.core.management import call_command
+
+from backend_django.site_config import fixtures
+from backend_django.site_config.fixtures import dependency_order, iter_objects
+from backend_django.site_config.models import LoadedFixture, SetupFlag
+from backend_django.users.models import User
+
+pytestmark = pytest.mark.django_db
+
+
+def user_row(pk: int, **fields) -> dict:
+    fields = {"username": f"user{pk}", "email": f"user{pk}@example.com", **fields}
+    return {"model": "users.user", "pk": pk, "fields": {"password": "!", **fields}}
+
+
+def write_json(path: Path, rows: list) -> Path:
+    path.write_text(json.dumps(rows, indent=2))
+    return path
+
+
+def write_jsonl(path: Path, rows: list) -> Path:
+    path.write_text("".join(json.dumps(row) + "\n" for row in rows))
+    return path
+
+
+def load(*paths, **options):
+    call_command("load_fixtures_fast", *paths, verbosity=0, **options)
+
+
+class TestIterObjects:
+    def test_objects_spanning_chunks(self, tmp_path: Path):
+        rows = [user_row(pk, name="x" * pk) for pk in range(1, 50)]
+        path = write_json(tmp_path / "users.json", rows)
+
+        assert list(iter_objects(path, chunk_size=16)) == rows
+
+    def test_jsonl(self, tmp_path: Path):
+        rows = [user_row(1), user_row(2)]
+
+        assert list(iter_objects(write_jsonl(tmp_path / "users.jsonl", rows))) == rows
+
+    def test_empty_array(self, tmp_path: Path):
+        assert list(iter_objects(write_json(tmp_path / "empty.json", []))) == []
+
+
+class TestLoadFixturesFast:
+    def test_loads_in_batches(self, tmp_path: Path, django_assert_max_num_queries):
+        rows = [user_row(pk) for pk in range(1000, 1100)]
+        path = write_jsonl(tmp_path / "users.jsonl", rows)
+
+        # 10 inserts, plus transaction, constraint check and sequence reset
+        with django_assert_max_num_queries(20):
+            load(path, batch_size=10)
+
+        assert User.objects.filter(pk__gte=1000).count() == 100
+
+    def test_existing_rows_are_updated(self, tmp_path: Path):
+        load(write_json(tmp_path / "users.json", [user_row(1000, name="Old")]))
+        load(write_json(tmp_path / "users.json", [user_row(1000, name="New")]))
+
+        assert User.objects.get(pk=1000).name == "New"
+
+    def test_many_to_many(self, tmp_path: Path):
+        group = Group.objects.create(name="editors")
+        path = write_json(tmp_path / "users.json", [user_row(1000, groups=[group.pk])])
+
+        load(path)
+
+        assert list(User.objects.get(pk=1000).groups.all()) == [group]
+
+    def test_many_to_many_is_replaced(self, tmp_path: Path):
+        old, new = Group.objects.create(name="old"), Group.objects.create(name="new")
+        load(write_json(tmp_path / "users.json", [user_row(1000, groups=[old.pk])]))
+        load(write_json(tmp_path / "users.json", [user_row(1000, groups=[new.pk])]))
+
+        assert list(User.objects.get(pk=1000).groups.all()) == [new]
+
+    def test_many_to_many_not_listed_is_kept(self, tmp_path: Path):
+        group = Group.objects.create(name="editors")
+        load(write_json(tmp_path / "users.json", [user_row(1000, groups=[group.pk])]))
+        load(write_json(tmp_path / "users.json", [user_row(1000, name="New")]))
+
+        assert list(User.objects.get(pk=1000).groups.all()) == [group]
+
+    def test_auto_now_fields_keep_the_fixture_values(self, tmp_path: Path):
+        row = {
+            "model": "site_config.loadedfixture",
+            "pk": 1000,
+            "fields": {
+                "name": "old.json",
+                "sha256": "0" * 64,
+                "loaded_at": "2020-01-01T00:00:00Z",
+            },
+        }
+        for _ in range(2):  # insert and update
+            load(write_json(tmp_path / "rows.json", [row]))
+
+            loaded_at = LoadedFixture.objects.get(pk=1000).loaded_at
+            assert loaded_at.isoformat() == "2020-01-01T00:00:00+00:00"
+
+    def test_forward_references_across_files(self, tmp_path: Path):
+        users = write_json(tmp_path / "1.json", [user_row(1000, groups=[1000])])
+        groups = write_json(
+            tmp_path / "2.json",
+            [{"model": "auth.group", "pk": 1000, "fields": {"name": "later"}}],
+        )
+
+        load(users, groups)
+
+        assert User.objects.get(pk=1000).groups.get().name == "later"
+
+    def test_exclude_dev(self):
+        User.objects.filter(username="testuser").delete()
+
+        load(exclude_dev=True)
+        assert not User.objects.filter(username="testuser").exists()
+        load()
+        assert User.objects.filter(username="testuser").exists()
+
+
+class TestIncrementalLoading:
+    @pytest.fixture(autouse=True)
+    def fixture_dir(self, tmp_path: Path, monkeypatch) -> Path:
+        monkeypatch.setattr(fixtures, "FIXTURE_DIR", tmp_path)
+        # forget the fixtures of the real directory, loaded by conftest
+        load(guard=True)
+        return tmp_path
+
+    def test_unchanged_fixtures_are_skipped(self, fixture_dir: Path, capsys):
+        write_json(fixture_dir / "users.json", [user_row(1000)])
+        load(guard=True)
+        User.objects.filter(pk=1000).delete()
+
+        call_command("load_fixtures_fast", guard=True)
+
+        assert "Fixtures unchanged" in capsys.readouterr().out
+        assert not User.objects.filter(pk=1000).exists()
+        assert SetupFlag.objects.filter(setup_complete=True).exists()
+
+    def test_added_fixture_is_loaded(self, fixture_dir: Path):
+        write_json(fixture_dir / "a.json", [user_row(1000)])
+        load(guard=True)
+        write_json(fixture_dir / "b.json", [user_row(1001)])
+        User.objects.filter(pk=1000).delete()
+
+        load(guard=True)
+
+        assert User.objects.filter(pk=1001).exists()
+        # a.json is unchanged and not loaded again
+        assert not User.objects.filter(pk=1000).exists()
+
+    def test_changed_fixture_is_reloaded(self, fixture_dir: Path):
+        write_json(fixture_dir / "users.json", [user_row(1000, name="Old")])
+        load(guard=True)
+        write_json(fixture_dir / "users.json", [user_row(1000, name="New")])
+
+        load(guard=True)
+
+        assert User.objects.get(pk=1000).name == "New"
+        assert LoadedFixture.objects.get(name="users.json").sha256 == (
+            fixtures.file_hash(fixture_dir / "users.json")
+        )
+
+    def test_removed_fixture_is_forgotten(self, fixture_dir: Path):
+        path = write_json(fixture_dir / "users.json", [user_row(1000)])
+        load(guard=True)
+        path.unlink()
+
+        load(guard=True)
+
+        assert not LoadedFixture.objects.filter(name="users.json").exists()
+        # its rows are kept
+        assert User.objects.filter(pk=1000).exists()
+
+    def test_dependency_order(self, fixture_dir: Path):
+        users = write_json(fixture_dir / "a_users.json", [user_row(1000, groups=[1])])
+        groups = write_json(
+            fixture_dir / "b_groups.json",
+            [{"model": "auth.group", "pk": 1, "fields": {"name": "editors"}}],
+        )
+
+        assert dependency_order([users, groups]) == [groups, users]
+
+    def test_each_fixture_is_scanned_once(self, fixture_dir: Path):
+        write_json(fixture_dir / "a_users.json", [user_row(1000, groups=[1])])
+        write_json(
+            fixture_dir / "b_groups.json",
+            [{"model": "auth.group", "pk": 1, "fields": {"name": "editors"}}],
+        )
+        scans = fixtures._scan_fixture.cache_info().misses
+
+        # guard, dependency order and record of the load
+        load(guard=True)
+
+        assert fixtures._scan_fixture.cache_info().misses == scans + 2
+
+    def test_unknown_model_labels_are_ignored(self, fixture_dir: Path):
+        # e.g. in the value of a JSONField
+        path = write_json(
+            fixture_dir / "users.json",
+            [user_row(1000, settings={"model": "no.such_model"})],
+        )
+
+        assert fixtures.scan_fixture(path).models == {"users.user", "no.such_model"}
+        assert fixtures.fixture_models(path) == {User}
@@ -0,0 +1,88 @@
+import pytest
+from django.contrib import messages
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import caches
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.test import Client
+
+from backend_django.users.models import User
+from backend_django.utils.page_cache import CACHE_ALIAS, cache_anonymous_page
+
+pytestmark = pytest.mark.django_db
+
+
+def rendered(response) -> bool:
+    return bool(response.templates)
+
+
+class TestPageCache:
+    def test_second_anonymous_request_is_served_from_the_cache(self, client: Client):
+        first = client.get("/about/")
+        second = client.get("/about/")
+
+        assert rendered(first)
+        assert not rendered(second)
+        assert second.status_code == 200
+        assert second.content == first.content
+
+    def test_cached_page_keeps_the_headers(self, rf):
+        def view(request):
+            response = HttpResponse("page", content_type="text/plain")
+            response["Content-Language"] = "de"
+            response["X-Page"] = "1"
+            return response
+
+        cached_view = cache_anonymous_page(view)
+        request = rf.get("/page/")
+        request.user = AnonymousUser()
+        first = cached_view(request)
+        second = cached_view(request)
+
+        assert second is not first
+        assert dict(second.headers) == dict(first.headers)
+
+    def test_timeout_0_skips_the_cache(self, client: Client, settings, monkeypatch):
+        settings.PAGE_CACHE_TIMEOUT = 0
+        cache = caches[CACHE_ALIAS]
+        for method in ("get", "set"):
+            monkeypatch.setattr(cache, method, pytest.fail)
+
+        assert rendered(client.get("/about/"))
+        assert rendered(client.get("/about/"))
+
+    def test_languages_are_cached_separately(self, client: Client):
+        client.get("/about/", HTTP_ACCEPT_LANGUAGE="en")
+
+        assert rendered(client.get("/about/", HTTP_ACCEPT_LANGUAGE="de"))
+
+    def test_query_string_bypasses_the_cache(self, client: Client):
+        client.get("/about/")
+
+        assert rendered(client.get("/about/?next=/"))
+
+    def test_authenticated_users_bypass_the_cache(self, client: Client, user: User):
+        client.get("/about/")
+        client.force_login(user)
+
+        assert rendered(client.get("/about/"))
+        assert rendered(client.get("/about/"))
+
+    def test_pending_messages_bypass_the_cache(self, client: Client, rf):
+        client.get("/about/")
+        request = rf.get("/")
+        storage = messages.storage.cookie.CookieStorage(request)
+        storage.add(messages.INFO, "Hello")
+        response = client.get("/")
+        storage.update(response)
+        client.cookies.update(response.cookies)
+
+        assert rendered(client.get("/about/"))
+
+    def test_warm_page_cache(self, client: Client, capsys):
+        call_command("warm_page_cache")
+
+        assert "/about/: 200, cached" in capsys.readouterr().out
+        assert not rendered(client.get("/about/"))
+        assert not rendered(client.get("/"))
+        assert not rendered(client.get("/test/"))
@@ -0,0 +1,116 @@
+import time
+
+import pytest
+from celery import states
+from celery.app.task import Context
+from celery.signals import task_revoked
+from django.db import OperationalError
+
+from backend_django.config.celery_app import app
+from backend_django.tasks import SingletonTask, task
+from backend_django.utils.cache import redis_client
+
+calls = []
+
+
+@task(name="tests.singleton", base=SingletonTask)
+def singleton(value):
+    calls.append(value)
+    return value
+
+
+@task(name="tests.slow_singleton", base=SingletonTask, lock_expires=0.3, bind=True)
+def slow_singleton(self):
+    time.sleep(0.6)
+    key = self.lock_key(self.request.args, self.request.kwargs)
+    return redis_client().get(key).decode(), redis_client().pttl(key)
+
+
+@task(name="tests.deduplicated", base=SingletonTask, dedup_window=60)
+def deduplicated(value):
+    calls.append(value)
+    return value
+
+
+@task(
+    name="tests.flaky_singleton",
+    base=SingletonTask,
+    autoretry_for=(OperationalError,),
+    max_retries=1,
+)
+def flaky_singleton():
+    calls.append(None)
+    if len(calls) == 1:
+        raise OperationalError("connection lost")
+    return len(calls)
+
+
+@pytest.fixture(autouse=True)
+def eager(monkeypatch):
+    monkeypatch.setattr(app.conf, "task_always_eager", True)
+    calls.clear()
+    yield
+    client = redis_client()
+    for key in client.scan_iter(match="*:celery:*"):
+        client.delete(key)
+
+
+def test_lock_is_released():
+    assert singleton.delay(1).get() == 1
+
+    assert redis_client().get(singleton.lock_key([1], {})) is None
+
+
+def test_locked_task_is_ignored():
+    redis_client().set(singleton.lock_key([1], {}), "other-task")
+
+    result = singleton.delay(1)
+
+    assert result.state == states.IGNORED
+    assert singleton.delay(2).get() == 2
+    assert calls == [2]
+    assert redis_client().get(singleton.lock_key([1], {})) == b"other-task"
+
+
+def test_lock_by_task(monkeypatch):
+    monkeypatch.setattr(singleton, "lock_by_args", False)
+    redis_client().set(singleton.lock_key([1], {}), "other-task")
+
+    assert singleton.delay(2).state == states.IGNORED
+
+
+def test_lease_is_renewed():
+    result = slow_singleton.delay()
+
+    owner, ttl = result.get()
+    assert owner == result.id
+    assert ttl > 0
+    assert redis_client().get(slow_singleton.lock_key([], {})) is None
+
+
+def test_retried_task_locks_again():
+    assert flaky_singleton.delay().get() == 2
+
+
+def test_revoked_task_releases_its_lock():
+    key = singleton.lock_key([1], {})
+    redis_client().set(key, "revoked-task")
+    request = Context(id="other-task", args=[1], kwargs={})
+
+    task_revoked.send(sender=singleton, request=request, terminated=True)
+    assert redis_client().get(key) == b"revoked-task"
+
+    request.id = "revoked-task"
+    task_revoked.send(sender=singleton, request=request, terminated=True)
+    assert redis_client().get(key) is None
+
+
+def test_duplicates_are_not_sent():
+    first = deduplicated.delay(1)
+    duplicate = deduplicated.delay(1)
+    other = deduplicated.apply_async(kwargs={"value": 1})
+
+    assert duplicate.id == first.id
+    assert other.id != first.id
+    assert calls == [1, 1]
+    assert 0 < redis_client().ttl(deduplicated.dedup_key([1], {})) <= 60
@@ -0,0 +1,55 @@
+import time
+
+import pytest
+from django.db import connection
+
+from backend_django.utils import testdb
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(
+        connection.vendor != "postgresql", reason="template databases of PostgreSQL"
+    ),
+]
+
+
+@pytest.fixture
+def cursor():
+    with connection.creation._nodb_cursor() as cursor:
+        yield cursor
+
+
+def create_database(cursor, name: str, comment: str | None = None) -> str:
+    cursor.execute(f"DROP DATABASE IF EXISTS {name}")
+    cursor.execute(f"CREATE DATABASE {name}")
+    if comment is not None:
+        cursor.execute(f"COMMENT ON DATABASE {name} IS %s", [comment])
+    return name
+
+
+def test_database_is_a_clone_of_the_current_template(cursor):
+    comments = testdb.database_comments(cursor, connection.settings_dict["NAME"])
+    template = comments[connection.settings_dict["NAME"]]
+
+    assert template.endswith(f"_template_{testdb.schema_hash()}")
+    assert testdb.last_use(testdb.database_comments(cursor, template)[template])[0]
+
+
+def test_only_stale_templates_are_dropped(cursor):
+    name = connection.settings_dict["NAME"]
+    template = testdb.database_comments(cursor, name)[name]
+    prefix = template.rsplit("_", 1)[0]
+    stale = time.time() - testdb.TEMPLATE_MAX_AGE.total_seconds() - 60
+    in_use = create_database(cursor, f"{prefix}_inuse", f"{int(time.time())} run")
+    old = create_database(cursor, f"{prefix}_old", f"{int(stale)} run")
+    unknown = create_database(cursor, f"{prefix}_unknown")
+
+    try:
+        testdb.drop_stale_templates(connection, template)
+
+        names = set(testdb.database_comments(cursor, prefix))
+        assert {template, in_use} <= names
+        assert not {old, unknown} & names
+    finally:
+        for name in (in_use, old, unknown):
+            cursor.execute(f"DROP DATABASE IF EXISTS {name}")
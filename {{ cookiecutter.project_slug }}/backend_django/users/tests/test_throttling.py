@@ -0,0 +1,124 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.exceptions import Throttled
+from rest_framework.test import APIClient
+
+from backend_django.users import throttling
+from backend_django.users.models import User
+from backend_django.users.throttling import hash_concurrency, hashing_slot
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def limits(settings):
+    settings.LOGIN_RATE_LIMIT_WINDOW = 60
+    settings.LOGIN_RATE_LIMIT_PER_IP = 5
+    settings.LOGIN_RATE_LIMIT_PER_ACCOUNT = 3
+    settings.LOGIN_MAX_CONCURRENT_HASHES = 2
+    return settings
+
+
+def login(email: str, password="wrong-password", ip="10.0.0.1"):
+    return APIClient(REMOTE_ADDR=ip).post(
+        reverse("rest_login"), {"email": email, "password": password}
+    )
+
+
+def test_successful_login(limits, user: User):
+    user.set_password("secret-password")
+    user.save()
+
+    assert login(user.email, "secret-password").status_code == 200
+
+
+def test_account_limit(limits, user: User):
+    for ip in ("10.0.0.1", "10.0.0.2", "10.0.0.3"):
+        assert login(user.email, ip=ip).status_code == 400
+
+    with mock.patch("dj_rest_auth.serializers.authenticate") as authenticate:
+        response = login(user.email.upper(), ip="10.0.0.4")
+
+    assert response.status_code == 429
+    assert 1 <= int(response["Retry-After"]) <= 60
+    authenticate.assert_not_called()
+    # other accounts are fine
+    assert login("other@example.com", ip="10.0.0.4").status_code == 400
+
+
+def test_ip_limit(limits):
+    for i in range(5):
+        assert login(f"user{i}@example.com").status_code == 400
+
+    assert login("user5@example.com").status_code == 429
+    assert login("user5@example.com", ip="10.0.0.2").status_code == 400
+
+
+def test_concurrent_attempts(limits, rf, monkeypatch):
+    attempts = 20
+    barrier = threading.Barrier(attempts)
+    client = throttling.get_redis()
+    pipeline = client.pipeline
+
+    def slow_pipeline(*args, **kwargs):
+        # widen the gap between round trips, where the other attempts run
+        pipe = pipeline(*args, **kwargs)
+        execute = pipe.execute
+        pipe.execute = lambda: (execute(), time.sleep(0.05))[0]
+        return pipe
+
+    monkeypatch.setattr(client, "pipeline", slow_pipeline)
+    monkeypatch.setattr(throttling, "get_redis", lambda: client)
+
+    def attempt(i: int) -> bool:
+        request = rf.post("/", REMOTE_ADDR=f"10.0.1.{i}")
+        barrier.wait()
+        try:
+            throttling.check_login_rate(request, "user@example.com")
+        except Throttled:
+            return False
+        return True
+
+    with ThreadPoolExecutor(attempts) as executor:
+        passed = sum(executor.map(attempt, range(attempts)))
+
+    assert passed == limits.LOGIN_RATE_LIMIT_PER_ACCOUNT
+    # the rejected attempts weren't counted
+    with pytest.raises(Throttled):
+        throttling.check_login_rate(rf.post("/"), "user@example.com")
+    assert [
+        client.zcard(key) for key in client.scan_iter(match="*login:account:*")
+    ] == [limits.LOGIN_RATE_LIMIT_PER_ACCOUNT]
+
+
+def test_forwarded_for(limits, rf):
+    request = rf.post("/", HTTP_X_FORWARDED_FOR="1.2.3.4, 10.0.0.9")
+
+    assert throttling.client_ip(request) == "127.0.0.1"
+    limits.TRUSTED_PROXY_COUNT = 1
+    assert throttling.client_ip(request) == "10.0.0.9"
+    limits.TRUSTED_PROXY_COUNT = 2
+    assert throttling.client_ip(request) == "1.2.3.4"
+
+
+def test_shedding(limits, user: User):
+    with hashing_slot(), hashing_slot():
+        assert sum(hash_concurrency().values()) == 2
+        response = login(user.email)
+
+    assert response.status_code == 503
+    assert sum(hash_concurrency().values()) == 0
+    assert login(user.email).status_code == 400
+
+
+def test_login_stats(limits, capsys):
+    with hashing_slot():
+        call_command("login_stats")
+
+    assert "1 password checks running (max 2)" in capsys.readouterr().out
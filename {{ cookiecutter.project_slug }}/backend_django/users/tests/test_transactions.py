@@ -0,0 +1,152 @@
+"""
+Mutating requests keep the transaction semantics of ATOMIC_REQUESTS (commit on
+success, roll back when the view fails), read-only requests run in autocommit.
+"""
+
+import pytest
+from dj_rest_auth.views import UserDetailsView
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.db import connection
+from django.test import RequestFactory
+from django.urls import reverse
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
+
+from backend_django.users.api.views import UserViewSet
+from backend_django.users.models import User
+from backend_django.users.views import UserUpdateView
+
+# the default django_db marker runs each test in a transaction, which would hide
+# whether the view opened one
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+def fail(*args, **kwargs):
+    raise ValidationError("failed after saving")
+
+
+@pytest.fixture
+def api_client(user: User) -> APIClient:
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+@pytest.fixture
+def atomic_blocks(monkeypatch):
+    """Record whether get_object runs inside a transaction, for the views below."""
+    recorded = []
+
+    def wrap(view_class):
+        original = view_class.get_object
+
+        def get_object(self, *args, **kwargs):
+            recorded.append(connection.in_atomic_block)
+            return original(self, *args, **kwargs)
+
+        monkeypatch.setattr(view_class, "get_object", get_object)
+
+    wrap(UserUpdateView)
+    wrap(UserViewSet)
+    wrap(UserDetailsView)
+    return recorded
+
+
+class TestUserUpdateView:
+    def test_post_commits(self, user: User, client, atomic_blocks):
+        client.force_login(user)
+
+        response = client.post(reverse("users:update"), {"name": "Changed"})
+
+        assert response.status_code == 302
+        assert atomic_blocks == [True]
+        user.refresh_from_db()
+        assert user.name == "Changed"
+
+    def test_post_rolls_back_when_the_view_raises(
+        self, user: User, rf: RequestFactory, monkeypatch
+    ):
+        monkeypatch.setattr(UserUpdateView, "get_success_url", fail)
+        request = rf.post("/fake-url/", {"name": "Changed"})
+        request.user = user
+        request._messages = CookieStorage(request)
+
+        with pytest.raises(ValidationError):
+            UserUpdateView.as_view()(request)
+
+        user.refresh_from_db()
+        assert user.name != "Changed"
+
+    def test_get_runs_in_autocommit(
+        self, user: User, rf: RequestFactory, atomic_blocks
+    ):
+        request = rf.get("/fake-url/")
+        request.user = user
+
+        UserUpdateView.as_view()(request)
+
+        assert atomic_blocks == [False]
+
+
+class TestUserViewSet:
+    def test_handled_exception_rolls_back(self, user: User, monkeypatch, atomic_blocks):
+        def perform_update(view, serializer):
+            serializer.save()
+            fail()
+
+        monkeypatch.setattr(UserViewSet, "perform_update", perform_update)
+        request = APIRequestFactory().patch(
+            "/fake-url/", {"name": "Changed"}, format="json"
+        )
+        force_authenticate(request, user=user)
+
+        response = UserViewSet.as_view({"patch": "partial_update"})(
+            request, username=user.username
+        )
+
+        assert response.status_code == 400
+        assert atomic_blocks == [True]
+        user.refresh_from_db()
+        assert user.name != "Changed"
+
+
+class TestAtomicRequestsUrls:
+    """dj_rest_auth's user endpoint is wrapped through settings.ATOMIC_REQUESTS_URLS."""
+
+    def test_patch_commits(self, user: User, api_client, atomic_blocks):
+        response = api_client.patch(
+            "/api/v1/user/", {"username": "changed"}, format="json"
+        )
+
+        assert response.status_code == 200
+        assert atomic_blocks == [True]
+        user.refresh_from_db()
+        assert user.username == "changed"
+
+    def test_handled_exception_rolls_back(self, user: User, api_client, monkeypatch):
+        def perform_update(view, serializer):
+            serializer.save()
+            fail()
+
+        monkeypatch.setattr(UserDetailsView, "perform_update", perform_update)
+
+        response = api_client.patch(
+            "/api/v1/user/", {"username": "changed"}, format="json"
+        )
+
+        assert response.status_code == 400
+        user.refresh_from_db()
+        assert user.username != "changed"
+
+    def test_get_runs_in_autocommit(self, api_client, atomic_blocks):
+        assert api_client.get("/api/v1/user/").status_code == 200
+        assert atomic_blocks == [False]
+
+    def test_unlisted_path_runs_in_autocommit(
+        self, api_client, settings, atomic_blocks
+    ):
+        settings.ATOMIC_REQUESTS_URLS = []
+
+        api_client.patch("/api/v1/user/", {}, format="json")
+
+        assert atomic_blocks == [False]
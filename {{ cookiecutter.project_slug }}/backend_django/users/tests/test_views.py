@@ -2,6 +2,7 @@ import pytest
 from django.contrib.auth.models import AnonymousUser
 from django.http.response import Http404
 from django.test import RequestFactory
+from django.urls import reverse
 
 from backend_django.users.models import User
 from backend_django.users.tests.factories import UserFactory
@@ -77,3 +78,62 @@ pytestmark = pytest.mark.django_db
 
 #         with pytest.raises(Http404):
 #             user_detail_view(request, username="username")
+
+
+class TestAuthenticatedPageQueries:
+    """Queries per session authenticated page, once session and user are cached."""
+
+    @pytest.mark.parametrize(
+        "session_backend, queries",
+        [
+            # session row and the page's own user lookup, request.user is cached
+            ("db", 2),
+            ("cached_db", 1),
+            ("cache", 1),
+        ],
+    )
+    def test_user_detail(
+        self,
+        user: User,
+        client,
+        settings,
+        django_assert_num_queries,
+        session_backend,
+        queries,
+    ):
+        settings.SESSION_ENGINE = f"django.contrib.sessions.backends.{session_backend}"
+        client.force_login(user)
+        url = reverse("users:detail", kwargs={"username": user.username})
+        client.get(url)
+
+        with django_assert_num_queries(queries):
+            response = client.get(url)
+
+        assert response.status_code == 200
+
+    def test_user_save_invalidates_the_cached_user(self, user: User, client):
+        client.force_login(user)
+        url = reverse("users:detail", kwargs={"username": user.username})
+        client.get(url)
+
+        user.name = "Changed"
+        user.save()
+
+        assert client.get(url).wsgi_request.user.name == "Changed"
+
+    def test_password_change_ends_other_sessions(self, user: User, client):
+        client.force_login(user)
+        url = reverse("users:detail", kwargs={"username": user.username})
+        client.get(url)
+
+        user.set_password("changed-password")
+        user.save()
+
+        assert not client.get(url).wsgi_request.user.is_authenticated
+
+    def test_sessions_of_the_original_backends_stay_valid(self, user: User, client):
+        # the backend paths are stored in the sessions, see CachedAuthenticationMiddleware
+        client.force_login(user, backend="django.contrib.auth.backends.ModelBackend")
+        url = reverse("users:detail", kwargs={"username": user.username})
+
+        assert client.get(url).wsgi_request.user == user
@@ -0,0 +1,167 @@
+"""
+Login rate limits and hash-work shedding of the dj_rest_auth login endpoint, see
+RateLimitedLoginSerializer in backend_django/users/api/serializers.py.
+
+Every password check costs a full hash (Django hashes a dummy password for unknown
+users, too), so a burst of login attempts saturates the web workers. Before the
+password is checked:
+
+- check_login_rate() rejects an attempt (429 with Retry-After) once the client IP or
+  the account had LOGIN_RATE_LIMIT_PER_IP / _PER_ACCOUNT attempts in the last
+  LOGIN_RATE_LIMIT_WINDOW seconds, a sliding window of attempt timestamps in a Redis
+  sorted set per IP and per account. An attempt is added and counted in one MULTI
+  transaction and removed again when rejected: rejected attempts aren't counted.
+- hashing_slot() sheds the attempt (503) while LOGIN_MAX_CONCURRENT_HASHES password
+  checks are running on this host, tracked in a sorted set per host;
+  hash_concurrency() reports them (login_stats management command).
+
+Both use the Redis client of the AUTH_TOKEN_CACHE_ALIAS cache; with a cache backend
+other than redis/fakeredis nothing is limited. Redis errors let the attempt through.
+"""
+
+import hashlib
+import logging
+import platform
+import time
+import uuid
+from contextlib import contextmanager
+
+from django.conf import settings
+from redis.exceptions import RedisError
+from rest_framework import status
+from rest_framework.exceptions import APIException, Throttled
+
+from backend_django.users.authentication import get_token_cache
+from backend_django.utils.cache import redis_client
+
+logger = logging.getLogger(__name__)
+
+# a check still running after this long belongs to a killed process
+HASHING_STALE_SECONDS = 30
+
+
+class LoginOverloaded(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Too many logins in progress, try again in a few seconds."
+    default_code = "login_overloaded"
+
+
+def get_redis():
+    """The Redis client of the token cache, None for other cache backends."""
+    return redis_client(getattr(settings, "AUTH_TOKEN_CACHE_ALIAS", "default"))
+
+
+def client_ip(request) -> str:
+    """
+    The client's address: REMOTE_ADDR, or the X-Forwarded-For entry added by the
+    outermost of TRUSTED_PROXY_COUNT proxies (traefik in production).
+    """
+    proxies = getattr(settings, "TRUSTED_PROXY_COUNT", 0)
+    forwarded = request.META.get("HTTP_X_FORWARDED_FOR")
+    if proxies and forwarded:
+        addresses = [address.strip() for address in forwarded.split(",")]
+        return addresses[-min(proxies, len(addresses))]
+    return request.META.get("REMOTE_ADDR", "")
+
+
+def login_rate_keys(request, account: str) -> dict:
+    """Sorted set key -> limit of an attempt, the account hashed as in token keys."""
+    cache = get_token_cache()
+    account = hashlib.sha256(account.strip().lower().encode()).hexdigest()
+    limits = {
+        cache.make_key(f"login:ip:{client_ip(request)}"): (
+            settings.LOGIN_RATE_LIMIT_PER_IP
+        ),
+        cache.make_key(f"login:account:{account}"): (
+            settings.LOGIN_RATE_LIMIT_PER_ACCOUNT
+        ),
+    }
+    return {key: limit for key, limit in limits.items() if limit}
+
+
+def check_login_rate(request, account: str):
+    """Count a login attempt, raising Throttled if the IP or account is over limit."""
+    client = get_redis()
+    keys = login_rate_keys(request, account)
+    if client is None or not keys:
+        return
+    window = settings.LOGIN_RATE_LIMIT_WINDOW
+    now = time.time()
+    member = f"{now}:{uuid.uuid4().hex}"
+    try:
+        # add and count in one MULTI, so concurrent attempts can't all pass a count
+        # taken before any of them was added
+        pipe = client.pipeline(transaction=True)
+        for key in keys:
+            pipe.zremrangebyscore(key, 0, now - window)
+            pipe.zadd(key, {member: now})
+            pipe.expire(key, window)
+            pipe.zcard(key)
+            pipe.zrange(key, 0, 0, withscores=True)
+        replies = pipe.execute()
+        wait = 0
+        for (key, limit), count, oldest in zip(
+            keys.items(), replies[3::5], replies[4::5]
+        ):
+            if count > limit:
+                wait = max(wait, oldest[0][1] + window - now)
+        if wait:
+            # rejected attempts aren't counted; until removed, this one may reject
+            # a concurrent attempt, but never lets one through
+            pipe = client.pipeline()
+            for key in keys:
+                pipe.zrem(key, member)
+            pipe.execute()
+            raise Throttled(wait=max(1, wait))
+    except RedisError:
+        logger.warning("Login rate limit check failed", exc_info=True)
+
+
+def hashing_key() -> str:
+    return get_token_cache().make_key(f"login:hashing:{platform.node()}")
+
+
+@contextmanager
+def hashing_slot():
+    """Track a password check, raising LoginOverloaded if the host is at the limit."""
+    client = get_redis()
+    if client is None:
+        yield
+        return
+    key, member, now = hashing_key(), uuid.uuid4().hex, time.time()
+    try:
+        pipe = client.pipeline()
+        pipe.zremrangebyscore(key, 0, now - HASHING_STALE_SECONDS)
+        pipe.zadd(key, {member: now})
+        pipe.zcard(key)
+        pipe.expire(key, HASHING_STALE_SECONDS)
+        running = pipe.execute()[2]
+    except RedisError:
+        logger.warning("Login hashing slot failed", exc_info=True)
+        yield
+        return
+    try:
+        limit = settings.LOGIN_MAX_CONCURRENT_HASHES
+        if limit and running > limit:
+            logger.warning("Shedding login: %d password checks running", running - 1)
+            raise LoginOverloaded()
+        yield
+    finally:
+        try:
+            client.zrem(key, member)
+        except RedisError:
+            pass
+
+
+def hash_concurrency() -> dict:
+    """Password checks running per host, from the sorted sets of hashing_slot()."""
+    client = get_redis()
+    if client is None:
+        return {}
+    cache = get_token_cache()
+    prefix = cache.make_key("login:hashing:")
+    stale = time.time() - HASHING_STALE_SECONDS
+    return {
+        key.decode()[len(prefix) :]: client.zcount(key, stale, "+inf")
+        for key in client.scan_iter(match=prefix + "*")
+    }
@@ -5,6 +5,8 @@ from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 from django.views.generic import DetailView, RedirectView, UpdateView
 
+from backend_django.utils.transactions import AtomicMutationsMixin
+
 User = get_user_model()
 
 
@@ -17,7 +19,7 @@ class UserDetailView(LoginRequiredMixin, DetailView):
 user_detail_view = UserDetailView.as_view()
 
 
-class UserUpdateView(LoginRequiredMixin, UpdateView):
+class UserUpdateView(AtomicMutationsMixin, LoginRequiredMixin, UpdateView):
     model = User
     fields = ["name"]
 
@@ -0,0 +1,125 @@
+"""
+A beat scheduler for the periodic tasks of django_celery_beat that keeps the schedule
+in memory (CELERY_BEAT_SCHEDULER).
+
+django_celery_beat's DatabaseScheduler reads PeriodicTasks.last_update on every tick,
+reloads the enabled tasks every 5 minutes and saves every task that ran with two
+queries, see benchmarks/bench_beat.py. InMemoryScheduler
+
+- loads all enabled tasks with their schedules in one query into the heap of Celery's
+  Scheduler, ordered by due time, which it rebuilds only after a reload;
+- reloads only when the schedule changed: django_celery_beat bumps
+  PeriodicTasks.last_update on changes to periodic tasks and their schedules, which
+  backend_django/signals.py mirrors to a counter in Redis, read every
+  CHANGE_CHECK_SECONDS. Changes made without signals (queryset.update()) are picked up
+  by the reload every RELOAD_SECONDS;
+- writes last_run_at and total_run_count of the tasks that ran with one bulk UPDATE
+  per sync (every 3 minutes, or beat_sync_every tasks).
+
+Without a Redis cache it reads PeriodicTasks.last_update like DatabaseScheduler, but
+only every CHANGE_CHECK_SECONDS.
+"""
+
+import logging
+import time
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.utils import DatabaseError, InterfaceError
+from django_celery_beat.schedulers import DatabaseScheduler
+from redis.exceptions import RedisError
+
+from backend_django.utils.cache import redis_client
+
+logger = logging.getLogger(__name__)
+
+CHANGE_CHECK_SECONDS = 5
+RELOAD_SECONDS = 60 * 60
+SYNC_BATCH_SIZE = 500
+
+
+def changed_key() -> str:
+    return f"{settings.CACHE_KEY_PREFIX}:beat:changed"
+
+
+def notify_schedule_changed():
+    """Make InMemoryScheduler reload, once the current transaction commits."""
+    client = redis_client()
+    if client is None:
+        return
+
+    def notify():
+        try:
+            client.incr(changed_key())
+        except RedisError:
+            logger.warning("Notifying beat of a schedule change failed", exc_info=True)
+
+    transaction.on_commit(notify)
+
+
+class InMemoryScheduler(DatabaseScheduler):
+    _change_counter = None
+    _last_check = _last_load = 0.0
+
+    def enabled_models_qs(self):
+        # all of them: DatabaseScheduler leaves out the crontab tasks not due within
+        # two hours, as it reloads every 5 minutes anyway
+        return self.Model.objects.enabled().select_related(
+            "interval", "crontab", "solar", "clocked"
+        )
+
+    def schedule_changed(self) -> bool:
+        client = redis_client()
+        if client is None:
+            return super().schedule_changed()
+        try:
+            counter = client.get(changed_key())
+        except RedisError:
+            logger.warning("Reading beat schedule changes failed", exc_info=True)
+            return False
+        changed, self._change_counter = counter != self._change_counter, counter
+        return changed
+
+    def schedules_equal(self, *args, **kwargs):
+        # Scheduler.tick() compares the schedule with the heap's on every tick
+        if self._heap_invalidated:
+            self._heap_invalidated = False
+            return False
+        return True
+
+    @property
+    def schedule(self):
+        now = time.monotonic()
+        initial = self._schedule is None
+        if initial:
+            self.schedule_changed()
+        elif now - self._last_check < CHANGE_CHECK_SECONDS:
+            return self._schedule
+        self._last_check = now
+        if initial or self.schedule_changed() or now - self._last_load > RELOAD_SECONDS:
+            if not initial:
+                logger.info("Reloading the beat schedule")
+                self.sync()
+                self._heap = []
+                self._heap_invalidated = True
+            self._schedule = self.all_as_schedule()
+            self._last_load = now
+        return self._schedule
+
+    def sync(self):
+        if not self._dirty or self._schedule is None:
+            return
+        names, self._dirty = self._dirty, set()
+        models = [
+            self._schedule[name].model for name in names if name in self._schedule
+        ]
+        try:
+            close_old_connections()
+            self.Model.objects.bulk_update(
+                models,
+                ["last_run_at", "total_run_count"],
+                batch_size=SYNC_BATCH_SIZE,
+            )
+        except (DatabaseError, InterfaceError):
+            logger.exception("Saving the beat schedule failed, retrying at next sync")
+            self._dirty |= names
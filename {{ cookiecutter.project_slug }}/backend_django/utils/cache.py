@@ -0,0 +1,127 @@
+"""
+Cache backends of all environments, see cache_settings() in config/settings/base.py.
+
+They count the hits and misses of get() and get_many() per process and add them to
+two counters kept in the cache itself every STATS_FLUSH_EVERY lookups, so that the
+cache_stats management command reports hit ratios across all processes.
+key_stats() returns the number of keys of the alias and the bytes they use.
+"""
+
+import os
+
+from django.core.cache import caches
+from django.core.cache.backends.filebased import FileBasedCache as BaseFileBasedCache
+from django.core.cache.backends.locmem import LocMemCache as BaseLocMemCache
+from django_redis.cache import RedisCache as BaseRedisCache
+from redis.exceptions import ResponseError
+
+STATS_HITS = "cache_stats:hits"
+STATS_MISSES = "cache_stats:misses"
+STATS_FLUSH_EVERY = 100
+
+_missing = object()
+
+
+def redis_client(alias: str = "default"):
+    """The Redis client of a cache alias, None for other cache backends."""
+    cache = caches[alias]
+    if not isinstance(cache, BaseRedisCache):
+        return None
+    return cache.client.get_client(write=True)
+
+
+class StatsMixin:
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # per process and not locked: the counts of concurrent threads are approximate
+        self._hits = self._misses = 0
+        self._recording = True
+
+    def _record(self, hits, misses):
+        if not self._recording:
+            return
+        self._hits += hits
+        self._misses += misses
+        if self._hits + self._misses >= STATS_FLUSH_EVERY:
+            self.flush_stats()
+
+    def get(self, key, default=None, version=None, **kwargs):
+        value = super().get(key, _missing, version, **kwargs)
+        if value is _missing:
+            self._record(0, 1)
+            return default
+        self._record(1, 0)
+        return value
+
+    def get_many(self, keys, *args, **kwargs):
+        keys = list(keys)
+        values = super().get_many(keys, *args, **kwargs)
+        self._record(len(values), len(keys) - len(values))
+        return values
+
+    def flush_stats(self):
+        hits, misses = self._hits, self._misses
+        self._hits = self._misses = 0
+        self._recording = False
+        try:
+            for key, count in ((STATS_HITS, hits), (STATS_MISSES, misses)):
+                if count:
+                    self.add(key, 0, timeout=None)
+                    try:
+                        self.incr(key, count)
+                    except ValueError:
+                        # evicted between add() and incr()
+                        self.add(key, count, timeout=None)
+        finally:
+            self._recording = True
+
+    def read_stats(self) -> dict:
+        """Hits and misses of all processes, including the unflushed ones of this one."""
+        self.flush_stats()
+        self._recording = False
+        try:
+            stats = self.get_many([STATS_HITS, STATS_MISSES])
+        finally:
+            self._recording = True
+        return {"hits": stats.get(STATS_HITS, 0), "misses": stats.get(STATS_MISSES, 0)}
+
+    def reset_stats(self):
+        self._hits = self._misses = 0
+        self.delete_many([STATS_HITS, STATS_MISSES])
+
+
+class RedisCache(StatsMixin, BaseRedisCache):
+    def key_stats(self, sample=1000):
+        """
+        Keys of this alias (all aliases share the Redis database) and their memory,
+        measured on the first `sample` keys and extrapolated.
+        """
+        client = self.client.get_client(write=False)
+        keys, measured, memory = 0, 0, 0
+        for key in client.scan_iter(match=self.client.make_pattern("*"), count=1000):
+            keys += 1
+            if measured < sample:
+                measured += 1
+                try:
+                    memory += client.memory_usage(key) or 0
+                except ResponseError:
+                    # MEMORY USAGE is missing in fakeredis, count key and value bytes
+                    memory += len(key) + client.strlen(key)
+        return keys, memory * keys // measured if measured else 0
+
+
+class LocMemCache(StatsMixin, BaseLocMemCache):
+    def key_stats(self):
+        with self._lock:
+            # values are stored pickled
+            return len(self._cache), sum(
+                len(key) + len(value) for key, value in self._cache.items()
+            )
+
+
+class FileBasedCache(StatsMixin, BaseFileBasedCache):
+    def key_stats(self):
+        files = self._list_cache_files()
+        return len(files), sum(
+            os.path.getsize(path) for path in files if os.path.exists(path)
+        )
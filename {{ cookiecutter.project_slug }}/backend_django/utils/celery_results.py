@@ -0,0 +1,30 @@
+"""
+Celery result backend of CELERY_RESULT_BACKEND for Redis URLs: stores results larger
+than RESULT_COMPRESS_MIN_BYTES zlib compressed (Celery's result_compression setting
+isn't applied by its Redis backend).
+
+Compressed values start with COMPRESSED_PREFIX, which no JSON document does, so
+results stored before (or by a backend without compression) are read as they are.
+"""
+
+import zlib
+
+from celery.backends.redis import RedisBackend
+
+COMPRESSED_PREFIX = b"zlib:"
+RESULT_COMPRESS_MIN_BYTES = 1024
+
+
+class CompressedRedisBackend(RedisBackend):
+    def encode(self, data):
+        payload = super().encode(data)
+        if len(payload) < RESULT_COMPRESS_MIN_BYTES:
+            return payload
+        if isinstance(payload, str):
+            payload = payload.encode()
+        return COMPRESSED_PREFIX + zlib.compress(payload)
+
+    def decode(self, payload):
+        if isinstance(payload, bytes) and payload.startswith(COMPRESSED_PREFIX):
+            payload = zlib.decompress(payload[len(COMPRESSED_PREFIX) :])
+        return super().decode(payload)
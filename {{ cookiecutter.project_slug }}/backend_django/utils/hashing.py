@@ -0,0 +1,61 @@
+"""
+Password hashing across processes, for hashing many passwords at once (bulk user
+import, hash_password --batch): Argon2/PBKDF2 are CPU bound and hold the GIL, so
+threads don't help.
+
+Workers are spawned rather than forked, as the pool may be started from a threaded
+server process, and set Django up from DJANGO_SETTINGS_MODULE. Daemonic processes,
+e.g. the child processes of a Celery prefork worker, may not start processes: they
+hash in their own process.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+from django.contrib.auth.hashers import make_password
+
+
+def _setup_worker():
+    import django
+
+    django.setup()
+
+
+@contextmanager
+def hashing_pool(workers: int | None = None):
+    """
+    A process pool of `workers` processes (default: one per CPU), or None for
+    workers <= 1, which hash_passwords() takes as hashing in this process.
+    """
+    workers = os.cpu_count() if workers is None else workers
+    if workers <= 1 or multiprocessing.current_process().daemon:
+        yield None
+        return
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_setup_worker,
+    ) as pool:
+        yield pool
+
+
+def _hash(args):
+    password, hasher = args
+    if isinstance(hasher, type):
+        hasher = hasher()
+        return hasher.encode(password, hasher.salt())
+    return make_password(password, hasher=hasher)
+
+
+def hash_passwords(passwords, pool=None, hasher: str | type = "default"):
+    """
+    Hash the passwords, yielding in input order, with the PASSWORD_HASHERS entry of
+    that algorithm name or with a hasher class (which needn't be in PASSWORD_HASHERS).
+    """
+    jobs = ((password, hasher) for password in passwords)
+    if pool is None:
+        return map(_hash, jobs)
+    # chunks amortize the inter-process round trips over several (slow) hashes
+    return pool.map(_hash, jobs, chunksize=16)
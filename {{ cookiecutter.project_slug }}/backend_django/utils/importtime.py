@@ -0,0 +1,106 @@
+"""
+Import time of the process entry points, measured with python -X importtime in a fresh
+interpreter, for the import_profile management command and benchmarks/bench_startup.py.
+
+Each entry point imports what its process imports before it serves anything: the
+WSGI/ASGI application (settings, apps, URLconf and middleware of a gunicorn worker) or
+the Celery app with its task modules (a worker after django.setup()). Bytecode caches
+are used (and written) as in production, so the first run after a change is slower.
+"""
+
+import os
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+# /app, the directory containing backend_django
+PROJECT_DIR = Path(__file__).resolve().parent.parent.parent
+
+ENTRY_POINTS = {
+    "wsgi": (
+        "from backend_django.config.wsgi import application\n"
+        "from django.urls import get_resolver\n"
+        "get_resolver().url_patterns\n"
+    ),
+    "asgi": (
+        "from backend_django.config.asgi import application\n"
+        "from django.urls import get_resolver\n"
+        "get_resolver().url_patterns\n"
+    ),
+    "celery": (
+        "from backend_django.config.celery_app import app\n"
+        "import django\n"
+        "django.setup()\n"
+        "app.loader.import_default_modules()\n"
+    ),
+}
+
+
+@dataclass
+class ImportProfile:
+    entry_point: str
+    seconds: float
+    # module -> (self, cumulative) import time in microseconds
+    modules: dict = field(default_factory=dict)
+
+    @property
+    def import_seconds(self) -> float:
+        return sum(own for own, _ in self.modules.values()) / 1e6
+
+    def heaviest_modules(self, count: int, cumulative=False) -> list:
+        """(module, microseconds) of the `count` slowest modules."""
+        index = 1 if cumulative else 0
+        ranked = sorted(
+            self.modules.items(), key=lambda item: item[1][index], reverse=True
+        )
+        return [(module, times[index]) for module, times in ranked[:count]]
+
+    def heaviest_packages(self, count: int) -> list:
+        """(top-level package, microseconds, modules) of the `count` slowest ones."""
+        packages = {}
+        for module, (own, _) in self.modules.items():
+            total, modules = packages.get(module.split(".")[0], (0, 0))
+            packages[module.split(".")[0]] = (total + own, modules + 1)
+        ranked = sorted(packages.items(), key=lambda item: item[1][0], reverse=True)
+        return [(package, *totals) for package, totals in ranked[:count]]
+
+
+def parse_importtime(output: str) -> dict:
+    """module -> (self, cumulative) microseconds from python -X importtime's stderr."""
+    modules = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        own, cumulative, module = line[len("import time:") :].split("|")
+        modules[module.strip()] = (int(own), int(cumulative))
+    return modules
+
+
+def profile_imports(entry_point: str, settings_module: str = None) -> ImportProfile:
+    """Import `entry_point` (one of ENTRY_POINTS) in a new interpreter."""
+    return profile_code(entry_point, ENTRY_POINTS[entry_point], settings_module)
+
+
+def profile_code(name: str, code: str, settings_module: str = None) -> ImportProfile:
+    env = dict(os.environ)
+    if settings_module:
+        env["DJANGO_SETTINGS_MODULE"] = settings_module
+    start = time.perf_counter()
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=PROJECT_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    seconds = time.perf_counter() - start
+    if process.returncode:
+        errors = [
+            line
+            for line in process.stderr.splitlines()
+            if not line.startswith("import time:")
+        ]
+        raise RuntimeError(f"Importing {name} failed:\n" + "\n".join(errors))
+    return ImportProfile(name, seconds, parse_importtime(process.stderr))
@@ -0,0 +1,89 @@
+"""
+Full-page cache of the template pages served to anonymous visitors (home, about,
+test in backend_django/urls.py), so that a hit skips the template and all of its
+context processors.
+
+Pages are stored in the "api" cache alias per path and language; the key prefix of
+the alias carries APP_VERSION, so every release starts with an empty page cache,
+filled ahead of the first visitors by the warm_page_cache management command.
+Requests of authenticated users, with pending messages or with a query string are
+neither served from nor stored in the cache, PAGE_CACHE_TIMEOUT = 0 bypasses it for
+all requests. A cached page keeps the headers the view set; headers added
+by middleware (Vary, Content-Language, ...) are added to every response anyway.
+"""
+
+from functools import wraps
+
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.urls import URLResolver, get_resolver
+from django.urls.resolvers import RoutePattern
+from django.utils import translation
+
+CACHE_ALIAS = "api"
+
+# the views wrapped by cache_anonymous_page, for warm_page_cache
+cached_views = set()
+
+
+def page_cache_key(path: str, language: str) -> str:
+    return f"page:{language}:{path}"
+
+
+def is_cacheable(request) -> bool:
+    return (
+        bool(settings.PAGE_CACHE_TIMEOUT)
+        and request.method in ("GET", "HEAD")
+        and not request.GET
+        and not request.user.is_authenticated
+        and not len(get_messages(request))
+    )
+
+
+def cache_anonymous_page(view):
+    """Serve the rendered page of `view` from the cache to anonymous visitors."""
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not is_cacheable(request):
+            return view(request, *args, **kwargs)
+
+        cache = caches[CACHE_ALIAS]
+        key = page_cache_key(request.path, translation.get_language())
+        cached = cache.get(key)
+        if cached is not None:
+            content, headers = cached
+            return HttpResponse(content, headers=headers)
+
+        response = view(request, *args, **kwargs)
+        if hasattr(response, "render"):
+            response.render()
+        # no pages that set cookies or embed a CSRF token
+        if (
+            response.status_code == 200
+            and not response.cookies
+            and not request.META.get("CSRF_COOKIE_NEEDS_UPDATE")
+        ):
+            cache.set(
+                key,
+                (response.content, dict(response.headers)),
+                settings.PAGE_CACHE_TIMEOUT,
+            )
+        return response
+
+    cached_views.add(wrapper)
+    return wrapper
+
+
+def cached_paths(resolver=None, prefix="/"):
+    """Paths of the URL patterns without parameters served by cache_anonymous_page."""
+    for pattern in (resolver or get_resolver()).url_patterns:
+        route = pattern.pattern
+        if not isinstance(route, RoutePattern) or route.converters:
+            continue
+        if isinstance(pattern, URLResolver):
+            yield from cached_paths(pattern, prefix + str(route))
+        elif pattern.callback in cached_views:
+            yield prefix + str(route)
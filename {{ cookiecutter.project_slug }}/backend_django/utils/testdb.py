@@ -0,0 +1,180 @@
+"""
+Test database setup of the pytest suite (django_db_setup in backend_django/conftest.py).
+
+On PostgreSQL the first process migrates a template database and loads the fixtures
+into it; every pytest(-xdist) worker then clones it with CREATE DATABASE ... TEMPLATE,
+a file copy instead of running the migrations again. The template is named after a
+hash of the migration and fixture files, so it is reused across runs (and branches)
+until one of them changes; --create-db rebuilds it. Templates unused for
+TEMPLATE_MAX_AGE are dropped when a new one is built. With --reuse-db a worker keeps
+its database as long as it is a clone of the current template.
+
+Other databases (SQLite) use Django's stock test database setup.
+"""
+
+import fcntl
+import hashlib
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from importlib import import_module
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management import call_command
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from django.db.migrations.loader import MigrationLoader
+from django.test.utils import setup_databases, teardown_databases
+
+from backend_django.site_config.fixtures import fixture_files
+
+TEMPLATE_MAX_AGE = timedelta(days=7)
+
+
+def schema_hash() -> str:
+    """Hash of the migration and fixture files the test database is built from."""
+    files = list(fixture_files())
+    for app_config in apps.get_app_configs():
+        module_name, _ = MigrationLoader.migrations_module(app_config.label)
+        if module_name is None:  # migrations disabled
+            continue
+        try:
+            module = import_module(module_name)
+        except ImportError:
+            continue
+        if getattr(module, "__file__", None):
+            files += Path(module.__file__).parent.glob("*.py")
+    digest = hashlib.sha256()
+    for path in sorted(files):
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:12]
+
+
+@contextmanager
+def file_lock(path: Path):
+    """Serialize the pytest-xdist workers (and concurrent runs) on a lock file."""
+    with open(path, "w") as file:
+        fcntl.flock(file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(file, fcntl.LOCK_UN)
+
+
+def lock_path(name: str) -> Path:
+    """The lock of a database's test databases, the same for every run and checkout."""
+    return Path(tempfile.gettempdir()) / f"test_{name}.lock"
+
+
+def setup_test_databases(verbosity: int, keepdb: bool, rebuild: bool, run_id: str):
+    """
+    Create the test databases and return a function that drops them. run_id is the
+    same for the xdist workers of a run, which rebuild the template only once.
+    """
+    connection = connections[DEFAULT_DB_ALIAS]
+    if connection.vendor != "postgresql":
+        config = setup_databases(verbosity=verbosity, interactive=False, keepdb=keepdb)
+        return lambda: teardown_databases(config, verbosity=verbosity)
+
+    old_name = connection.settings_dict["NAME"]
+    template = f"test_{old_name}_template_{schema_hash()}"
+    name = connection.creation._get_test_db_name()
+    with file_lock(lock_path(old_name)):
+        with connection.creation._nodb_cursor() as cursor:
+            comments = database_comments(cursor, f"test_{old_name}")
+        rebuild = template not in comments or (
+            rebuild and last_use(comments[template])[1] != run_id
+        )
+        if rebuild:
+            create_template(connection, template, verbosity)
+        if rebuild or not keepdb or comments.get(name) != template:
+            clone_template(connection, template, run_id)
+        use_test_database(connection, name)
+
+    for alias in connections:
+        mirror = connections[alias].settings_dict.get("TEST", {}).get("MIRROR")
+        if mirror:
+            connections[alias].creation.set_as_test_mirror(
+                connections[mirror].settings_dict
+            )
+
+    return lambda: connection.creation.destroy_test_db(
+        old_name, verbosity=verbosity, keepdb=False
+    )
+
+
+def database_comments(cursor, prefix: str) -> dict[str, str | None]:
+    """
+    The databases starting with prefix and their comments: the time and run of the
+    last clone of a template, the template a test database was cloned from.
+    """
+    cursor.execute(
+        "SELECT datname, shobj_description(oid, 'pg_database') FROM pg_database "
+        "WHERE starts_with(datname, %s)",
+        [prefix],
+    )
+    return dict(cursor.fetchall())
+
+
+def last_use(comment: str | None) -> tuple[int, str]:
+    """The time and run id of the last clone of a template, from its comment."""
+    clock, _, run_id = (comment or "").partition(" ")
+    return int(clock) if clock.isdigit() else 0, run_id
+
+
+def drop_stale_templates(connection, template: str):
+    """Drop the templates of other migration states not cloned for TEMPLATE_MAX_AGE."""
+    prefix = template.rsplit("_", 1)[0]
+    oldest = time.time() - TEMPLATE_MAX_AGE.total_seconds()
+    with connection.creation._nodb_cursor() as cursor:
+        for name, comment in database_comments(cursor, prefix).items():
+            if name == template or last_use(comment)[0] >= oldest:
+                continue
+            try:
+                cursor.execute(f"DROP DATABASE {connection.ops.quote_name(name)}")
+            except DatabaseError:
+                # being cloned, by a run on another machine using the same server
+                continue
+
+
+def create_template(connection, template: str, verbosity: int):
+    """Migrate and seed the template, dropping stale ones."""
+    drop_stale_templates(connection, template)
+    old_name = connection.settings_dict["NAME"]
+    test_settings = connection.settings_dict.setdefault("TEST", {})
+    test_name = test_settings.get("NAME")
+    test_settings["NAME"] = template
+    try:
+        connection.creation.create_test_db(
+            verbosity=verbosity, autoclobber=True, serialize=False
+        )
+        call_command("load_fixtures_fast", guard=True, verbosity=0)
+    finally:
+        # CREATE DATABASE ... TEMPLATE fails while the template has connections
+        connection.close()
+        test_settings["NAME"] = test_name
+        connection.settings_dict["NAME"] = old_name
+        settings.DATABASES[connection.alias]["NAME"] = old_name
+
+
+def clone_template(connection, template: str, run_id: str):
+    """(Re)create this process' test database (test_<name>[_gwN]) from the template."""
+    name = connection.creation._get_test_db_name()
+    quote = connection.ops.quote_name
+    with connection.creation._nodb_cursor() as cursor:
+        cursor.execute(f"DROP DATABASE IF EXISTS {quote(name)}")
+        cursor.execute(f"CREATE DATABASE {quote(name)} TEMPLATE {quote(template)}")
+        cursor.execute(f"COMMENT ON DATABASE {quote(name)} IS %s", [template])
+        cursor.execute(
+            f"COMMENT ON DATABASE {quote(template)} IS %s",
+            [f"{int(time.time())} {run_id}"],
+        )
+
+
+def use_test_database(connection, name: str):
+    connection.close()
+    connection.settings_dict["NAME"] = name
+    settings.DATABASES[connection.alias]["NAME"] = name
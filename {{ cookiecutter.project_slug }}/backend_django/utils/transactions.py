@@ -0,0 +1,102 @@
+"""
+Opt-in replacement for ATOMIC_REQUESTS.
+
+ATOMIC_REQUESTS wraps every view in a transaction, so even a read-only GET keeps its
+database connection checked out (and idle in transaction) until the view returns.
+Instead, only mutating requests are wrapped:
+
+- views opt in with the ``atomic_mutations`` decorator or ``AtomicMutationsMixin``
+- third party views (allauth, dj_rest_auth, ...) are matched by the regular expressions
+  of settings.ATOMIC_REQUESTS_URLS, see ``AtomicRequestsMiddleware``
+
+Safe methods (GET, HEAD, OPTIONS, TRACE) always run in autocommit mode.
+
+Like ATOMIC_REQUESTS, the transaction is rolled back when the view raises. As DRF
+turns exceptions into responses (and only marks the transaction for rollback itself
+when ATOMIC_REQUESTS is set), responses built from an exception and server errors
+roll back too.
+"""
+
+import re
+from functools import wraps
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS", "TRACE")
+
+
+def is_mutation(request) -> bool:
+    return request.method not in SAFE_METHODS
+
+
+def _rollback_on_error(response, using=DEFAULT_DB_ALIAS):
+    if response.status_code >= 500 or getattr(response, "exception", False):
+        transaction.set_rollback(True, using=using)
+
+
+def atomic_mutations(view_func=None, *, using=DEFAULT_DB_ALIAS):
+    """Run a (sync) function based view in a transaction for unsafe methods only."""
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if not is_mutation(request):
+                return view_func(request, *args, **kwargs)
+            with transaction.atomic(using=using):
+                response = view_func(request, *args, **kwargs)
+                _rollback_on_error(response, using)
+            return response
+
+        return wrapper
+
+    return decorator(view_func) if view_func else decorator
+
+
+class AtomicMutationsMixin:
+    """Class based view (and DRF view/viewset) counterpart of ``atomic_mutations``."""
+
+    atomic_using = DEFAULT_DB_ALIAS
+
+    def dispatch(self, request, *args, **kwargs):
+        if not is_mutation(request):
+            return super().dispatch(request, *args, **kwargs)
+        with transaction.atomic(using=self.atomic_using):
+            response = super().dispatch(request, *args, **kwargs)
+            _rollback_on_error(response, self.atomic_using)
+        return response
+
+
+class AtomicRequestsMiddleware:
+    """
+    Run unsafe requests whose path matches settings.ATOMIC_REQUESTS_URLS in a
+    transaction. Place it last in MIDDLEWARE, so the transaction covers little more
+    than the view.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.patterns = [
+            re.compile(pattern)
+            for pattern in getattr(settings, "ATOMIC_REQUESTS_URLS", [])
+        ]
+
+    def wants_atomic(self, request) -> bool:
+        return is_mutation(request) and any(
+            pattern.match(request.path_info) for pattern in self.patterns
+        )
+
+    def __call__(self, request):
+        if not self.wants_atomic(request):
+            return self.get_response(request)
+        request._atomic_request = True
+        with transaction.atomic():
+            response = self.get_response(request)
+            _rollback_on_error(response)
+        return response
+
+    def process_exception(self, request, exception):
+        # the view raised: Django turns the exception into a (403, 404, ...) response
+        # before it reaches __call__, roll back like ATOMIC_REQUESTS would
+        if getattr(request, "_atomic_request", False):
+            transaction.set_rollback(True)
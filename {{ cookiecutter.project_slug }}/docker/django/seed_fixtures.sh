@@ -1,33 +1,17 @@
 #!/bin/bash
+# Loads backend_django/fixtures. Container starts run all start-up steps with
+# "manage.py bootstrap"; this is kept for scripts and CI jobs calling it.
+#   --guard        only the new and changed fixtures
+#   --exclude-dev  without the dev_* fixtures
 set -o errexit
 
-GUARD=false
-EXCLUDE_DEV=false
+FORCE=--force
+EXCLUDE_DEV=
 for arg in "$@"; do
   case $arg in
-    --guard) GUARD=true ;;
-    --exclude-dev) EXCLUDE_DEV=true ;;
+    --guard) FORCE= ;;
+    --exclude-dev) EXCLUDE_DEV=--exclude-dev ;;
   esac
 done
 
-if [ "$GUARD" = true ]; then
-  SETUP_STATUS=$(python backend_django/manage.py shell -c \
-    "from backend_django.site_config.models import SetupFlag; \
-     print('true') if SetupFlag.objects.filter(setup_complete=True).exists() else print('false')")
-  if [ "$SETUP_STATUS" = "true" ]; then
-    echo "Setup flag found. Skipping fixture load."
-    exit 0
-  fi
-fi
-
-if [ "$EXCLUDE_DEV" = true ]; then
-  find ./backend_django/fixtures -name '*.json' ! -name 'dev_*' -print0 | xargs -0 -r python backend_django/manage.py loaddata
-else
-  find ./backend_django/fixtures -name '*.json' -print0 | xargs -0 -r python backend_django/manage.py loaddata
-fi
-
-if [ "$GUARD" = true ]; then
-  echo "Marking setup as complete."
-  python backend_django/manage.py shell -c \
-    "from backend_django.site_config.models import SetupFlag; SetupFlag.objects.create(setup_complete=True)"
-fi
+python backend_django/manage.py bootstrap --only fixtures $FORCE $EXCLUDE_DEV